@@ -3,12 +3,21 @@ AI Study Buddy Application
 A Streamlit-based quiz generation application using Groq LLM.
 """
 
-import os
+import time
+import uuid
+
 import streamlit as st
 from dotenv import load_dotenv
 
 from src.utils.helpers import QuizManager, rerun
 from src.generator.question_generator import QuestionGenerator
+from src.storage.question_bank import get_question_bank
+from src.storage.results_store import get_results_store
+from src.storage.shared_quizzes import get_shared_quiz_store
+from src.llm.rate_limiter import Priority, request_context
+from src.common.logger import log_context
+from src.common.metrics import observe_stage, start_metrics_server
+from src.config.settings import settings
 
 # Load environment variables
 load_dotenv()
@@ -16,24 +25,28 @@ load_dotenv()
 
 def main():
     """Main application function."""
-    st.set_page_config(
-        page_title="Study Buddy AI",
-        page_icon="🎧🎧"
-    )
+    st.set_page_config(page_title="Study Buddy AI", page_icon="🎧🎧")
 
     # Initialize session state
-    if 'quiz_manager' not in st.session_state:
-        st.session_state.quiz_manager = QuizManager()
+    if "quiz_manager" not in st.session_state:
+        question_bank = get_question_bank() if settings.QUESTION_BANK_ENABLED else None
+        results_store = get_results_store() if settings.RESULTS_STORE_ENABLED else None
+        st.session_state.quiz_manager = QuizManager(
+            question_bank=question_bank, results_store=results_store
+        )
 
-    if 'quiz_generated' not in st.session_state:
+    if "quiz_generated" not in st.session_state:
         st.session_state.quiz_generated = False
 
-    if 'quiz_submitted' not in st.session_state:
+    if "quiz_submitted" not in st.session_state:
         st.session_state.quiz_submitted = False
 
-    if 'rerun_trigger' not in st.session_state:
+    if "rerun_trigger" not in st.session_state:
         st.session_state.rerun_trigger = False
 
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+
     # Main title
     st.title("Study Buddy AI")
 
@@ -41,41 +54,50 @@ def main():
     st.sidebar.header("Quiz Settings")
 
     question_type = st.sidebar.selectbox(
-        "Select Question Type",
-        ["Multiple Choice", "Fill in the Blank"],
-        index=0
+        "Select Question Type", ["Multiple Choice", "Fill in the Blank"], index=0
     )
 
     topic = st.sidebar.text_input(
-        "Enter Topic",
-        placeholder="Chinese History, geography"
+        "Enter Topic", placeholder="Chinese History, geography"
     )
 
     difficulty = st.sidebar.selectbox(
-        "Difficulty Level",
-        ["Easy", "Medium", "Hard"],
-        index=1
+        "Difficulty Level", ["Easy", "Medium", "Hard"], index=1
     )
 
     num_questions = st.sidebar.number_input(
-        "Number of Questions",
-        min_value=1,
-        max_value=10,
-        value=5
+        "Number of Questions", min_value=1, max_value=10, value=5
     )
 
+    # Set when the quiz was already rendered progressively during this run
+    quiz_rendered = False
+
     # Generate quiz
     if st.sidebar.button("Generate Quiz"):
         st.session_state.quiz_submitted = False
 
-        generator = QuestionGenerator()
-        success = st.session_state.quiz_manager.generate_questions(
-            generator,
-            topic,
-            question_type,
-            difficulty,
-            num_questions
-        )
+        session_id = st.session_state.session_id
+        with (
+            request_context(Priority.INTERACTIVE, session_id),
+            log_context(session_id=session_id),
+        ):
+            generator = QuestionGenerator()
+            quiz_manager = st.session_state.quiz_manager
+            if settings.STREAMING_QUIZ:
+                # render every question into its own slot as soon as it arrives
+                st.header("Quiz")
+                slots = [st.empty() for _ in range(num_questions)]
+                for index, question in quiz_manager.stream_questions(
+                    generator, topic, question_type, difficulty, num_questions
+                ):
+                    with slots[index].container():
+                        quiz_manager.render_question(index, question)
+                success = quiz_manager.report_generation(num_questions)
+                quiz_rendered = success
+            else:
+                success = quiz_manager.generate_questions(
+                    generator, topic, question_type, difficulty, num_questions
+                )
         # if the quiz is generated successfully, set the quiz_generated to True
         # in this case the streamlit will automatically rerun and display the quiz
         # but if the quiz is not generated successfully, the streamlit will not rerun
@@ -83,51 +105,77 @@ def main():
         st.session_state.quiz_generated = success
         rerun()
 
+    # Share the current quiz under a join code, or join a quiz shared by someone else;
+    # joined quizzes are loaded as they were generated, without any LLM call
+    if settings.SHARED_QUIZZES_ENABLED:
+        quiz_manager = st.session_state.quiz_manager
+        st.sidebar.header("Shared Quiz")
+
+        if st.session_state.quiz_generated and quiz_manager.questions:
+            if st.sidebar.button("Share Quiz"):
+                quiz_manager.share(get_shared_quiz_store())
+            if quiz_manager.shared_code:
+                st.sidebar.success(f"Join code: {quiz_manager.shared_code}")
+
+        join_code = st.sidebar.text_input("Join Code", placeholder="ABC123")
+        if st.sidebar.button("Join Quiz") and join_code:
+            shared = get_shared_quiz_store().load(join_code)
+            if shared is None:
+                st.sidebar.error("Unknown or expired join code")
+            else:
+                quiz_manager.load_shared(shared)
+                st.session_state.quiz_generated = True
+                st.session_state.quiz_submitted = False
+                rerun()
+
     # if the quiz is generated successfully, display the quiz
     if st.session_state.quiz_generated and st.session_state.quiz_manager.questions:
-        st.header("Quiz")
-        st.session_state.quiz_manager.attempt_quiz()
+        if not quiz_rendered:
+            st.header("Quiz")
+            st.session_state.quiz_manager.attempt_quiz()
 
         if st.button("Submit Quiz"):
-            st.session_state.quiz_manager.evaluate_quiz()
+            with log_context(session_id=st.session_state.session_id):
+                st.session_state.quiz_manager.evaluate_quiz()
+                st.session_state.attempt_id = (
+                    st.session_state.quiz_manager.save_results(
+                        st.session_state.session_id
+                    )
+                )
             st.session_state.quiz_submitted = True
             rerun()
 
     # if the quiz is submitted successfully, display the quiz results
     if st.session_state.quiz_submitted:
         st.header("Quiz Results")
-        results_df = st.session_state.quiz_manager.generate_result_dataframe()
-
-        if not results_df.empty:
-            correct_count = results_df["is_correct"].sum()
-            total_questions = len(results_df)
-            score_percentage = (correct_count / total_questions) * 100
-            st.write(f"Score: {score_percentage:.1f}%")
-
-            for _, result in results_df.iterrows():
-                question_num = result['question_number']
-                if result['is_correct']:
-                    st.success(f"✅ Question {question_num}: {result['question']}")
-                else:
-                    st.error(f"❌ Question {question_num}: {result['question']}")
-                    st.write(f"Your answer: {result['user_answer']}")
-                    st.write(f"Correct answer: {result['correct_answer']}")
-
-                st.markdown("---")
-
-            if st.button("Save Results"):
-                saved_file = st.session_state.quiz_manager.save_to_csv()
-                if saved_file:
-                    with open(saved_file, 'rb') as f:
-                        st.download_button(
-                            label="Download Results",
-                            data=f.read(),
-                            file_name=os.path.basename(saved_file),
-                            mime='text/csv'
-                        )
-                else:
-                    st.warning("No results available")
+        quiz_manager = st.session_state.quiz_manager
+        quiz_manager.render_results()
+
+        attempt_id = st.session_state.get("attempt_id")
+        results_store = quiz_manager.results_store
+        if (
+            quiz_manager.summary is not None
+            and attempt_id
+            and results_store is not None
+        ):
+
+            def export_results() -> str:
+                # Runs on click; the attempt may still be queued for writing
+                results_store.flush()
+                return "".join(results_store.iter_csv(attempt_id=attempt_id))
+
+            st.download_button(
+                label="Download Results",
+                data=export_results,
+                file_name=f"quiz_results_{attempt_id}.csv",
+                mime="text/csv",
+            )
 
 
 if __name__ == "__main__":
-    main()
+    start_metrics_server()
+    rerun_start = time.perf_counter()
+    try:
+        main()
+    finally:
+        observe_stage("streamlit_rerun", time.perf_counter() - rerun_start)
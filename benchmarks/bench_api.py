@@ -0,0 +1,207 @@
+"""
+Quiz API load test for the AI Study Buddy application.
+Starts the API in-process against the fake LLM backend, runs full quiz sessions
+(create, fetch, submit, results) at increasing concurrency and reports the
+highest number of concurrent sessions one process sustains within a p95 target.
+
+Usage:
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --concurrency 10 50 100 200 --slo 3
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.bench_generation import percentile
+from src.api.server import QuizService, create_app
+from src.config.settings import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_backend import FakeLLMClient
+
+
+def free_port() -> int:
+    """Return a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args: argparse.Namespace) -> str:
+    """
+    Serve the API with uvicorn in a background thread.
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        str: Base URL of the running server
+    """
+    import uvicorn
+
+    client = FakeLLMClient(
+        latency=args.latency,
+        latency_median=args.latency_median,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    app = create_app(QuizService(generator=QuestionGenerator(client=client)))
+    port = free_port()
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_session(http: httpx.AsyncClient, args: argparse.Namespace) -> None:
+    """Run one quiz session end to end, raising on any unexpected status."""
+    response = await http.post(
+        "/quizzes",
+        json={
+            "topic": "Load testing",
+            "question_type": args.question_type,
+            "difficulty": "Medium",
+            "num_questions": args.num_questions,
+        },
+    )
+    response.raise_for_status()
+    quiz = response.json()
+
+    response = await http.get(f"/quizzes/{quiz['quiz_id']}")
+    response.raise_for_status()
+
+    answers = [(q["options"] or ["answer"])[0] for q in quiz["questions"]]
+    response = await http.post(
+        f"/quizzes/{quiz['quiz_id']}/answers", json={"answers": answers}
+    )
+    response.raise_for_status()
+
+    response = await http.get(f"/quizzes/{quiz['quiz_id']}/results")
+    response.raise_for_status()
+
+
+async def run_level(
+    base_url: str, args: argparse.Namespace, concurrency: int
+) -> Dict[str, Any]:
+    """
+    Keep ``concurrency`` sessions in flight until ``args.sessions`` have run.
+
+    Args:
+        base_url: Base URL of the API
+        args: Parsed command line arguments
+        concurrency: Number of concurrent sessions
+
+    Returns:
+        Dict[str, Any]: Session latency percentiles, throughput and error count
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = args.sessions
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as http:
+
+        async def user() -> None:
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                try:
+                    await run_session(http, args)
+                    latencies.append(time.perf_counter() - start)
+                except Exception:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "sessions": args.sessions,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p95_s": round(percentile(latencies, 95), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "sessions_per_s": round(len(latencies) / elapsed, 2),
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    """Parse arguments, load the API at every concurrency level and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 10, 25, 50, 100]
+    )
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--num-questions", type=int, default=5)
+    parser.add_argument(
+        "--question-type",
+        default="Multiple Choice",
+        choices=["Multiple Choice", "Fill in the Blank"],
+    )
+    parser.add_argument(
+        "--latency", default="lognormal", choices=["fixed", "uniform", "lognormal"]
+    )
+    parser.add_argument("--latency-median", type=float, default=0.5)
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--slo", type=float, default=5.0, help="p95 session latency target in seconds"
+    )
+    parser.add_argument(
+        "--json", dest="json_path", help="Also write the report to this file"
+    )
+    args = parser.parse_args()
+
+    settings.RATE_LIMIT_ENABLED = False
+    # Sessions share one topic, which the response cache would answer once
+    settings.LLM_CACHE_ENABLED = False
+    settings.QUESTION_BANK_ENABLED = False
+    settings.RETRY_BASE_DELAY_SECONDS = 0.01
+
+    base_url = start_server(args)
+    report = [
+        asyncio.run(run_level(base_url, args, level)) for level in args.concurrency
+    ]
+
+    columns = list(report[0].keys())
+    widths = [max(len(c), 8) for c in columns]
+    print(" ".join(f"{c:>{w}}" for c, w in zip(columns, widths)))
+    for row in report:
+        print(" ".join(f"{row[c]:>{w}}" for c, w in zip(columns, widths)))
+
+    within_slo = [
+        row["concurrency"]
+        for row in report
+        if row["p95_s"] <= args.slo and not row["errors"]
+    ]
+    if within_slo:
+        print(
+            f"capacity: {max(within_slo)} concurrent sessions per process "
+            f"within p95 <= {args.slo}s"
+        )
+    else:
+        print(f"capacity: no tested level met p95 <= {args.slo}s", file=sys.stderr)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
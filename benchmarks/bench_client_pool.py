@@ -0,0 +1,104 @@
+"""
+LLM client pooling benchmark for the AI Study Buddy application.
+Compares a new Groq client per call against the shared pooled client using a
+local HTTP stub that imitates the chat completions endpoint.
+
+Usage:
+    python -m benchmarks.bench_client_pool
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config.settings import settings
+from src.llm import groq_client
+from src.llm.groq_client import create_groq_client, generate_completion
+
+COMPLETION = {
+    "id": "stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "{}"},
+        }
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every POST with a canned chat completion over HTTP/1.1 keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        """Return the canned completion."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps(COMPLETION).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Silence per-request logging."""
+
+
+def measure(calls: int, pooled: bool) -> list:
+    """
+    Time individual completion calls.
+
+    Args:
+        calls: Number of calls to make
+        pooled: Reuse the shared client instead of creating one per call
+
+    Returns:
+        list: Per-call latencies in milliseconds
+    """
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        client = groq_client.get_groq_client() if pooled else create_groq_client()
+        generate_completion(client, "ping")
+        if not pooled:
+            client.close()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    """Start the stub server and report per-call latency for both modes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    settings.GROQ_API_KEY = settings.GROQ_API_KEY or "benchmark"
+    settings.RATE_LIMIT_ENABLED = False
+    settings.GROQ_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        for label, pooled in (("client per call", False), ("shared pool", True)):
+            latencies = measure(args.calls, pooled)
+            print(
+                f"{label:>16}: median {statistics.median(latencies):.2f} ms, "
+                f"mean {statistics.mean(latencies):.2f} ms over {args.calls} calls"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Quiz generation latency benchmark for the AI Study Buddy application.
+Drives QuizCore.generate against a local fake LLM so the
+effect of MAX_CONCURRENCY can be measured without calling Groq.
+
+Usage:
+    python -m benchmarks.bench_concurrent_generation
+"""
+
+import argparse
+import time
+
+from src.config.settings import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_backend import FakeLLMClient
+from src.utils.quiz_core import QuizCore
+
+
+def run(latency: float, sizes: list, concurrency: int) -> None:
+    """
+    Time quiz generation for each quiz size and print a small table.
+
+    Args:
+        latency: Simulated per-call LLM latency in seconds
+        sizes: Quiz sizes (num_questions) to measure
+        concurrency: Value to use for settings.MAX_CONCURRENCY
+    """
+    settings.MAX_CONCURRENCY = concurrency
+    settings.RATE_LIMIT_ENABLED = False
+    # Sessions share one topic, which the response cache would answer once
+    settings.LLM_CACHE_ENABLED = False
+    generator = QuestionGenerator(
+        client=FakeLLMClient(latency="fixed", latency_median=latency)
+    )
+    manager = QuizCore()
+
+    print(f"latency={latency:.3f}s  MAX_CONCURRENCY={concurrency}")
+    print(f"{'questions':>10} {'seconds':>10} {'sequential':>12}")
+    for size in sizes:
+        start = time.perf_counter()
+        manager.generate(generator, "Geography", "Multiple Choice", "Medium", size)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {elapsed:>10.3f} {size * latency:>12.3f}")
+
+
+def main() -> None:
+    """Parse command line arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 5, 10])
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    run(args.latency, args.sizes, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
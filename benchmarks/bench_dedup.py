@@ -0,0 +1,86 @@
+"""
+Near-duplicate detection benchmark for the AI Study Buddy application.
+Indexes synthetic question texts and reports per-query latency and how many
+reworded questions are caught versus false positives among unrelated ones.
+
+Usage:
+    python -m benchmarks.bench_dedup
+    python -m benchmarks.bench_dedup --size 50000 --queries 2000
+"""
+
+import argparse
+import random
+import time
+from typing import List
+
+from src.config.settings import settings
+from src.generator.dedup import NearDuplicateIndex
+
+TEMPLATES = [
+    "What is the {0} of the {1} {2} in {3} {4}?",
+    "Which {0} describes the {1} {2} during {3} {4}?",
+    "How does the {0} affect {1} {2} for {3} {4}?",
+]
+
+
+def make_vocabulary(rng: random.Random, size: int) -> List[str]:
+    """Build a vocabulary of random pseudo-words."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return [
+        "".join(rng.choice(letters) for _ in range(rng.randint(4, 9)))
+        for _ in range(size)
+    ]
+
+
+def make_question(rng: random.Random, words: List[str]) -> str:
+    """Render a question around five content words."""
+    return rng.choice(TEMPLATES).format(*words)
+
+
+def reword(rng: random.Random, words: List[str]) -> str:
+    """Render the same question with another template and one content word changed."""
+    words = list(words)
+    words[rng.randrange(len(words))] = "different"
+    return make_question(rng, words)
+
+
+def main() -> None:
+    """Build the index, query reworded and unrelated questions, print timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = make_vocabulary(rng, 5000)
+    index = NearDuplicateIndex()
+    facts = []
+    start = time.perf_counter()
+    for _ in range(args.size):
+        words = rng.sample(vocabulary, 5)
+        facts.append(words)
+        index.add(make_question(rng, words))
+    build_us = (time.perf_counter() - start) * 1e6 / args.size
+
+    reworded = [
+        reword(rng, words) for words in rng.sample(facts, min(args.queries, len(facts)))
+    ]
+    unrelated = [
+        make_question(rng, rng.sample(vocabulary, 5)) for _ in range(args.queries)
+    ]
+
+    start = time.perf_counter()
+    caught = sum(index.is_duplicate(text) for text in reworded)
+    false_positives = sum(index.is_duplicate(text) for text in unrelated)
+    query_us = (time.perf_counter() - start) * 1e6 / (len(reworded) + len(unrelated))
+
+    print(f"indexed questions: {len(index)} ({build_us:.1f} us/insert)")
+    print(f"threshold:         {settings.DEDUP_THRESHOLD}")
+    print(f"query latency:     {query_us:.1f} us/query")
+    print(f"rewordings caught: {caught}/{len(reworded)}")
+    print(f"false positives:   {false_positives}/{len(unrelated)}")
+
+
+if __name__ == "__main__":
+    main()
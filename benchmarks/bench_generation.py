@@ -0,0 +1,171 @@
+"""
+End-to-end generation benchmark for the AI Study Buddy application.
+Runs concurrent quiz sessions against the deterministic fake LLM backend and
+reports p50/p95/p99 latency, throughput and retry counts per concurrency level.
+
+Usage:
+    python -m benchmarks.bench_generation
+    python -m benchmarks.bench_generation --malformed-rate 0.1
+    python -m benchmarks.bench_generation --error-rate 0.1 --max-p95 3
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from src.config.settings import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_backend import FakeLLMClient
+from src.utils.quiz_core import QuizCore
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Measurements
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile value, or 0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_level(args: argparse.Namespace, concurrency: int) -> Dict[str, Any]:
+    """
+    Run ``args.tasks`` tasks with ``concurrency`` sessions in parallel.
+
+    Args:
+        args: Parsed command line arguments
+        concurrency: Number of concurrent sessions
+
+    Returns:
+        Dict[str, Any]: Latency percentiles, throughput and retry counts
+    """
+    client = FakeLLMClient(
+        latency=args.latency,
+        latency_median=args.latency_median,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    generator = QuestionGenerator(client=client)
+
+    def quiz_task() -> int:
+        manager = QuizCore()
+        manager.generate(
+            generator, "Benchmarks", args.question_type, "Medium", args.num_questions
+        )
+        return len(manager.questions)
+
+    def generator_task() -> int:
+        if args.question_type == "Multiple Choice":
+            generator.generate_mcq("Benchmarks", "medium")
+        else:
+            generator.generate_fill_blank("Benchmarks", "medium")
+        return 1
+
+    task = quiz_task if args.target == "quiz" else generator_task
+    latencies: List[float] = []
+    produced: List[int] = []
+
+    def timed() -> None:
+        start = time.perf_counter()
+        try:
+            produced.append(task())
+        except Exception:
+            produced.append(0)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(args.tasks):
+            executor.submit(timed)
+    elapsed = time.perf_counter() - start
+
+    if args.target == "quiz":
+        chunk = settings.BATCH_SIZE if settings.BATCH_GENERATION else 1
+        first_attempts = args.tasks * math.ceil(args.num_questions / chunk)
+    else:
+        first_attempts = args.tasks
+
+    return {
+        "concurrency": concurrency,
+        "tasks": args.tasks,
+        "p50_s": round(percentile(latencies, 50), 4),
+        "p95_s": round(percentile(latencies, 95), 4),
+        "p99_s": round(percentile(latencies, 99), 4),
+        "tasks_per_s": round(args.tasks / elapsed, 2),
+        "questions_per_s": round(sum(produced) / elapsed, 2),
+        "llm_calls": client.calls,
+        "retries": client.calls - first_attempts,
+        "injected_errors": client.errors,
+        "injected_malformed": client.malformed,
+    }
+
+
+def main() -> None:
+    """Parse arguments, run every concurrency level and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--target", choices=["quiz", "generator"], default="quiz")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 5, 10])
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--num-questions", type=int, default=5)
+    parser.add_argument(
+        "--question-type",
+        default="Multiple Choice",
+        choices=["Multiple Choice", "Fill in the Blank"],
+    )
+    parser.add_argument(
+        "--latency", default="lognormal", choices=["fixed", "uniform", "lognormal"]
+    )
+    parser.add_argument("--latency-median", type=float, default=0.2)
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch", action="store_true", help="Enable BATCH_GENERATION")
+    parser.add_argument(
+        "--json", dest="json_path", help="Also write the report to this file"
+    )
+    parser.add_argument(
+        "--max-p95", type=float, help="Exit with status 1 if any p95 exceeds this"
+    )
+    args = parser.parse_args()
+
+    settings.RATE_LIMIT_ENABLED = False
+    # Sessions share one topic, which the response cache would answer once
+    settings.LLM_CACHE_ENABLED = False
+    settings.BATCH_GENERATION = args.batch
+    settings.RETRY_BASE_DELAY_SECONDS = 0.01
+
+    report = [run_level(args, level) for level in args.concurrency]
+
+    columns = list(report[0].keys())
+    widths = [max(len(c), 8) for c in columns]
+    print(" ".join(f"{c:>{w}}" for c, w in zip(columns, widths)))
+    for row in report:
+        print(" ".join(f"{row[c]:>{w}}" for c, w in zip(columns, widths)))
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.max_p95 is not None and any(row["p95_s"] > args.max_p95 for row in report):
+        print(f"p95 latency above {args.max_p95}s", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
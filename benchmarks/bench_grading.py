@@ -0,0 +1,130 @@
+"""
+Grading benchmark for the AI Study Buddy application.
+Grades a synthetic classroom result set (many students, shared answer keys,
+noisy fill-in-the-blank answers) with the original per-answer loop and with the
+batch grading engine, and reports throughput, how many answers each accepts and
+how many wrong near misses ("Prussia" for "Russia") the engine lets through.
+The legacy loop only compares lowercased strings, so it grades answers several
+times faster than the engine, which normalizes and fuzzy-matches them.
+
+Usage:
+    python -m benchmarks.bench_grading
+    python -m benchmarks.bench_grading --answers 1000000
+"""
+
+import argparse
+import random
+import time
+
+from src.grading.grader import grade_answers
+
+ANSWER_KEY = [
+    "Paris",
+    "Nile",
+    "photosynthesis",
+    "Mediterranean Sea",
+    "mitochondria",
+    "George Washington",
+    "oxygen",
+    "Pacific Ocean",
+    "Shakespeare",
+    "gravity",
+    "1945",
+    "Mount Everest",
+    "Jupiter",
+    "democracy",
+    "Amazon River",
+    "Russia",
+    "Iran",
+    "Austria",
+    "Slovenia",
+]
+
+# Wrong answers one or two letters away from the right one, which must not be accepted
+NEAR_MISSES = {
+    "Russia": "Prussia",
+    "Iran": "Iraq",
+    "Jupiter": "Juniper",
+    "Austria": "Australia",
+    "Slovenia": "Slovakia",
+}
+
+
+def noisy(rng: random.Random, answer: str) -> str:
+    """Return the answer as a student might type it."""
+    choice = rng.random()
+    if choice < 0.3:
+        return answer
+    if choice < 0.45:
+        return answer.lower() + "."
+    if choice < 0.55:
+        return "the " + answer
+    if choice < 0.7 and len(answer) > 4:
+        # one-letter typo past the first letter
+        i = rng.randrange(1, len(answer))
+        return answer[:i] + answer[i + 1 :]
+    if choice < 0.8 and answer in NEAR_MISSES:
+        return NEAR_MISSES[answer]
+    return rng.choice(ANSWER_KEY)
+
+
+def legacy_grade(question_types, user_answers, correct_answers) -> list:
+    """Grade answers the way evaluate_quiz did before the grading engine."""
+    results = []
+    for question_type, user_ans, correct in zip(
+        question_types, user_answers, correct_answers
+    ):
+        if question_type == "MCQ":
+            results.append(user_ans == correct)
+        else:
+            results.append(user_ans.strip().lower() == correct.strip().lower())
+    return results
+
+
+def main() -> None:
+    """Build the result set, grade it both ways and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--answers", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    correct_answers = [rng.choice(ANSWER_KEY) for _ in range(args.answers)]
+    user_answers = [noisy(rng, answer) for answer in correct_answers]
+    question_types = ["Fill in the blank"] * args.answers
+
+    start = time.perf_counter()
+    legacy = legacy_grade(question_types, user_answers, correct_answers)
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    graded = grade_answers(question_types, user_answers, correct_answers)
+    engine_seconds = time.perf_counter() - start
+
+    print(f"answers graded:       {args.answers}")
+    print(
+        f"legacy loop:          {args.answers / legacy_seconds:,.0f} answers/s, "
+        f"{sum(legacy)} accepted"
+    )
+    print(
+        f"grading engine:       {args.answers / engine_seconds:,.0f} answers/s, "
+        f"{int(graded.sum())} accepted, "
+        f"{engine_seconds / legacy_seconds:.1f}x the legacy loop's time"
+    )
+    near_misses = sum(
+        1
+        for user, answer, ok in zip(user_answers, correct_answers, graded)
+        if ok and NEAR_MISSES.get(answer) == user
+    )
+    print(
+        f"newly accepted:       {int(graded.sum()) - sum(legacy)} "
+        "(punctuation, articles, case and one-letter typos)"
+    )
+    print(
+        f"near misses accepted: {near_misses} "
+        "(wrong answers such as 'Prussia' for 'Russia')"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Hedged request benchmark for the AI Study Buddy application.
+Sends completions to a fake backend with heavy-tailed (log-normal) latency,
+with hedging off and on, and reports call latency percentiles, whole-quiz
+latency and the share of extra upstream calls hedging cost.
+
+Usage:
+    python -m benchmarks.bench_hedging
+    python -m benchmarks.bench_hedging --calls 2000 --latency-spread 1.2 --percentile 95
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_backend import FakeLLMClient
+from src.llm.groq_client import generate_completion
+from src.llm.hedging import get_hedged_caller
+from src.prompts.templates import get_mcq_prompt
+from src.utils.quiz_core import QuizCore
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return values[min(len(values) - 1, int(len(values) * q / 100))]
+
+
+def run(args: argparse.Namespace, hedged: bool) -> dict:
+    """Measure single calls and quizzes with hedging off or on."""
+    settings.LLM_HEDGE_ENABLED = hedged
+    settings.LLM_HEDGE_PERCENTILE = args.percentile
+    settings.LLM_HEDGE_MAX_RATIO = args.max_ratio
+    get_hedged_caller.cache_clear()
+    client = FakeLLMClient(
+        latency="lognormal",
+        latency_median=args.latency_median,
+        latency_spread=args.latency_spread,
+        seed=args.seed,
+    )
+    prompt = get_mcq_prompt("Photosynthesis", "medium")
+
+    def timed_call(_: int) -> float:
+        start = time.perf_counter()
+        generate_completion(client, prompt)
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        # Fill the latency histogram before measuring
+        list(executor.map(timed_call, range(settings.LLM_HEDGE_MIN_SAMPLES * 2)))
+        client.calls = 0
+        latencies = sorted(executor.map(timed_call, range(args.calls)))
+    extra_calls = client.calls / args.calls - 1
+
+    generator = QuestionGenerator(client=client)
+    quiz_latencies = []
+    for _ in range(args.quizzes):
+        start = time.perf_counter()
+        QuizCore().generate(
+            generator, "Photosynthesis", "Multiple Choice", "Medium", args.num_questions
+        )
+        quiz_latencies.append(time.perf_counter() - start)
+    quiz_latencies.sort()
+
+    return {
+        "call p50 s": round(percentile(latencies, 50), 3),
+        "call p95 s": round(percentile(latencies, 95), 3),
+        "call p99 s": round(percentile(latencies, 99), 3),
+        "quiz p50 s": round(percentile(quiz_latencies, 50), 3),
+        "quiz p95 s": round(percentile(quiz_latencies, 95), 3),
+        "extra calls": f"{extra_calls:.1%}",
+    }
+
+
+def main() -> None:
+    """Run the benchmark without and with hedging and print both."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--quizzes", type=int, default=40)
+    parser.add_argument("--num-questions", type=int, default=10)
+    parser.add_argument("--latency-median", type=float, default=0.1)
+    parser.add_argument("--latency-spread", type=float, default=1.0)
+    parser.add_argument("--percentile", type=float, default=95)
+    parser.add_argument("--max-ratio", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    settings.RATE_LIMIT_ENABLED = False
+    settings.LLM_CACHE_ENABLED = False
+
+    for hedged in (False, True):
+        label = "hedged" if hedged else "no hedging"
+        print(f"{label:>10}: {run(args, hedged)}")
+
+
+if __name__ == "__main__":
+    main()
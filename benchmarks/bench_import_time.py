@@ -0,0 +1,103 @@
+"""
+Import-time benchmark for the AI Study Buddy application.
+Imports each entry module in a fresh interpreter and reports the median import
+time, process start-up time and whether streamlit or pandas were loaded.
+
+Usage:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --runs 10 --json import_times.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict
+
+# Entry points, from the Streamlit adapter (UI) to the UI-free core users
+MODULES = [
+    "src.utils.helpers",
+    "src.utils.quiz_core",
+    "src.api.server",
+    "src.worker.prefetch",
+]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "import_s": elapsed,
+    "streamlit": "streamlit" in sys.modules,
+    "pandas": "pandas" in sys.modules,
+}}))
+"""
+
+
+def measure(module: str, runs: int) -> Dict[str, Any]:
+    """
+    Import ``module`` in ``runs`` fresh interpreters.
+
+    Args:
+        module: Dotted module name
+        runs: Number of interpreters to start
+
+    Returns:
+        Dict[str, Any]: Median import and process times, and loaded UI/data libraries
+    """
+    import_times = []
+    process_times = []
+    probe = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        process_times.append(time.perf_counter() - start)
+        probe = json.loads(output.strip().splitlines()[-1])
+        import_times.append(probe["import_s"])
+
+    return {
+        "module": module,
+        "import_ms": round(statistics.median(import_times) * 1000, 1),
+        "process_ms": round(statistics.median(process_times) * 1000, 1),
+        "streamlit": probe["streamlit"],
+        "pandas": probe["pandas"],
+    }
+
+
+def main() -> None:
+    """Measure every entry module and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument(
+        "--json", dest="json_path", help="Also write the report to this file"
+    )
+    args = parser.parse_args()
+
+    report = [measure(module, args.runs) for module in args.modules]
+
+    print(
+        f"{'module':<24} {'import_ms':>10} {'process_ms':>11} "
+        f"{'streamlit':>10} {'pandas':>7}"
+    )
+    for row in report:
+        print(
+            f"{row['module']:<24} {row['import_ms']:>10} {row['process_ms']:>11} "
+            f"{str(row['streamlit']):>10} {str(row['pandas']):>7}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
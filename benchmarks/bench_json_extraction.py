@@ -0,0 +1,105 @@
+"""
+JSON extraction benchmark for the AI Study Buddy application.
+Replays a corpus of LLM responses through the original fence-stripping cleanup
+and through extract_json, and reports how many retries the extractor saves.
+
+Usage:
+    python -m benchmarks.bench_json_extraction
+"""
+
+import argparse
+import json
+import os
+import time
+
+from src.llm.json_extraction import IncrementalJSONExtractor, extract_json, parse_model
+from src.models.question_schemas import MCQQuestion, FillBlankQuestion
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(__file__), "data", "malformed_responses.jsonl"
+)
+
+MODEL_CLASSES = {"mcq": MCQQuestion, "fill_blank": FillBlankQuestion}
+
+
+def legacy_parse(response: str):
+    """Parse a response the way QuestionGenerator did before extract_json."""
+    response_clean = response.strip()
+    if response_clean.startswith("```json"):
+        response_clean = response_clean[7:]
+    if response_clean.endswith("```"):
+        response_clean = response_clean[:-3]
+    return json.loads(response_clean.strip())
+
+
+def streamed_parse(response: str, chunk_size: int = 7):
+    """Parse a response fed to the incremental extractor in small chunks."""
+    extractor = IncrementalJSONExtractor()
+    for start in range(0, len(response), chunk_size):
+        if extractor.feed(response[start : start + chunk_size]) is not None:
+            return extract_json(extractor.text)
+    return extract_json(response)
+
+
+def count_valid(corpus: list, parse) -> int:
+    """
+    Count responses that parse and validate against their question schema.
+
+    Args:
+        corpus: Corpus records with ``kind`` and ``response``
+        parse: Function turning response text into JSON data, or None to
+            validate with ``parse_model`` (``model_validate_json`` fast path)
+
+    Returns:
+        int: Number of responses that would not need a retry
+    """
+    valid = 0
+    for record in corpus:
+        try:
+            model_class = MODEL_CLASSES[record["kind"]]
+            if parse is None:
+                parse_model(model_class, record["response"])
+            else:
+                model_class.model_validate(parse(record["response"]))
+            valid += 1
+        except Exception:
+            pass
+    return valid
+
+
+def main() -> None:
+    """Load the corpus and print parse rates and timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", default=CORPUS_PATH)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+
+    total = len(corpus)
+    results = {}
+    for label, parse in (
+        ("legacy", legacy_parse),
+        ("extract_json", extract_json),
+        ("streamed", streamed_parse),
+        ("parse_model", None),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            valid = count_valid(corpus, parse)
+        elapsed_us = (time.perf_counter() - start) * 1e6 / (args.repeat * total)
+        results[label] = valid
+        print(
+            f"{label:>13}: {valid}/{total} parsed without retry, "
+            f"{elapsed_us:.1f} us/response"
+        )
+
+    print(
+        f"retries saved per {total} responses: "
+        f"{results['extract_json'] - results['legacy']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Logging benchmark for the AI Study Buddy application.
+Measures how long the calling thread spends per log call with a synchronous
+file handler and with the queue handler used by the application, from
+several threads at once.
+
+Usage:
+    python -m benchmarks.bench_logging
+    python -m benchmarks.bench_logging --threads 8 --records 20000
+"""
+
+import argparse
+import logging
+import logging.handlers
+import os
+import queue
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.common.logger import (
+    TEXT_FORMAT,
+    ContextFilter,
+    DroppingQueueHandler,
+    log_context,
+)
+
+
+def measure(logger: logging.Logger, threads: int, records: int) -> dict:
+    """Log ``records`` lines from each of ``threads`` threads and time the calls."""
+
+    def worker(index: int) -> list:
+        timings = []
+        with log_context(request_id=f"bench-{index}"):
+            for n in range(records):
+                start = time.perf_counter()
+                logger.info(f"Generated question {n} for topic Photosynthesis")
+                timings.append(time.perf_counter() - start)
+        return timings
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        timings = sorted(
+            t for chunk in executor.map(worker, range(threads)) for t in chunk
+        )
+    wall = time.perf_counter() - start
+    return {
+        "p50 us": round(timings[len(timings) // 2] * 1e6, 1),
+        "p99 us": round(timings[int(len(timings) * 0.99)] * 1e6, 1),
+        "max us": round(timings[-1] * 1e6, 1),
+        "wall s": round(wall, 3),
+    }
+
+
+def main() -> None:
+    """Compare a synchronous file handler with the queue handler."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--records", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_handler = logging.FileHandler(
+            os.path.join(directory, "bench.log"), encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+        file_handler.addFilter(ContextFilter())
+
+        sync_logger = logging.getLogger("bench.sync")
+        sync_logger.propagate = False
+        sync_logger.addHandler(file_handler)
+        sync_logger.setLevel(logging.INFO)
+        print(f"{'sync file':>10}: {measure(sync_logger, args.threads, args.records)}")
+
+        log_queue: queue.Queue = queue.Queue(maxsize=args.threads * args.records)
+        queue_handler = DroppingQueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+
+        queued_logger = logging.getLogger("bench.queued")
+        queued_logger.propagate = False
+        queued_logger.addHandler(queue_handler)
+        queued_logger.setLevel(logging.INFO)
+        print(f"{'queued':>10}: {measure(queued_logger, args.threads, args.records)}")
+
+        listener.stop()
+        file_handler.close()
+
+
+if __name__ == "__main__":
+    main()
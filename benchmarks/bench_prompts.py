@@ -0,0 +1,121 @@
+"""
+Prompt size benchmark for the AI Study Buddy application.
+Compares the prompt tokens sent per call and per quiz by the original
+single-message prompts and by the cached system prefix plus short user
+message, then generates quizzes against the fake backend and prints the
+recorded usage per prompt kind.
+
+Usage:
+    python -m benchmarks.bench_prompts
+    python -m benchmarks.bench_prompts --num-questions 10 --quizzes 20
+"""
+
+import argparse
+import json
+
+from src.config.settings import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_backend import FakeLLMClient
+from src.llm.usage import get_prompt_usage
+from src.prompts.templates import (
+    get_fill_blank_batch_prompt,
+    get_fill_blank_prompt,
+    get_mcq_batch_prompt,
+    get_mcq_prompt,
+)
+from src.utils.quiz_core import QuizCore
+
+
+def legacy_mcq_prompt(topic: str, difficulty: str) -> str:
+    """The single-message MCQ prompt used before the system prefix."""
+    return (
+        f"Generate a {difficulty} multiple-choice question about {topic}.\n\n"
+        "Return ONLY a JSON object with these exact fields:\n"
+        "- 'question': A clear, specific question\n"
+        "- 'options': An array of exactly 4 possible answers\n"
+        "- 'correct_answer': One of the options that is the correct answer\n\n"
+        "Example format:\n"
+        "{\n"
+        '    "question": "What is the capital of France?",\n'
+        '    "options": ["London", "Berlin", "Paris", "Madrid"],\n'
+        '    "correct_answer": "Paris"\n'
+        "}\n\n"
+        "Your response:"
+    )
+
+
+def legacy_fill_blank_prompt(topic: str, difficulty: str) -> str:
+    """The single-message fill-in-the-blank prompt used before the system prefix."""
+    return (
+        f"Generate a {difficulty} fill-in-the-blank question about {topic}.\n\n"
+        "Return ONLY a JSON object with these exact fields:\n"
+        "- 'question': A sentence with '_____' marking where the blank should be\n"
+        "- 'answer': The correct word or phrase that belongs in the blank\n"
+        "- 'alternatives': An array of other accepted answers "
+        "(synonyms, alternative spellings), possibly empty\n\n"
+        "Example format:\n"
+        "{\n"
+        '    "question": "The Nile flows into the _____.",\n'
+        '    "answer": "Mediterranean Sea",\n'
+        '    "alternatives": ["Mediterranean"]\n'
+        "}\n\n"
+        "Your response:"
+    )
+
+
+def tokens(text: str) -> int:
+    """Token estimate used throughout the app (four characters per token)."""
+    return len(text) // 4
+
+
+def main() -> None:
+    """Print prompt sizes and the usage recorded while generating quizzes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--topic", default="The French Revolution")
+    parser.add_argument("--num-questions", type=int, default=5)
+    parser.add_argument("--quizzes", type=int, default=10)
+    args = parser.parse_args()
+
+    n = args.num_questions
+    print(
+        f"{'prompt':>18} {'legacy/call':>12} {'system':>7} {'user':>5} "
+        f"{'uncached/quiz':>14} {'legacy/quiz':>12}"
+    )
+    for name, legacy, prompt in (
+        ("mcq", legacy_mcq_prompt, get_mcq_prompt),
+        ("fill_blank", legacy_fill_blank_prompt, get_fill_blank_prompt),
+    ):
+        old = tokens(legacy(args.topic, "medium"))
+        new = prompt(args.topic, "medium")
+        # After the first call of a kind, only the user message is new input
+        uncached = tokens(new.system) + n * tokens(new.user)
+        print(
+            f"{name:>18} {old:>12} {tokens(new.system):>7} {tokens(new.user):>5} "
+            f"{uncached:>14} {n * old:>12}"
+        )
+    for name, prompt in (
+        ("mcq_batch", get_mcq_batch_prompt),
+        ("fill_blank_batch", get_fill_blank_batch_prompt),
+    ):
+        new = prompt(args.topic, "medium", n)
+        print(f"{name:>18} {'':>12} {tokens(new.system):>7} {tokens(new.user):>5}")
+
+    settings.RATE_LIMIT_ENABLED = False
+    # Sessions share one topic, which the response cache would answer once
+    settings.LLM_CACHE_ENABLED = False
+    generator = QuestionGenerator(
+        client=FakeLLMClient(latency="fixed", latency_median=0.0)
+    )
+    usage = get_prompt_usage()
+    usage.reset()
+    for question_type in ("Multiple Choice", "Fill in the Blank"):
+        for _ in range(args.quizzes):
+            QuizCore().generate(generator, args.topic, question_type, "Medium", n)
+
+    print()
+    print("recorded usage per prompt kind:")
+    print(json.dumps(usage.snapshot(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Response cache benchmark for the AI Study Buddy application.
+Simulates a classroom burst (many students starting the same quiz at once)
+against the fake LLM backend, with the shared response cache off and on, and
+reports upstream calls, quiz latency and how many distinct questions were served.
+
+Usage:
+    python -m benchmarks.bench_response_cache
+    python -m benchmarks.bench_response_cache --students 30 --num-questions 5
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_backend import FakeLLMClient
+from src.llm.response_cache import get_response_cache
+from src.utils.quiz_core import QuizCore
+
+
+def run_burst(args: argparse.Namespace, cached: bool) -> dict:
+    """Start ``args.students`` quizzes at once and measure the burst."""
+    settings.LLM_CACHE_ENABLED = cached
+    client = FakeLLMClient(
+        latency="lognormal", latency_median=args.latency_median, seed=0
+    )
+    generator = QuestionGenerator(client=client)
+
+    def student(_: int) -> tuple:
+        start = time.perf_counter()
+        quiz = QuizCore()
+        quiz.generate(
+            generator, "Photosynthesis", "Multiple Choice", "Medium", args.num_questions
+        )
+        return time.perf_counter() - start, [q["question"] for q in quiz.questions]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.students) as executor:
+        outcomes = list(executor.map(student, range(args.students)))
+    wall = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in outcomes)
+    return {
+        "upstream calls": client.calls,
+        "p50 quiz s": round(latencies[len(latencies) // 2], 3),
+        "max quiz s": round(latencies[-1], 3),
+        "burst s": round(wall, 3),
+        "distinct questions": len({q for _, questions in outcomes for q in questions}),
+    }
+
+
+def main() -> None:
+    """Run the burst without and with the response cache and print both."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--num-questions", type=int, default=5)
+    parser.add_argument("--latency-median", type=float, default=0.3)
+    args = parser.parse_args()
+
+    settings.RATE_LIMIT_ENABLED = False
+    settings.LLM_CACHE_PATH = ""
+
+    for cached in (False, True):
+        label = "shared cache" if cached else "no cache"
+        print(f"{label:>13}: {run_burst(args, cached)}")
+    print(f"{'cache stats':>13}: {get_response_cache().stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Results store benchmark for the AI Study Buddy application.
+Appends synthetic graded attempts through the background writer and reports
+write throughput, the cost of saving on the request path, per-topic accuracy
+query latency (rollup table versus a full scan) and CSV export speed.
+
+Usage:
+    python -m benchmarks.bench_results_store
+    python -m benchmarks.bench_results_store --attempts 200000 --questions 5
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from src.storage.results_store import ResultsStore
+
+TOPICS = [f"topic {i}" for i in range(200)]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+
+def make_results(rng: random.Random, questions: int) -> list:
+    """Build graded results shaped like ``QuizCore.evaluate_quiz`` output."""
+    return [
+        {
+            "question_number": n + 1,
+            "question": f"Synthetic question {n}?",
+            "question_type": "MCQ",
+            "user_answer": "A",
+            "correct_answer": "A",
+            "is_correct": rng.random() < 0.7,
+            "options": ["A", "B", "C", "D"],
+        }
+        for n in range(questions)
+    ]
+
+
+def elapsed_ms(start: float) -> float:
+    """Milliseconds since ``start``, a ``time.perf_counter()`` reading."""
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    """Fill a temporary store and print timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--attempts", type=int, default=100000)
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    path = os.path.join(tempfile.mkdtemp(), "results.db")
+    store = ResultsStore(path=path, batch_size=500, flush_interval=0.05)
+    templates = [make_results(rng, args.questions) for _ in range(50)]
+
+    start = time.perf_counter()
+    record_seconds = 0.0
+    last_attempt = None
+    for i in range(args.attempts):
+        results = templates[i % len(templates)]
+        before = time.perf_counter()
+        last_attempt = store.record(
+            results,
+            rng.choice(TOPICS),
+            rng.choice(DIFFICULTIES),
+            "Multiple Choice",
+            session_id=f"session {i % 1000}",
+        )
+        record_seconds += time.perf_counter() - before
+    store.flush()
+    elapsed = time.perf_counter() - start
+    rows = args.attempts * args.questions
+
+    rate = rows / elapsed
+    record_us = record_seconds * 1e6 / args.attempts
+    print(f"answer rows written:     {rows} in {elapsed:.2f}s ({rate:,.0f} rows/s)")
+    print(f"save on request path:    {record_us:.1f} us/attempt")
+
+    start = time.perf_counter()
+    stats = store.topic_accuracy(limit=1000)
+    print(
+        f"per-topic accuracy:      {len(stats)} rows in {elapsed_ms(start):.2f} ms "
+        "(rollup)"
+    )
+
+    with store._connect() as conn:
+        start = time.perf_counter()
+        scanned = conn.execute(
+            "SELECT a.topic, a.difficulty, AVG(n.is_correct) FROM answers n "
+            "JOIN attempts a ON a.id = n.attempt GROUP BY a.topic, a.difficulty"
+        ).fetchall()
+    print(
+        f"per-topic accuracy:      {len(scanned)} rows in {elapsed_ms(start):.2f} ms "
+        "(full scan)"
+    )
+
+    start = time.perf_counter()
+    exported = sum(len(chunk) for chunk in store.iter_csv(attempt_id=last_attempt))
+    print(f"export one attempt:      {exported} bytes in {elapsed_ms(start):.2f} ms")
+
+    start = time.perf_counter()
+    chunks = store.iter_csv(session_id="session 0")
+    exported = len(next(chunks))
+    first_chunk_ms = elapsed_ms(start)
+    exported += sum(len(chunk) for chunk in chunks)
+    print(
+        f"export one session:      first chunk after {first_chunk_ms:.2f} ms, "
+        f"{exported} bytes in {elapsed_ms(start):.2f} ms"
+    )
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Results view benchmark for the AI Study Buddy application.
+Measures the per-rerun cost of preparing the quiz results view the original
+way (DataFrame rebuild, score from the frame, iterrows formatting) and from the
+cached summary, for several quiz sizes.
+
+Usage:
+    python -m benchmarks.bench_results_view
+    python -m benchmarks.bench_results_view --reruns 200 --sizes 5 20 100
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.utils.helpers import QuizManager
+
+
+def make_quiz(size: int) -> QuizManager:
+    """Build a graded quiz of ``size`` fill-in-the-blank questions, half correct."""
+    quiz = QuizManager()
+    quiz.questions = [
+        {
+            "type": "Fill in the blank",
+            "question": f"Synthetic question {n} about the _____.",
+            "correct_answer": f"answer {n}",
+            "alternatives": [],
+        }
+        for n in range(size)
+    ]
+    quiz.set_answers([f"answer {n}" if n % 2 else "wrong" for n in range(size)])
+    quiz.evaluate_quiz()
+    return quiz
+
+
+def legacy_rerun(quiz: QuizManager) -> list:
+    """Prepare the results view the way application.py did before the cached summary."""
+    results_df = pd.DataFrame(quiz.results)
+    elements = []
+    correct_count = results_df["is_correct"].sum()
+    elements.append(f"Score: {correct_count / len(results_df) * 100:.1f}%")
+    for _, result in results_df.iterrows():
+        question_num = result["question_number"]
+        if result["is_correct"]:
+            elements.append(f"✅ Question {question_num}: {result['question']}")
+        else:
+            elements.append(f"❌ Question {question_num}: {result['question']}")
+            elements.append(f"Your answer: {result['user_answer']}")
+            elements.append(f"Correct answer: {result['correct_answer']}")
+        elements.append("---")
+    return elements
+
+
+def cached_rerun(quiz: QuizManager) -> list:
+    """Prepare the results view from the cached summary, as render_results does."""
+    summary = quiz.evaluate_quiz()
+    return [f"Score: {summary.score_percentage:.1f}%", quiz.results_markdown(summary)]
+
+
+def time_reruns(prepare, quiz: QuizManager, reruns: int) -> float:
+    """Average microseconds per rerun."""
+    start = time.perf_counter()
+    for _ in range(reruns):
+        prepare(quiz)
+    return (time.perf_counter() - start) * 1e6 / reruns
+
+
+def main() -> None:
+    """Time both ways of preparing the results view and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reruns", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 20, 100, 500])
+    args = parser.parse_args()
+
+    print(
+        f"{'questions':>10} {'legacy us/rerun':>16} {'cached us/rerun':>16} "
+        f"{'elements':>9}"
+    )
+    for size in args.sizes:
+        quiz = make_quiz(size)
+        legacy = time_reruns(legacy_rerun, quiz, args.reruns)
+        cached = time_reruns(cached_rerun, quiz, args.reruns)
+        print(
+            f"{size:>10} {legacy:>16.1f} {cached:>16.1f} "
+            f"{len(legacy_rerun(quiz)):>4} -> {len(cached_rerun(quiz))}"
+        )
+
+
+if __name__ == "__main__":
+    main()
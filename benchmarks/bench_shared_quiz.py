@@ -0,0 +1,87 @@
+"""
+Shared quiz benchmark for the AI Study Buddy application.
+Simulates a class taking the same quiz: every student generating it, and a
+teacher generating it once and sharing a join code, against the fake LLM
+backend, and reports upstream calls and how long students wait for their quiz.
+
+Usage:
+    python -m benchmarks.bench_shared_quiz
+    python -m benchmarks.bench_shared_quiz --students 30 --num-questions 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config.settings import settings
+from src.generator.question_generator import QuestionGenerator
+from src.llm.fake_backend import FakeLLMClient
+from src.storage.shared_quizzes import SharedQuizStore
+from src.utils.quiz_core import QuizCore
+
+
+def run_class(args: argparse.Namespace, store: SharedQuizStore, shared: bool) -> dict:
+    """Get ``args.students`` students a quiz, generating it per student or once."""
+    client = FakeLLMClient(
+        latency="lognormal", latency_median=args.latency_median, seed=0
+    )
+    generator = QuestionGenerator(client=client)
+
+    start = time.perf_counter()
+    code = None
+    if shared:
+        teacher = QuizCore()
+        teacher.generate(
+            generator, "Photosynthesis", "Multiple Choice", "Medium", args.num_questions
+        )
+        code = teacher.share(store)
+    teacher_s = time.perf_counter() - start
+
+    def student(_: int) -> float:
+        start = time.perf_counter()
+        quiz = QuizCore()
+        if shared:
+            quiz.load_shared(store.load(code))
+        else:
+            quiz.generate(
+                generator,
+                "Photosynthesis",
+                "Multiple Choice",
+                "Medium",
+                args.num_questions,
+            )
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=args.students) as executor:
+        latencies = sorted(executor.map(student, range(args.students)))
+
+    return {
+        "upstream calls": client.calls,
+        "teacher s": round(teacher_s, 3),
+        "p50 student ms": round(latencies[len(latencies) // 2] * 1000, 2),
+        "max student ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+def main() -> None:
+    """Run the class with per-student generation and with a shared quiz, print both."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--num-questions", type=int, default=5)
+    parser.add_argument("--latency-median", type=float, default=0.3)
+    args = parser.parse_args()
+
+    settings.RATE_LIMIT_ENABLED = False
+    settings.LLM_CACHE_ENABLED = False
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SharedQuizStore(path=os.path.join(directory, "shared_quizzes.db"))
+        for shared in (False, True):
+            label = "shared quiz" if shared else "per student"
+            print(f"{label:>11}: {run_class(args, store, shared)}")
+
+
+if __name__ == "__main__":
+    main()
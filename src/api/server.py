@@ -0,0 +1,541 @@
+"""
+Quiz API module for the AI Study Buddy application.
+Serves quiz generation, answer submission and results as HTTP/JSON without Streamlit.
+
+Usage:
+    python -m src.api.server --port 8000
+"""
+
+import argparse
+import asyncio
+import contextvars
+import json
+import re
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ValidationError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.generator.question_generator import QuestionGenerator
+from src.llm.groq_client import check_llm_health
+from src.llm.rate_limiter import Priority, request_context
+from src.llm.router import get_model_router
+from src.llm.usage import get_prompt_usage
+from src.models.api_schemas import AnswerSubmission, QuizRequest
+from src.storage.question_bank import QuestionBank, get_question_bank
+from src.storage.results_store import ResultsStore, get_results_store
+from src.storage.shared_quizzes import SharedQuizStore, get_shared_quiz_store
+from src.utils.quiz_core import QuizCore
+from src.config.settings import settings
+from src.common.logger import get_logger, log_context
+from src.common.metrics import CONTENT_TYPE, get_metrics
+
+
+@dataclass
+class QuizSession:
+    """One generated quiz and its answers."""
+
+    quiz_id: str
+    quiz: QuizCore
+    topic: str
+    question_type: str
+    difficulty: str
+    created_at: float
+    submitted: bool = False
+    attempt_id: Optional[str] = None
+
+
+class SessionStore:
+    """
+    In-memory quiz sessions with TTL expiry and a size cap.
+
+    Only the event loop touches the store, so it needs no lock. Sessions live
+    in the process that created them; run the API behind sticky sessions or
+    with one replica per quiz audience.
+    """
+
+    def __init__(
+        self, max_sessions: Optional[int] = None, ttl_seconds: Optional[float] = None
+    ):
+        """
+        Initialize an empty store.
+
+        Args:
+            max_sessions: Sessions kept before the oldest are dropped (defaults to
+                settings)
+            ttl_seconds: Age after which sessions expire (defaults to settings)
+        """
+        self.max_sessions = (
+            max_sessions if max_sessions is not None else settings.API_MAX_SESSIONS
+        )
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.API_SESSION_TTL_SECONDS
+        )
+        self._sessions: "OrderedDict[str, QuizSession]" = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of stored sessions."""
+        return len(self._sessions)
+
+    def add(self, session: QuizSession) -> None:
+        """
+        Store a session, dropping expired and overflowing ones.
+
+        Args:
+            session: Session to store
+        """
+        self._sessions[session.quiz_id] = session
+        self._expire(time.time())
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def get(self, quiz_id: str) -> Optional[QuizSession]:
+        """
+        Look up an unexpired session.
+
+        Args:
+            quiz_id: Session identifier
+
+        Returns:
+            Optional[QuizSession]: The session, or None if unknown or expired
+        """
+        session = self._sessions.get(quiz_id)
+        if session is None or time.time() - session.created_at > self.ttl_seconds:
+            return None
+        return session
+
+    def _expire(self, now: float) -> None:
+        """Drop sessions older than the TTL; insertion order is creation order."""
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.created_at <= self.ttl_seconds:
+                break
+            self._sessions.popitem(last=False)
+
+
+def _error(status_code: int, message: Any) -> JSONResponse:
+    """Build a JSON error response."""
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+def _public_question(index: int, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Question as shown to the user, without its correct answer."""
+    return {
+        "number": index + 1,
+        "type": record["type"],
+        "question": record["question"],
+        "options": record.get("options", []),
+    }
+
+
+async def _parse_body(request: Request, model_class: type) -> BaseModel:
+    """
+    Parse and validate a JSON request body.
+
+    Raises:
+        ValueError: If the body is not valid JSON
+        ValidationError: If the body does not match ``model_class``
+    """
+    body = await request.body()
+    try:
+        data = json.loads(body or b"{}")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON body: {e}") from e
+    return model_class.model_validate(data)
+
+
+class QuizService:
+    """
+    Request handlers of the quiz API.
+
+    Generation runs in a dedicated thread pool so the event loop keeps serving
+    other sessions; the pool size caps how many quizzes are generated at once
+    and further requests queue for a free worker.
+    """
+
+    def __init__(
+        self,
+        generator: Optional[QuestionGenerator] = None,
+        question_bank: Optional[QuestionBank] = None,
+        store: Optional[SessionStore] = None,
+        results_store: Optional[ResultsStore] = None,
+        shared_store: Optional[SharedQuizStore] = None,
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            generator: Question generator (created on first use by default)
+            question_bank: Question bank (the shared one when enabled by default)
+            store: Session store (a new in-memory store by default)
+            results_store: Store for graded attempts (by default the shared one,
+                when enabled)
+            shared_store: Store of quizzes shared by join code (by default the shared
+                one, when enabled)
+        """
+        self._generator = generator
+        if question_bank is None and settings.QUESTION_BANK_ENABLED:
+            question_bank = get_question_bank()
+        self.question_bank = question_bank
+        if results_store is None and settings.RESULTS_STORE_ENABLED:
+            results_store = get_results_store()
+        self.results_store = results_store
+        if shared_store is None and settings.SHARED_QUIZZES_ENABLED:
+            shared_store = get_shared_quiz_store()
+        self.shared_store = shared_store
+        self.store = store or SessionStore()
+        self.logger = get_logger(self.__class__.__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.API_MAX_CONCURRENT_GENERATIONS,
+            thread_name_prefix="api-quiz",
+        )
+
+    @property
+    def generator(self) -> QuestionGenerator:
+        """Shared question generator, created on first use."""
+        if self._generator is None:
+            self._generator = QuestionGenerator()
+        return self._generator
+
+    async def create_quiz(self, request: Request) -> JSONResponse:
+        """POST /quizzes: generate a quiz and return its questions without answers."""
+        try:
+            quiz_request = await _parse_body(request, QuizRequest)
+        except ValidationError as e:
+            return _error(422, json.loads(e.json(include_url=False)))
+        except ValueError as e:
+            return _error(400, str(e))
+
+        quiz_id = uuid.uuid4().hex
+        quiz = QuizCore(
+            question_bank=self.question_bank, results_store=self.results_store
+        )
+        generator = self.generator
+
+        with (
+            request_context(Priority.INTERACTIVE, quiz_id),
+            log_context(quiz_id=quiz_id),
+        ):
+            # Run in a copy of this context so the rate limiter sees the session
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                contextvars.copy_context().run,
+                quiz.generate,
+                generator,
+                quiz_request.topic,
+                quiz_request.question_type,
+                quiz_request.difficulty,
+                quiz_request.num_questions,
+            )
+
+        success, message = quiz.generation_status(quiz_request.num_questions)
+        if not success:
+            self.logger.error(f"Quiz generation failed: {message}")
+            return _error(502, message)
+
+        self.store.add(
+            QuizSession(
+                quiz_id=quiz_id,
+                quiz=quiz,
+                topic=quiz_request.topic,
+                question_type=quiz_request.question_type,
+                difficulty=quiz_request.difficulty,
+                created_at=time.time(),
+            )
+        )
+        self.logger.info(f"Created quiz {quiz_id} with {len(quiz.questions)} questions")
+
+        return JSONResponse(
+            {
+                "quiz_id": quiz_id,
+                "requested": quiz_request.num_questions,
+                "warning": message,
+                "questions": [
+                    _public_question(i, q) for i, q in enumerate(quiz.questions)
+                ],
+            },
+            status_code=201,
+        )
+
+    async def get_quiz(self, request: Request) -> JSONResponse:
+        """GET /quizzes/{quiz_id}: return a quiz's questions without answers."""
+        session = self.store.get(request.path_params["quiz_id"])
+        if session is None:
+            return _error(404, "Quiz not found")
+
+        return JSONResponse(
+            {
+                "quiz_id": session.quiz_id,
+                "topic": session.topic,
+                "question_type": session.question_type,
+                "difficulty": session.difficulty,
+                "submitted": session.submitted,
+                "questions": [
+                    _public_question(i, q) for i, q in enumerate(session.quiz.questions)
+                ],
+            }
+        )
+
+    async def submit_answers(self, request: Request) -> JSONResponse:
+        """POST /quizzes/{quiz_id}/answers: grade the answers and return the results."""
+        session = self.store.get(request.path_params["quiz_id"])
+        if session is None:
+            return _error(404, "Quiz not found")
+
+        try:
+            submission = await _parse_body(request, AnswerSubmission)
+        except ValidationError as e:
+            return _error(422, json.loads(e.json(include_url=False)))
+        except ValueError as e:
+            return _error(400, str(e))
+
+        if len(submission.answers) != len(session.quiz.questions):
+            return _error(
+                422,
+                f"Expected {len(session.quiz.questions)} answers, "
+                f"got {len(submission.answers)}",
+            )
+
+        session.quiz.set_answers(submission.answers)
+        session.quiz.evaluate_quiz()
+        session.attempt_id = session.quiz.save_results(session.quiz_id)
+        session.submitted = True
+        return JSONResponse(self._results(session))
+
+    async def get_results(self, request: Request) -> JSONResponse:
+        """GET /quizzes/{quiz_id}/results: return the graded results of a quiz."""
+        session = self.store.get(request.path_params["quiz_id"])
+        if session is None:
+            return _error(404, "Quiz not found")
+        if not session.submitted:
+            return _error(409, "Quiz has not been submitted")
+        return JSONResponse(self._results(session))
+
+    async def download_results(self, request: Request):
+        """GET /quizzes/{quiz_id}/results.csv: stream the stored graded attempt."""
+        session = self.store.get(request.path_params["quiz_id"])
+        if session is None:
+            return _error(404, "Quiz not found")
+        if session.attempt_id is None:
+            return _error(409, "Quiz has not been submitted or results are not stored")
+
+        # the attempt may still be queued for the background writer
+        await asyncio.get_running_loop().run_in_executor(None, self.results_store.flush)
+        filename = f"quiz_results_{session.attempt_id}.csv"
+        return StreamingResponse(
+            self.results_store.iter_csv(attempt_id=session.attempt_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    async def share_quiz(self, request: Request) -> JSONResponse:
+        """POST /quizzes/{quiz_id}/share: publish a quiz under a join code.
+
+        Sharing the same quiz again returns the same code.
+        """
+        if self.shared_store is None:
+            return _error(404, "Shared quizzes are disabled")
+        session = self.store.get(request.path_params["quiz_id"])
+        if session is None:
+            return _error(404, "Quiz not found")
+
+        code = await asyncio.get_running_loop().run_in_executor(
+            None, session.quiz.share, self.shared_store
+        )
+        return JSONResponse({"quiz_id": session.quiz_id, "code": code}, status_code=201)
+
+    async def join_quiz(self, request: Request) -> JSONResponse:
+        """POST /shared/{code}/join: start a session on a shared quiz, no generation."""
+        if self.shared_store is None:
+            return _error(404, "Shared quizzes are disabled")
+        shared = await asyncio.get_running_loop().run_in_executor(
+            None, self.shared_store.load, request.path_params["code"]
+        )
+        if shared is None:
+            return _error(404, "Unknown or expired join code")
+
+        quiz_id = uuid.uuid4().hex
+        quiz = QuizCore(
+            question_bank=self.question_bank, results_store=self.results_store
+        )
+        quiz.load_shared(shared)
+        self.store.add(
+            QuizSession(
+                quiz_id=quiz_id,
+                quiz=quiz,
+                topic=shared.topic,
+                question_type=shared.question_type,
+                difficulty=shared.difficulty,
+                created_at=time.time(),
+            )
+        )
+        self.logger.info(f"Session {quiz_id} joined shared quiz {shared.code}")
+
+        return JSONResponse(
+            {
+                "quiz_id": quiz_id,
+                "code": shared.code,
+                "topic": shared.topic,
+                "question_type": shared.question_type,
+                "difficulty": shared.difficulty,
+                "questions": [
+                    _public_question(i, q) for i, q in enumerate(quiz.questions)
+                ],
+            },
+            status_code=201,
+        )
+
+    async def topic_stats(self, request: Request) -> JSONResponse:
+        """GET /stats/topics: accuracy per topic, difficulty and question type."""
+        if self.results_store is None:
+            return _error(404, "Results store is disabled")
+        topic = request.query_params.get("topic")
+        rows = await asyncio.get_running_loop().run_in_executor(
+            None, self.results_store.topic_accuracy, topic
+        )
+        return JSONResponse({"topics": rows})
+
+    async def prompt_stats(self, request: Request) -> JSONResponse:
+        """GET /stats/prompts: token counts and latency per prompt kind."""
+        return JSONResponse({"prompts": get_prompt_usage().snapshot()})
+
+    async def model_stats(self, request: Request) -> JSONResponse:
+        """GET /stats/models: circuit breaker state and average latency per model."""
+        return JSONResponse({"models": get_model_router().snapshot()})
+
+    async def metrics(self, request: Request) -> Response:
+        """GET /metrics: stage latency histograms and token counters for Prometheus."""
+        return Response(get_metrics().render(), media_type=CONTENT_TYPE)
+
+    async def health(self, request: Request) -> JSONResponse:
+        """GET /healthz: liveness probe."""
+        return JSONResponse({"status": "ok", "sessions": len(self.store)})
+
+    async def ready(self, request: Request) -> JSONResponse:
+        """GET /readyz: readiness probe that checks the LLM provider."""
+        status = await asyncio.get_running_loop().run_in_executor(
+            self._executor, check_llm_health, self.generator.client
+        )
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    @staticmethod
+    def _results(session: QuizSession) -> Dict[str, Any]:
+        """Score summary and per-question results of a submitted quiz."""
+        summary = session.quiz.evaluate_quiz()
+        return {
+            "quiz_id": session.quiz_id,
+            "correct": summary.correct,
+            "total": summary.total,
+            "score": round(summary.score_percentage, 1),
+            "results": list(summary.results),
+        }
+
+
+_QUIZ_PATH = re.compile(r"^/quizzes/([0-9a-f]+)")
+
+
+class RequestIDMiddleware:
+    """
+    Tags every log record written while serving a request with its request and quiz IDs.
+
+    The request ID comes from the X-Request-ID header, or is generated, and is
+    echoed in the response.
+    """
+
+    def __init__(self, app):
+        """
+        Wrap an ASGI application.
+
+        Args:
+            app: The wrapped application
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        """Serve one ASGI connection inside its log context."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers", []))
+        request_id = (
+            headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex
+        )
+        match = _QUIZ_PATH.match(scope.get("path", ""))
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        with log_context(
+            request_id=request_id, quiz_id=match.group(1) if match else None
+        ):
+            await self.app(scope, receive, send_with_request_id)
+
+
+def create_app(service: Optional[QuizService] = None) -> Starlette:
+    """
+    Build the ASGI application.
+
+    Args:
+        service: Request handlers (a default QuizService when omitted)
+
+    Returns:
+        Starlette: The quiz API application
+    """
+    service = service or QuizService()
+    app = Starlette(
+        routes=[
+            Route("/quizzes", service.create_quiz, methods=["POST"]),
+            Route("/quizzes/{quiz_id}", service.get_quiz, methods=["GET"]),
+            Route(
+                "/quizzes/{quiz_id}/answers", service.submit_answers, methods=["POST"]
+            ),
+            Route("/quizzes/{quiz_id}/results", service.get_results, methods=["GET"]),
+            Route(
+                "/quizzes/{quiz_id}/results.csv",
+                service.download_results,
+                methods=["GET"],
+            ),
+            Route("/quizzes/{quiz_id}/share", service.share_quiz, methods=["POST"]),
+            Route("/shared/{code}/join", service.join_quiz, methods=["POST"]),
+            Route("/stats/topics", service.topic_stats, methods=["GET"]),
+            Route("/stats/prompts", service.prompt_stats, methods=["GET"]),
+            Route("/stats/models", service.model_stats, methods=["GET"]),
+            Route("/metrics", service.metrics, methods=["GET"]),
+            Route("/healthz", service.health, methods=["GET"]),
+            Route("/readyz", service.ready, methods=["GET"]),
+        ]
+    )
+    app.add_middleware(RequestIDMiddleware)
+    app.state.service = service
+    return app
+
+
+def main() -> None:
+    """Run the quiz API with uvicorn."""
+    parser = argparse.ArgumentParser(description="Serve the quiz API over HTTP/JSON.")
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, default=settings.API_PORT)
+    args = parser.parse_args()
+
+    # uvicorn is only needed to serve, not to build the app
+    import uvicorn
+
+    uvicorn.run(create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
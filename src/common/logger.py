@@ -1,40 +1,252 @@
 """
 Logging configuration for the AI Study Buddy application.
-Sets up centralized logging with daily log rotation.
+Sets up centralized, non-blocking logging with time- and size-based rotation.
+
+Records are put on a bounded queue by the calling thread and written to disk by
+a background listener, so request threads never wait on file I/O. Records can
+be written as text or as one JSON object per line, and carry the request and
+quiz IDs set with ``log_context``.
 """
 
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import random
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from src.config.settings import settings
 
 # Constants
-LOGS_DIR = "logs"
+LOGS_DIR = settings.LOG_DIR
+LOG_FILE = os.path.join(LOGS_DIR, "study_buddy.log")
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s%(context_text)s"
+
+_context: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "log_context", default={}
+)
+_listener: Optional[logging.handlers.QueueListener] = None
 
-# Create logs directory if it doesn't exist
-os.makedirs(LOGS_DIR, exist_ok=True)
 
-# Generate log filename with current date
-LOG_FILE = os.path.join(LOGS_DIR, f"log_{datetime.now().strftime('%Y-%m-%d')}.log")
+@contextmanager
+def log_context(**fields: str) -> Iterator[None]:
+    """
+    Attach fields such as ``request_id`` or ``quiz_id`` to records logged in the block.
+
+    Worker threads see the fields when started with a copy of the caller's
+    context (``contextvars.copy_context().run``).
+
+    Args:
+        **fields: Field values; None values are left out
+    """
+    merged = {
+        **_context.get(),
+        **{k: str(v) for k, v in fields.items() if v is not None},
+    }
+    token = _context.set(merged)
+    try:
+        yield
+    finally:
+        _context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Copies the current log context onto the record, in the logging thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Attach ``context`` and its text rendering to the record."""
+        context = _context.get()
+        record.context = context
+        record.context_text = (
+            " [" + " ".join(f"{key}={value}" for key, value in context.items()) + "]"
+            if context
+            else ""
+        )
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a share of INFO records; other levels always pass."""
+
+    def __init__(self, rate: float):
+        """
+        Initialize the filter.
+
+        Args:
+            rate: Share of INFO records to keep, between 0 and 1
+        """
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decide whether the record is kept."""
+        return (
+            record.levelno != logging.INFO
+            or self.rate >= 1.0
+            or random.random() < self.rate
+        )
+
+
+class JSONFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Render the record with its context fields."""
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        entry.update(getattr(record, "context", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RotatingLogHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    File handler that rolls over on a schedule and when the file reaches ``max_bytes``.
+
+    Rolled files are named after the interval they started in, with a counter
+    appended when the size limit rolls over more than once per interval.
+    """
+
+    def __init__(self, filename: str, when: str, max_bytes: int, backup_count: int):
+        """
+        Initialize the handler; the file is opened on the first record.
+
+        Args:
+            filename: Path of the active log file
+            when: Rotation schedule, as for TimedRotatingFileHandler ('midnight',
+                'H', ...)
+            max_bytes: Size that triggers a rollover (0 disables size rotation)
+            backup_count: Rolled files kept (0 keeps all)
+        """
+        super().__init__(
+            filename, when=when, backupCount=backup_count, encoding="utf-8", delay=True
+        )
+        self.max_bytes = max_bytes
+        self.namer = self._unique_name
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        """Roll over when the interval passed or the record would pass ``max_bytes``."""
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.seek(0, os.SEEK_END)
+        return self.stream.tell() + len(self.format(record)) + 1 > self.max_bytes
+
+    @staticmethod
+    def _unique_name(default_name: str) -> str:
+        """Append a counter so a rollover never overwrites an earlier file."""
+        name, counter = default_name, 1
+        while os.path.exists(name):
+            name = f"{default_name}.{counter}"
+            counter += 1
+        return name
+
+    def getFilesToDelete(self) -> List[str]:
+        """Rolled files beyond ``backupCount``, oldest first."""
+        directory, base = os.path.split(self.baseFilename)
+        rolled = [
+            os.path.join(directory, name)
+            for name in os.listdir(directory)
+            if name.startswith(base + ".")
+        ]
+        rolled.sort(key=os.path.getmtime)
+        return rolled[: -self.backupCount] if len(rolled) > self.backupCount else []
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        """
+        Initialize the handler.
+
+        Args:
+            log_queue: Bounded queue drained by the listener
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put the record on the queue, counting it as dropped if the queue is full."""
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
-# Configure basic logging
-logging.basicConfig(
-    filename=LOG_FILE,
-    format='%(asctime)s - %(levelname)s - %(name)s - %(message)s',
-    level=logging.INFO,
-    filemode='a'
-)
+
+def configure_logging() -> None:
+    """Route all records through the queue to the rotating file; safe to repeat."""
+    global _listener
+    if _listener is not None:
+        return
+
+    os.makedirs(LOGS_DIR, exist_ok=True)
+
+    file_handler = RotatingLogHandler(
+        LOG_FILE,
+        when=settings.LOG_ROTATE_WHEN,
+        max_bytes=settings.LOG_MAX_BYTES,
+        backup_count=settings.LOG_BACKUP_COUNT,
+    )
+    if settings.LOG_FORMAT == "json":
+        file_handler.setFormatter(JSONFormatter())
+    else:
+        file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    # Filters run in the logging thread, where the context is set and before any I/O
+    queue_handler.addFilter(SamplingFilter(settings.LOG_INFO_SAMPLE_RATE))
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the background listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+configure_logging()
 
 
 def get_logger(name: str) -> logging.Logger:
     """
     Get a configured logger instance.
-    
+
     Args:
         name: Name for the logger (typically __name__ or class name)
-        
+
     Returns:
         logging.Logger: Configured logger instance
     """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-    return logger
\ No newline at end of file
+    logger.setLevel(settings.LOG_LEVEL)
+    return logger
@@ -0,0 +1,313 @@
+"""
+Metrics module for the AI Study Buddy application.
+Records per-stage timing spans and counters and renders them in the Prometheus text
+format.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+# Upper bounds in seconds, from a parse step (milliseconds) to a whole quiz (a minute)
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render a label set as ``{name="value",...}`` (empty when there are no labels)."""
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value; whole numbers without a decimal point."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms, rendered in the Prometheus text format.
+
+    Metrics are created on first use from their name and labels. Collectors
+    add samples computed at scrape time, e.g. totals kept by another module.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty registry.
+
+        Args:
+            buckets: Histogram bucket upper bounds in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def describe(self, name: str, metric_type: str, help_text: str) -> None:
+        """
+        Set the type and help text printed for a metric.
+
+        Args:
+            name: Metric name
+            metric_type: 'counter' or 'histogram'
+            help_text: One-line description
+        """
+        self._help[name] = (metric_type, help_text)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """
+        Increase a counter.
+
+        Args:
+            name: Metric name, ending in ``_total``
+            value: Amount to add
+            **labels: Label values
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """
+        Record a duration in a histogram.
+
+        Args:
+            name: Metric name, ending in ``_seconds``
+            seconds: Observed duration
+            **labels: Label values
+        """
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # one count per bucket, then the +Inf count and the sum
+            values = series.get(key)
+            if values is None:
+                values = series[key] = [0.0] * (len(self.buckets) + 2)
+            values[index] += 1
+            values[-1] += seconds
+
+    def register_collector(self, collector: Callable[[], List[str]]) -> None:
+        """
+        Add a function returning extra exposition lines at every scrape.
+
+        Args:
+            collector: Zero-argument function returning Prometheus text lines
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {
+                name: {key: list(values) for key, values in series.items()}
+                for name, series in self._histograms.items()
+            }
+            collectors = list(self._collectors)
+
+        lines: List[str] = []
+        for name in sorted(counters):
+            lines.extend(self._header(name, "counter"))
+            for labels, value in sorted(counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name in sorted(histograms):
+            lines.extend(self._header(name, "histogram"))
+            for labels, values in sorted(histograms[name].items()):
+                cumulative = 0.0
+                for bound, count in zip(self.buckets, values):
+                    cumulative += count
+                    bucket = _format_labels(labels, ("le", repr(bound)))
+                    lines.append(f"{name}_bucket{bucket} {_format_value(cumulative)}")
+                cumulative += values[len(self.buckets)]
+                bucket = _format_labels(labels, ("le", "+Inf"))
+                lines.append(f"{name}_bucket{bucket} {_format_value(cumulative)}")
+                lines.append(
+                    f"{name}_sum{_format_labels(labels)} {_format_value(values[-1])}"
+                )
+                lines.append(
+                    f"{name}_count{_format_labels(labels)} {_format_value(cumulative)}"
+                )
+
+        for collector in collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+    def _header(self, name: str, metric_type: str) -> List[str]:
+        """HELP and TYPE lines of a metric."""
+        described_type, help_text = self._help.get(
+            name, (metric_type, name.replace("_", " "))
+        )
+        return [f"# HELP {name} {help_text}", f"# TYPE {name} {described_type}"]
+
+    def reset(self) -> None:
+        """Clear all counters and histograms (collectors are kept)."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+@lru_cache(maxsize=1)
+def get_metrics() -> MetricsRegistry:
+    """
+    Return the process-wide metrics registry.
+
+    Returns:
+        MetricsRegistry: Shared registry
+    """
+    registry = MetricsRegistry()
+    registry.describe(
+        "study_buddy_stage_duration_seconds",
+        "histogram",
+        "Duration of each stage of quiz generation and grading",
+    )
+    registry.describe(
+        "study_buddy_stage_errors_total",
+        "counter",
+        "Stage executions that raised an error",
+    )
+    registry.describe(
+        "study_buddy_generation_failures_total",
+        "counter",
+        "Failed LLM generation attempts by error kind "
+        "(schema failures are re-prompted)",
+    )
+    return registry
+
+
+@contextmanager
+def span(stage: str, **labels: str) -> Iterator[None]:
+    """
+    Time a block as one execution of a stage.
+
+    The duration goes into ``study_buddy_stage_duration_seconds`` whether the
+    block succeeds or not; errors also increase ``study_buddy_stage_errors_total``.
+
+    Args:
+        stage: Stage name, e.g. 'llm_call' or 'grading'
+        **labels: Extra label values
+
+    Yields:
+        None
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        get_metrics().inc("study_buddy_stage_errors_total", stage=stage, **labels)
+        raise
+    finally:
+        get_metrics().observe(
+            "study_buddy_stage_duration_seconds",
+            time.perf_counter() - start,
+            stage=stage,
+            **labels,
+        )
+
+
+def observe_stage(stage: str, seconds: float, **labels: str) -> None:
+    """
+    Record a stage duration measured by the caller, e.g. across a generator's lifetime.
+
+    Args:
+        stage: Stage name
+        seconds: Measured duration
+        **labels: Extra label values
+    """
+    get_metrics().observe(
+        "study_buddy_stage_duration_seconds", seconds, stage=stage, **labels
+    )
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry at /metrics."""
+
+    def do_GET(self):
+        """Answer a scrape."""
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = get_metrics().render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep scrapes out of the application log."""
+
+
+@lru_cache(maxsize=1)
+def start_metrics_server(port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics from a background thread, once per process.
+
+    Used by processes without an HTTP API of their own, such as the Streamlit app.
+
+    Args:
+        port: Port to listen on (defaults to settings.METRICS_PORT; 0 disables the
+            server)
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The running server, or None when disabled or
+        the port is taken
+    """
+    port = settings.METRICS_PORT if port is None else port
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer((settings.METRICS_HOST, port), _MetricsHandler)
+    except OSError as e:
+        # Another process (e.g. a second Streamlit worker) already serves this port
+        get_logger(__name__).error(
+            f"Metrics server not started on port {port}: {str(e)}"
+        )
+        return None
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    return server
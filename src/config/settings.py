@@ -15,14 +15,213 @@ class Settings:
 
     # API Configuration
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+    GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")
+
+    # Backend Configuration
+    # "groq" for the real API, "fake" for the offline benchmark backend,
+    # "local" for an OpenAI-compatible server such as Ollama or vLLM
+    LLM_BACKEND = os.getenv("LLM_BACKEND", "groq")
+    LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:11434/v1")
+    LOCAL_LLM_API_KEY = os.getenv("LOCAL_LLM_API_KEY")
+    FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY", "lognormal")
+    FAKE_LLM_LATENCY_MEDIAN = float(os.getenv("FAKE_LLM_LATENCY_MEDIAN", "0.5"))
+    FAKE_LLM_LATENCY_SPREAD = float(os.getenv("FAKE_LLM_LATENCY_SPREAD", "0.5"))
+    FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0.0"))
+    FAKE_LLM_MALFORMED_RATE = float(os.getenv("FAKE_LLM_MALFORMED_RATE", "0.0"))
+    FAKE_LLM_SEED = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+    # HTTP Connection Pool Configuration
+    LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+    LLM_KEEPALIVE_SECONDS = float(os.getenv("LLM_KEEPALIVE_SECONDS", "60"))
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+    LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
 
     # Model Configuration
-    MODEL_NAME = "llama-3.1-8b-instant"
+    MODEL_NAME = os.getenv("MODEL_NAME", "llama-3.1-8b-instant")
     TEMPERATURE = 0.9
 
+    # Model Routing Configuration
+    # Ordered fallback chain of backend:model entries, e.g.
+    # "groq:llama-3.1-8b-instant,groq:llama-3.3-70b-versatile,local:llama3.2:3b"
+    # (empty means LLM_BACKEND:MODEL_NAME alone)
+    LLM_MODELS = os.getenv("LLM_MODELS", "")
+    # selector=backend:model rules separated by ';',
+    # e.g. "hard=groq:llama-3.3-70b-versatile"
+    LLM_ROUTES = os.getenv("LLM_ROUTES", "")
+    LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+    LLM_BREAKER_COOLDOWN_SECONDS = float(
+        os.getenv("LLM_BREAKER_COOLDOWN_SECONDS", "30")
+    )
+    # Models averaging more than this per call are tried after faster ones
+    LLM_ROUTE_SLOW_SECONDS = float(os.getenv("LLM_ROUTE_SLOW_SECONDS", "10"))
+
+    # Prompt Configuration
+    # Ask for a JSON object response (response_format) on non-streamed question calls
+    LLM_JSON_MODE = os.getenv("LLM_JSON_MODE", "true").lower() == "true"
+
+    # Response Cache Configuration
+    # Identical requests for the same quiz position share one LLM call and its response.
+    # Off by default: repeating a quiz would replay it; classes share quizzes by
+    # join code
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+    LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "600"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    # Empty path keeps the cache in memory only
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/llm_cache.db")
+    LLM_CACHE_MAX_DISK_ENTRIES = int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "10000"))
+
+    # Logging Configuration
+    LOG_DIR = os.getenv("LOG_DIR", "logs")
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    # "text", or "json" for one object per line with request and quiz IDs
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+    # The log file rolls over on this schedule and whenever it reaches LOG_MAX_BYTES
+    LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "14"))
+    # Share of INFO records written; warnings and errors are always kept
+    LOG_INFO_SAMPLE_RATE = float(os.getenv("LOG_INFO_SAMPLE_RATE", "1.0"))
+    # Records waiting for the background writer; further records are dropped,
+    # never waited on
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+    # Metrics Configuration
+    # Port of the Prometheus /metrics endpoint served next to the Streamlit app
+    # (0 disables it); the API serves /metrics on its own port
+    METRICS_HOST = os.getenv("METRICS_HOST", "0.0.0.0")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+
     # Retry Configuration
     MAX_RETRIES = 3
+    RETRY_BASE_DELAY_SECONDS = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "0.5"))
+    RETRY_MAX_DELAY_SECONDS = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "8"))
+    # Wall-clock budget for all LLM calls of one quiz
+    QUIZ_DEADLINE_SECONDS = float(os.getenv("QUIZ_DEADLINE_SECONDS", "60"))
+    # Question slots regenerated per quiz after their retries ran out or a batch
+    # came back short
+    GENERATION_MAX_REPLACEMENTS = int(os.getenv("GENERATION_MAX_REPLACEMENTS", "3"))
+
+    # Hedging Configuration
+    # Send a duplicate of a non-streamed call once it runs past this percentile of
+    # recent latencies
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    # Hedges sent per upstream call, at most (0.1 = 10% extra calls)
+    LLM_HEDGE_MAX_RATIO = float(os.getenv("LLM_HEDGE_MAX_RATIO", "0.1"))
+    # Recent latencies per prompt kind the percentile is taken over
+    LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "500"))
+    LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+    # Threads running hedged calls; 0 fits MAX_CONCURRENCY calls of every quiz
+    # generated at once (API or bulk), each with its hedge
+    LLM_HEDGE_POOL_SIZE = int(os.getenv("LLM_HEDGE_POOL_SIZE", "0"))
+
+    # Rate Limit Configuration
+    # Budgets shared by all sessions; "redis" shares them across replicas too
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_RPM = int(os.getenv("RATE_LIMIT_RPM", "30"))
+    RATE_LIMIT_TPM = int(os.getenv("RATE_LIMIT_TPM", "6000"))
+    # Completion tokens assumed per call until the real usage is known
+    RATE_LIMIT_COMPLETION_TOKENS = int(os.getenv("RATE_LIMIT_COMPLETION_TOKENS", "150"))
+    RATE_LIMIT_KEY_PREFIX = os.getenv("RATE_LIMIT_KEY_PREFIX", "study-buddy:ratelimit")
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    REDIS_SOCKET_TIMEOUT_SECONDS = float(os.getenv("REDIS_SOCKET_TIMEOUT_SECONDS", "1"))
+
+    # Concurrency Configuration
+    # Upper bound on simultaneous LLM calls made while building a single quiz
+    MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "5"))
+
+    # Streaming Configuration
+    # Render each question as soon as it is ready instead of waiting for the whole quiz
+    STREAMING_QUIZ = os.getenv("STREAMING_QUIZ", "true").lower() == "true"
+    # Request completions with stream=True
+    STREAM_COMPLETIONS = os.getenv("STREAM_COMPLETIONS", "false").lower() == "true"
+
+    # Batch Configuration
+    # When enabled, each LLM call asks for up to BATCH_SIZE questions at once
+    BATCH_GENERATION = os.getenv("BATCH_GENERATION", "false").lower() == "true"
+    BATCH_SIZE = int(os.getenv("BATCH_SIZE", "5"))
+
+    # Grading Configuration
+    # Longer fill-in-the-blank answers at least this similar
+    # (1 - edit distance / length) count as correct
+    GRADING_FUZZY_THRESHOLD = float(os.getenv("GRADING_FUZZY_THRESHOLD", "0.8"))
+    # Shorter answers, and answers with digits, must match exactly after normalization
+    GRADING_MIN_FUZZY_LENGTH = int(os.getenv("GRADING_MIN_FUZZY_LENGTH", "4"))
+    # Accepted answers up to this long only forgive one missing, extra or swapped letter
+    GRADING_SHORT_ANSWER_LENGTH = int(os.getenv("GRADING_SHORT_ANSWER_LENGTH", "8"))
+
+    # Deduplication Configuration
+    # Reworded repeats of a quiz or bank question are regenerated
+    DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "true").lower() == "true"
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.5"))
+    DEDUP_MAX_REPLACEMENTS = int(os.getenv("DEDUP_MAX_REPLACEMENTS", "3"))
+    # Number of (topic, difficulty, type) bank indexes kept in memory
+    DEDUP_MAX_INDEXES = int(os.getenv("DEDUP_MAX_INDEXES", "32"))
+
+    # Question Bank Configuration
+    QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "true").lower() == "true"
+    QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", "data/question_bank.db")
+    QUESTION_BANK_TTL_SECONDS = int(
+        os.getenv("QUESTION_BANK_TTL_SECONDS", str(7 * 24 * 3600))
+    )
+    QUESTION_BANK_MAX_ENTRIES = int(os.getenv("QUESTION_BANK_MAX_ENTRIES", "50000"))
+    # Share of every quiz that is always freshly generated to keep variety
+    QUESTION_BANK_FRESH_RATIO = float(os.getenv("QUESTION_BANK_FRESH_RATIO", "0.2"))
+
+    # Results Store Configuration
+    RESULTS_STORE_ENABLED = os.getenv("RESULTS_STORE_ENABLED", "true").lower() == "true"
+    RESULTS_STORE_PATH = os.getenv("RESULTS_STORE_PATH", "data/results.db")
+    # Attempts are written by a background thread, up to this many per transaction
+    RESULTS_WRITE_BATCH_SIZE = int(os.getenv("RESULTS_WRITE_BATCH_SIZE", "200"))
+    RESULTS_FLUSH_INTERVAL_SECONDS = float(
+        os.getenv("RESULTS_FLUSH_INTERVAL_SECONDS", "0.5")
+    )
+
+    # Shared Quiz Configuration
+    # A quiz generated once can be joined by code from any number of sessions.
+    # "sqlite" only works with one replica; "redis" (at REDIS_URL) shares codes
+    # across replicas
+    SHARED_QUIZZES_ENABLED = (
+        os.getenv("SHARED_QUIZZES_ENABLED", "true").lower() == "true"
+    )
+    SHARED_QUIZ_BACKEND = os.getenv("SHARED_QUIZ_BACKEND", "sqlite")
+    SHARED_QUIZ_PATH = os.getenv("SHARED_QUIZ_PATH", "data/shared_quizzes.db")
+    SHARED_QUIZ_KEY_PREFIX = os.getenv(
+        "SHARED_QUIZ_KEY_PREFIX", "study-buddy:shared-quiz"
+    )
+    SHARED_QUIZ_TTL_SECONDS = float(
+        os.getenv("SHARED_QUIZ_TTL_SECONDS", str(24 * 3600))
+    )
+    SHARED_QUIZ_CODE_LENGTH = int(os.getenv("SHARED_QUIZ_CODE_LENGTH", "6"))
+
+    # Prefetch Worker Configuration
+    PREFETCH_TARGET_STOCK = int(os.getenv("PREFETCH_TARGET_STOCK", "30"))
+    PREFETCH_REQUESTS_PER_MINUTE = int(os.getenv("PREFETCH_REQUESTS_PER_MINUTE", "20"))
+    PREFETCH_INTERVAL_SECONDS = float(os.getenv("PREFETCH_INTERVAL_SECONDS", "300"))
+    PREFETCH_LOOKBACK_SECONDS = int(
+        os.getenv("PREFETCH_LOOKBACK_SECONDS", str(24 * 3600))
+    )
+    PREFETCH_MAX_TOPICS = int(os.getenv("PREFETCH_MAX_TOPICS", "50"))
+
+    # Bulk Generation Configuration
+    # Quizzes generated at once by the bulk CLI (each uses up to MAX_CONCURRENCY calls)
+    BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "4"))
+    # Extra cap on bulk LLM calls per minute; 0 leaves pacing to the shared rate limiter
+    BULK_REQUESTS_PER_MINUTE = int(os.getenv("BULK_REQUESTS_PER_MINUTE", "0"))
+    BULK_PARQUET_ROWS_PER_FILE = int(os.getenv("BULK_PARQUET_ROWS_PER_FILE", "100"))
+
+    # API Configuration
+    API_HOST = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT = int(os.getenv("API_PORT", "8000"))
+    API_MAX_QUESTIONS = int(os.getenv("API_MAX_QUESTIONS", "10"))
+    # Quizzes generated at once; further requests wait for a free slot
+    API_MAX_CONCURRENT_GENERATIONS = int(
+        os.getenv("API_MAX_CONCURRENT_GENERATIONS", "32")
+    )
+    API_MAX_SESSIONS = int(os.getenv("API_MAX_SESSIONS", "10000"))
+    API_SESSION_TTL_SECONDS = float(os.getenv("API_SESSION_TTL_SECONDS", "3600"))
 
 
 # Global settings instance
-settings = Settings()
\ No newline at end of file
+settings = Settings()
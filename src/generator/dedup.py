@@ -0,0 +1,177 @@
+"""
+Near-duplicate detection module for the AI Study Buddy application.
+Indexes question texts with MinHash signatures and LSH buckets for fast similarity
+lookups.
+"""
+
+import re
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config.settings import settings
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an the of in on at to for is are was were be by with and or what which who "
+    "whom whose when where why how does do did this that these those it its as "
+    "from".split()
+)
+
+
+def shingles(text: str) -> List[str]:
+    """
+    Reduce a question to its normalized content words.
+
+    Stopwords and one-letter tokens are dropped and a plural "s" is stripped,
+    so rewordings like "What is the capital of France?" and "Which city is
+    the capital of France?" share most shingles.
+
+    Args:
+        text: Question text
+
+    Returns:
+        List[str]: Shingles of the text (at least one for non-empty text)
+    """
+    words = []
+    for word in _WORD.findall(text.lower()):
+        if len(word) < 2 or word in _STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return words or [text.strip().lower()]
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of question texts.
+
+    Each text gets a MinHash signature of ``num_perm`` values. Signatures are
+    split into bands; texts sharing any band land in the same bucket and become
+    candidates, whose similarity is then estimated with one vectorized compare.
+    Lookups therefore touch a handful of candidates even with tens of
+    thousands of indexed questions.
+    """
+
+    def __init__(self, num_perm: int = 96, bands: int = 32, seed: int = 1):
+        """
+        Initialize an empty index.
+
+        Args:
+            num_perm: Number of hash permutations in a signature
+            bands: Number of LSH bands (must divide num_perm)
+            seed: Seed for the permutation parameters
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Universal hashing as in datasketch: a * h + b may wrap around 2**64,
+        # which keeps it a good mixing function before the prime modulus
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self._signatures = np.empty((64, num_perm), dtype=np.uint64)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self.texts: List[str] = []
+
+    def __len__(self) -> int:
+        """Number of indexed texts."""
+        return len(self.texts)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text: Question text
+
+        Returns:
+            np.ndarray: ``num_perm`` uint64 values
+        """
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64
+        )
+        with np.errstate(over="ignore"):
+            permuted = (self._a * hashes + self._b) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Split a signature into one hashable key per band."""
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def add(self, text: str, signature: Optional[np.ndarray] = None) -> int:
+        """
+        Index a text.
+
+        Args:
+            text: Question text
+            signature: Precomputed signature of the text (optional)
+
+        Returns:
+            int: Position of the text in the index
+        """
+        if signature is None:
+            signature = self.signature(text)
+
+        position = len(self.texts)
+        if position == len(self._signatures):
+            self._signatures = np.resize(
+                self._signatures, (2 * position, self.num_perm)
+            )
+        self._signatures[position] = signature
+        self.texts.append(text)
+
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(position)
+        return position
+
+    def most_similar(
+        self, text: str, signature: Optional[np.ndarray] = None
+    ) -> Tuple[float, Optional[int]]:
+        """
+        Find the indexed text most similar to ``text``.
+
+        Args:
+            text: Question text
+            signature: Precomputed signature of the text (optional)
+
+        Returns:
+            Tuple[float, Optional[int]]: Estimated Jaccard similarity and the
+            position of the best match, or (0.0, None) without candidates
+        """
+        if signature is None:
+            signature = self.signature(text)
+
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return 0.0, None
+
+        positions = np.fromiter(candidates, dtype=np.int64)
+        similarities = (self._signatures[positions] == signature).mean(axis=1)
+        best = int(similarities.argmax())
+        return float(similarities[best]), int(positions[best])
+
+    def is_duplicate(self, text: str, threshold: Optional[float] = None) -> bool:
+        """
+        Check whether ``text`` is a near-duplicate of an indexed text.
+
+        Args:
+            text: Question text
+            threshold: Similarity at or above which texts count as duplicates
+                (defaults to settings.DEDUP_THRESHOLD)
+
+        Returns:
+            bool: True if a near-duplicate is indexed
+        """
+        threshold = settings.DEDUP_THRESHOLD if threshold is None else threshold
+        similarity, _ = self.most_similar(text)
+        return similarity >= threshold
@@ -3,101 +3,232 @@ Question generator module for the AI Study Buddy application.
 Handles the generation of different types of questions using Groq LLM.
 """
 
-import json
-from typing import Union
+import time
+from typing import Callable, List, Optional, Union
+
+from groq import Groq
 
 from src.models.question_schemas import MCQQuestion, FillBlankQuestion
-from src.prompts.templates import get_mcq_prompt, get_fill_blank_prompt
-from src.llm.groq_client import get_groq_client, generate_completion
+from src.prompts.templates import (
+    Prompt,
+    get_mcq_prompt,
+    get_fill_blank_prompt,
+    get_mcq_batch_prompt,
+    get_fill_blank_batch_prompt,
+    get_retry_prompt,
+)
+from src.llm.groq_client import (
+    cached_completion,
+    discard_cached_completion,
+    generate_completion,
+    get_groq_client,
+    stream_completion,
+)
+from src.llm.json_extraction import IncrementalJSONExtractor, extract_json, parse_model
+from src.llm.retry import (
+    Deadline,
+    ErrorKind,
+    backoff_delay,
+    classify_error,
+    get_retry_after,
+)
 from src.config.settings import settings
 from src.common.logger import get_logger
+from src.common.metrics import get_metrics, span
 from src.common.custom_exception import CustomException
 
 
 class QuestionGenerator:
     """Generates different types of questions using AI."""
 
-    def __init__(self):
-        """Initialize the question generator with Groq client and logger."""
-        self.client = get_groq_client()
+    def __init__(self, client: Optional[Groq] = None):
+        """
+        Initialize the question generator with Groq client and logger.
+
+        Args:
+            client: Client to use for completions (defaults to the shared LLM client)
+        """
+        self.client = client if client is not None else get_groq_client()
         self.logger = get_logger(self.__class__.__name__)
 
+    def _complete(
+        self,
+        prompt: Prompt,
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
+    ) -> str:
+        """
+        Get the completion text, streamed when STREAM_COMPLETIONS is enabled.
+
+        When streaming, only the text of the first complete JSON value is
+        returned and the rest of the stream is dropped. With a variant, the
+        call goes through the shared response cache.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            deadline: Optional quiz deadline that also bounds the request timeout
+            variant: Optional response cache variant index
+
+        Returns:
+            str: The generated response content
+        """
+        timeout = deadline.remaining() if deadline is not None else None
+        if not settings.STREAM_COMPLETIONS:
+            return generate_completion(self.client, prompt, timeout, variant)
+        return cached_completion(
+            prompt, variant, lambda: self._stream_json(prompt, timeout), timeout
+        )
+
+    def _stream_json(self, prompt: Prompt, timeout: Optional[float]) -> str:
+        """Stream a completion, stopping once the first JSON value is complete."""
+        extractor = IncrementalJSONExtractor()
+        chunks = []
+        stream = stream_completion(self.client, prompt, timeout)
+        for chunk in stream:
+            chunks.append(chunk)
+            if extractor.feed(chunk) is not None:
+                stream.close()
+                return extractor.text
+        return "".join(chunks)
+
+    def _wait_before_retry(
+        self, error: Exception, attempt: int, deadline: Optional[Deadline]
+    ) -> bool:
+        """
+        Sleep before retrying a rate-limited or transient failure.
+
+        Honors Retry-After when the provider sends it, otherwise uses
+        exponential backoff with jitter.
+
+        Args:
+            error: The exception that caused the failure
+            attempt: Zero-based number of the attempt that failed
+            deadline: Optional quiz deadline
+
+        Returns:
+            bool: False if the wait would run past the deadline
+        """
+        delay = get_retry_after(error)
+        if delay is None:
+            delay = backoff_delay(attempt)
+
+        remaining = deadline.remaining() if deadline is not None else None
+        if remaining is not None and delay >= remaining:
+            self.logger.error("Not retrying: backoff would exceed the quiz deadline")
+            return False
+
+        self.logger.info(f"Retrying in {delay:.2f}s")
+        time.sleep(delay)
+        return True
+
     def _retry_and_parse(
         self,
-        prompt: str,
+        prompt: Prompt,
         model_class: Union[MCQQuestion, FillBlankQuestion],
         topic: str,
-        difficulty: str
+        difficulty: str,
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
     ):
         """
         Retry generation and parse JSON response.
-        
+
+        Rate limits and transient provider errors are retried with backoff,
+        responses that do not parse or break the schema's structural rules
+        are re-prompted immediately with the validation error, and fatal
+        errors (e.g. authentication) are not retried at all. An invalid
+        response is also dropped from the response cache.
+
         Args:
             prompt: The prompt to send to the LLM
             model_class: The Pydantic model class to validate against
             topic: The topic for the question
             difficulty: The difficulty level
-            
+            deadline: Optional quiz deadline shared by all calls of one quiz
+            variant: Optional response cache variant index
+
         Returns:
             Parsed question instance
-            
+
         Raises:
-            CustomException: If generation fails after max retries
+            CustomException: If generation fails after max retries or the deadline
         """
+        last_error: Optional[Exception] = None
+        current_prompt = prompt
+        attempts = 0
+
         for attempt in range(settings.MAX_RETRIES):
+            if deadline is not None and deadline.expired:
+                self.logger.error("Quiz deadline exceeded")
+                break
+
+            attempts += 1
             try:
                 self.logger.info(
                     f"Generating question for topic '{topic}' "
                     f"with difficulty '{difficulty}' (attempt {attempt + 1})"
                 )
 
-                response = generate_completion(self.client, prompt)
-
-                # Clean the response to extract JSON
-                response_clean = response.strip()
-                if response_clean.startswith('```json'):
-                    response_clean = response_clean[7:]
-                if response_clean.endswith('```'):
-                    response_clean = response_clean[:-3]
-                response_clean = response_clean.strip()
+                response = self._complete(current_prompt, deadline, variant)
 
-                # Parse JSON and create model instance
-                json_data = json.loads(response_clean)
-                parsed = model_class(**json_data)
+                # Parse JSON and validate it against the schema
+                try:
+                    with span("parse", kind=current_prompt.kind):
+                        parsed = parse_model(model_class, response)
+                except Exception:
+                    discard_cached_completion(current_prompt, variant)
+                    raise
 
                 self.logger.info("Successfully parsed the question")
                 return parsed
 
             except Exception as e:
-                self.logger.error(f"Error occurred: {str(e)}")
-                if attempt == settings.MAX_RETRIES - 1:
-                    raise CustomException(
-                        f"Generation failed after {settings.MAX_RETRIES} attempts", e
-                    )
+                last_error = e
+                kind = classify_error(e)
+                self.logger.error(f"Error occurred ({kind.value}): {str(e)}")
+                get_metrics().inc(
+                    "study_buddy_generation_failures_total", kind=kind.value
+                )
+
+                if kind is ErrorKind.FATAL or attempt == settings.MAX_RETRIES - 1:
+                    break
+                if kind is ErrorKind.SCHEMA:
+                    # The provider is fine, so re-prompt straight away
+                    current_prompt = get_retry_prompt(prompt, str(e))
+                elif not self._wait_before_retry(e, attempt, deadline):
+                    break
+
+        raise CustomException(
+            f"Generation failed after {attempts} attempts", last_error
+        ) from last_error
 
-    def generate_mcq(self, topic: str, difficulty: str = 'medium') -> MCQQuestion:
+    def generate_mcq(
+        self,
+        topic: str,
+        difficulty: str = "medium",
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
+    ) -> MCQQuestion:
         """
         Generate a multiple choice question.
-        
+
         Args:
             topic: The topic for the question
             difficulty: The difficulty level ('easy', 'medium', 'hard')
-            
+            deadline: Optional quiz deadline
+            variant: Optional response cache variant index, e.g. the quiz position
+
         Returns:
             MCQQuestion instance
-            
+
         Raises:
             CustomException: If MCQ generation fails
         """
         try:
             prompt = get_mcq_prompt(topic, difficulty)
-            question = self._retry_and_parse(prompt, MCQQuestion, topic, difficulty)
-
-            # Validate MCQ structure
-            if len(question.options) != 4:
-                raise ValueError("MCQ must have exactly 4 options")
-            if question.correct_answer not in question.options:
-                raise ValueError("Correct answer must be one of the options")
+            question = self._retry_and_parse(
+                prompt, MCQQuestion, topic, difficulty, deadline, variant
+            )
 
             self.logger.info("Generated a valid MCQ Question")
             return question
@@ -106,27 +237,33 @@ class QuestionGenerator:
             self.logger.error(f"Failed to generate MCQ: {str(e)}")
             raise CustomException("MCQ generation failed", e)
 
-    def generate_fill_blank(self, topic: str, difficulty: str = 'medium') -> FillBlankQuestion:
+    def generate_fill_blank(
+        self,
+        topic: str,
+        difficulty: str = "medium",
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
+    ) -> FillBlankQuestion:
         """
         Generate a fill-in-the-blank question.
-        
+
         Args:
             topic: The topic for the question
             difficulty: The difficulty level ('easy', 'medium', 'hard')
-            
+            deadline: Optional quiz deadline
+            variant: Optional response cache variant index, e.g. the quiz position
+
         Returns:
             FillBlankQuestion instance
-            
+
         Raises:
             CustomException: If fill-in-the-blank generation fails
         """
         try:
             prompt = get_fill_blank_prompt(topic, difficulty)
-            question = self._retry_and_parse(prompt, FillBlankQuestion, topic, difficulty)
-
-            # Validate fill-in-the-blank structure
-            if "___" not in question.question:
-                raise ValueError("Fill-in-the-blank question must contain '___'")
+            question = self._retry_and_parse(
+                prompt, FillBlankQuestion, topic, difficulty, deadline, variant
+            )
 
             self.logger.info("Generated a valid Fill-in-the-Blank Question")
             return question
@@ -135,3 +272,166 @@ class QuestionGenerator:
             self.logger.error(f"Failed to generate fill-in-the-blank: {str(e)}")
             raise CustomException("Fill-in-the-blank generation failed", e)
 
+    def _generate_batch(
+        self,
+        prompt_builder: Callable[[str, str, int], Prompt],
+        model_class: Union[MCQQuestion, FillBlankQuestion],
+        topic: str,
+        difficulty: str,
+        count: int,
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
+    ) -> list:
+        """
+        Request several questions per completion and keep the valid ones.
+
+        Every item of the returned JSON array is validated on its own. Only the
+        number of items that failed is requested again, so follow-up calls get
+        smaller until the batch is complete or MAX_RETRIES rounds are used up.
+
+        Args:
+            prompt_builder: Batch prompt template function
+            model_class: The Pydantic model class to validate each item against
+            topic: The topic for the questions
+            difficulty: The difficulty level
+            count: Number of questions wanted
+            deadline: Optional quiz deadline shared by all calls of one quiz
+            variant: Optional response cache variant index
+
+        Returns:
+            list: Up to ``count`` validated question instances
+
+        Raises:
+            CustomException: If not a single valid question was produced
+        """
+        questions: list = []
+        last_error: Optional[Exception] = None
+
+        for attempt in range(settings.MAX_RETRIES):
+            missing = count - len(questions)
+            if missing <= 0:
+                break
+            if deadline is not None and deadline.expired:
+                self.logger.error("Quiz deadline exceeded")
+                break
+
+            self.logger.info(
+                f"Requesting {missing} questions for topic '{topic}' "
+                f"with difficulty '{difficulty}' (batch attempt {attempt + 1})"
+            )
+
+            prompt = prompt_builder(topic, difficulty, missing)
+            try:
+                response = self._complete(prompt, deadline, variant)
+                try:
+                    with span("parse", kind=prompt.kind):
+                        items = extract_json(response)
+                except Exception:
+                    discard_cached_completion(prompt, variant)
+                    raise
+            except Exception as e:
+                last_error = e
+                kind = classify_error(e)
+                self.logger.error(f"Batch request failed ({kind.value}): {str(e)}")
+                get_metrics().inc(
+                    "study_buddy_generation_failures_total", kind=kind.value
+                )
+                if kind is ErrorKind.FATAL:
+                    break
+                if kind is not ErrorKind.SCHEMA and not self._wait_before_retry(
+                    e, attempt, deadline
+                ):
+                    break
+                continue
+
+            if isinstance(items, dict):
+                items = items.get("questions", [items])
+
+            for item in items[:missing]:
+                try:
+                    with span("validate", kind=prompt.kind):
+                        question = model_class.model_validate(item)
+                    questions.append(question)
+                except Exception as e:
+                    self.logger.error(f"Discarding invalid batch item: {str(e)}")
+                    get_metrics().inc(
+                        "study_buddy_generation_failures_total",
+                        kind=ErrorKind.SCHEMA.value,
+                    )
+                    last_error = e
+
+        if not questions:
+            raise CustomException(
+                "Batch generation produced no valid questions", last_error
+            )
+
+        self.logger.info(f"Generated {len(questions)} of {count} batched questions")
+        return questions
+
+    def generate_mcq_batch(
+        self,
+        topic: str,
+        difficulty: str = "medium",
+        count: int = 5,
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
+    ) -> List[MCQQuestion]:
+        """
+        Generate several multiple choice questions in one completion.
+
+        Args:
+            topic: The topic for the questions
+            difficulty: The difficulty level ('easy', 'medium', 'hard')
+            count: Number of questions to generate
+            deadline: Optional quiz deadline
+            variant: Optional response cache variant index, e.g. the chunk's position
+
+        Returns:
+            List[MCQQuestion]: Validated questions (may be fewer than ``count``)
+
+        Raises:
+            CustomException: If no valid MCQ could be generated
+        """
+        return self._generate_batch(
+            get_mcq_batch_prompt,
+            MCQQuestion,
+            topic,
+            difficulty,
+            count,
+            deadline,
+            variant,
+        )
+
+    def generate_fill_blank_batch(
+        self,
+        topic: str,
+        difficulty: str = "medium",
+        count: int = 5,
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
+    ) -> List[FillBlankQuestion]:
+        """
+        Generate several fill-in-the-blank questions in one completion.
+
+        Args:
+            topic: The topic for the questions
+            difficulty: The difficulty level ('easy', 'medium', 'hard')
+            count: Number of questions to generate
+            deadline: Optional quiz deadline
+            variant: Optional response cache variant index, e.g. the chunk's position
+
+        Returns:
+            List[FillBlankQuestion]: Validated questions (may be fewer than ``count``)
+
+        Raises:
+            CustomException: If no valid fill-in-the-blank question could be generated
+        """
+        return self._generate_batch(
+            get_fill_blank_batch_prompt,
+            FillBlankQuestion,
+            topic,
+            difficulty,
+            count,
+            deadline,
+            variant,
+        )
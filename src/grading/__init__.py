@@ -0,0 +1 @@
+"""Answer grading package."""
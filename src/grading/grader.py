@@ -0,0 +1,335 @@
+"""
+Grading engine module for the AI Study Buddy application.
+Grades batches of answers at once, with normalized and fuzzy matching for
+fill-in-the-blank.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.settings import settings
+
+# Symbols that change numeric or technical answers ("2.5", "-40", "3/4", "C++") are kept
+_PUNCTUATION = re.compile(r"[^\w\s.\-/+#^%]")
+_WORD_PUNCTUATION = re.compile(r"[.\-/]")
+_STRAY_DOT = re.compile(r"\.(?!\d)")
+_LETTERS_ONLY = re.compile(r"^[^\W\d_]+(?: [^\W\d_]+)*$")
+_LEADING_ARTICLE = re.compile(r"^(?:the|a|an)\s+")
+_PARENTHETICAL = re.compile(r"\s*\([^)]*\)")
+_DIGIT = re.compile(r"\d")
+
+
+@lru_cache(maxsize=65536)
+def normalize_answer(text: str) -> str:
+    """
+    Normalize an answer for comparison.
+
+    Applies Unicode compatibility folding, strips accents and case, replaces
+    punctuation with spaces, drops a leading article and collapses whitespace,
+    so "Paris.", " paris" and "PARÍS" compare equal, as do "the Nile" and "Nile".
+    The symbols ``+ # ^ %`` are kept, and so are ``. - /`` in answers with
+    digits (except a dot that is not a decimal point), so "5.2" differs from
+    "2.5", "-40" from "40" and "C++" from "C".
+
+    Args:
+        text: Raw answer text
+
+    Returns:
+        str: Normalized answer
+    """
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = _PUNCTUATION.sub(" ", text)
+    if _DIGIT.search(text):
+        text = _STRAY_DOT.sub(" ", text)
+    else:
+        text = _WORD_PUNCTUATION.sub(" ", text)
+    text = " ".join(text.split())
+    return _LEADING_ARTICLE.sub("", text)
+
+
+def accepted_answers(
+    correct_answer: str, alternatives: Sequence[str] = ()
+) -> List[str]:
+    """
+    Normalized forms accepted for a fill-in-the-blank answer.
+
+    Includes the answer, its alternatives, and each of them without a
+    parenthetical remark ("Nile (river)" also accepts "Nile").
+
+    Args:
+        correct_answer: The expected answer
+        alternatives: Other accepted answers
+
+    Returns:
+        List[str]: Unique, non-empty normalized answers
+    """
+    forms = []
+    for answer in (correct_answer, *alternatives):
+        forms.append(normalize_answer(answer))
+        forms.append(normalize_answer(_PARENTHETICAL.sub("", answer)))
+    return [form for form in dict.fromkeys(forms) if form]
+
+
+@lru_cache(maxsize=65536)
+def _accepted(correct_answer: str, alternatives: Tuple[str, ...]) -> List[str]:
+    """Cached ``accepted_answers`` for hashable alternatives."""
+    return accepted_answers(correct_answer, alternatives)
+
+
+def _any_order_equal(given: str, accepted: str) -> bool:
+    """
+    Whether two normalized answers have the same words in another order.
+
+    Only answers made of several words of letters qualify: the order of
+    numbers and symbols matters ("1945-1939", "3^10").
+    """
+    return (
+        " " in accepted
+        and bool(_LETTERS_ONLY.match(given))
+        and bool(_LETTERS_ONLY.match(accepted))
+        and sorted(given.split()) == sorted(accepted.split())
+    )
+
+
+def one_edit_apart(given: str, accepted: str) -> bool:
+    """
+    Whether two different strings differ by one missing, extra or swapped letter.
+
+    Substituted letters do not count: in short answers they change the word
+    too often ("Iran" and "Iraq", "Jupiter" and "Juniper").
+
+    Args:
+        given: Normalized submitted answer
+        accepted: Normalized accepted answer
+
+    Returns:
+        bool: True for one insertion, deletion or adjacent transposition
+    """
+    if len(given) == len(accepted):
+        diffs = [i for i, (a, b) in enumerate(zip(given, accepted)) if a != b]
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and given[diffs[0]] == accepted[diffs[1]]
+            and given[diffs[1]] == accepted[diffs[0]]
+        )
+    shorter, longer = sorted((given, accepted), key=len)
+    if len(longer) - len(shorter) != 1:
+        return False
+    for i, char in enumerate(shorter):
+        if char != longer[i]:
+            return shorter[i:] == longer[i + 1 :]
+    return True
+
+
+def edit_distances(left: Sequence[str], right: Sequence[str]) -> np.ndarray:
+    """
+    Levenshtein distances of many string pairs, computed together.
+
+    Runs the Wagner-Fischer recurrence one row at a time for every pair at
+    once. Within a row, insertions are resolved with a running minimum
+    instead of a Python loop over columns.
+
+    Args:
+        left: First strings
+        right: Second strings, paired with ``left`` by position
+
+    Returns:
+        np.ndarray: int32 distance for every pair
+    """
+    count = len(left)
+    if count == 0:
+        return np.zeros(0, dtype=np.int32)
+
+    left_lengths = np.fromiter((len(s) for s in left), dtype=np.int32, count=count)
+    right_lengths = np.fromiter((len(s) for s in right), dtype=np.int32, count=count)
+    width = int(right_lengths.max()) + 1
+
+    # Code points padded with distinct values so padding never matches
+    left_codes = np.full((count, max(1, int(left_lengths.max()))), -1, dtype=np.int64)
+    right_codes = np.full((count, width - 1), -2, dtype=np.int64)
+    for i, (a, b) in enumerate(zip(left, right)):
+        left_codes[i, : len(a)] = [ord(c) for c in a]
+        right_codes[i, : len(b)] = [ord(c) for c in b]
+
+    columns = np.arange(width, dtype=np.int32)
+    row = np.broadcast_to(columns, (count, width)).copy()
+    distances = right_lengths.copy()
+    rows = np.arange(count)
+
+    for i in range(1, int(left_lengths.max()) + 1):
+        cost = (right_codes != left_codes[:, i - 1 : i]).astype(np.int32)
+        current = np.empty_like(row)
+        current[:, 0] = i
+        # deletion or substitution
+        current[:, 1:] = np.minimum(row[:, 1:] + 1, row[:, :-1] + cost)
+        # insertion: current[j] = min over k <= j of current[k] + (j - k)
+        current = np.minimum.accumulate(current - columns, axis=1) + columns
+        row = current
+
+        finished = left_lengths == i
+        distances[finished] = row[rows[finished], right_lengths[finished]]
+
+    return distances
+
+
+def grade_mcq(
+    user_answers: Sequence[str], correct_answers: Sequence[str]
+) -> np.ndarray:
+    """
+    Grade multiple choice answers by exact option match.
+
+    Args:
+        user_answers: Selected options
+        correct_answers: Correct options, paired by position
+
+    Returns:
+        np.ndarray: Boolean correctness per answer
+    """
+    return np.equal(
+        np.asarray(user_answers, dtype=object),
+        np.asarray(correct_answers, dtype=object),
+    ).astype(bool)
+
+
+def grade_fill_blank(
+    user_answers: Sequence[str],
+    correct_answers: Sequence[str],
+    alternatives: Optional[Sequence[Sequence[str]]] = None,
+    threshold: Optional[float] = None,
+    min_fuzzy_length: Optional[int] = None,
+    short_length: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Grade fill-in-the-blank answers in one batch.
+
+    An answer is correct when, after normalization, it equals an accepted
+    answer (also with words in any order, for answers made only of words),
+    or when it is a near miss: both are at least ``min_fuzzy_length``
+    characters long, contain only letters and start with the same letter,
+    and either the accepted answer has at most ``short_length`` characters
+    and the two are one missing, extra or swapped letter apart, or it is
+    longer and their edit-distance similarity reaches ``threshold``.
+    Repeated cases are only graded once, and all long fuzzy comparisons run
+    in one vectorized pass.
+
+    Args:
+        user_answers: Submitted answers
+        correct_answers: Expected answers, paired by position
+        alternatives: Other accepted answers per position (optional)
+        threshold: Minimum similarity, 1 - distance / longer length (defaults to
+            settings)
+        min_fuzzy_length: Shortest answer that is fuzzy-matched (defaults to settings)
+        short_length: Longest accepted answer held to a single letter slip
+            (defaults to settings)
+
+    Returns:
+        np.ndarray: Boolean correctness per answer
+    """
+    threshold = settings.GRADING_FUZZY_THRESHOLD if threshold is None else threshold
+    min_fuzzy_length = (
+        settings.GRADING_MIN_FUZZY_LENGTH
+        if min_fuzzy_length is None
+        else min_fuzzy_length
+    )
+    short_length = (
+        settings.GRADING_SHORT_ANSWER_LENGTH if short_length is None else short_length
+    )
+    alternatives = (
+        [tuple(others) for others in alternatives]
+        if alternatives is not None
+        else repeat((), len(correct_answers))
+    )
+
+    # Classroom batches repeat the same answers, so each distinct case is graded once
+    cases: Dict[Tuple[str, str, Tuple[str, ...]], int] = {}
+    case_ids = np.fromiter(
+        (
+            cases.setdefault(case, len(cases))
+            for case in zip(
+                map(str, user_answers), map(str, correct_answers), alternatives
+            )
+        ),
+        dtype=np.int64,
+        count=len(user_answers),
+    )
+
+    correct = np.zeros(len(cases), dtype=bool)
+    fuzzy_pairs: Dict[Tuple[str, str], List[int]] = {}
+
+    for (user, answer, others), case_id in cases.items():
+        given = normalize_answer(user)
+        if not given:
+            continue
+        for accepted in _accepted(answer, others):
+            if given == accepted or _any_order_equal(given, accepted):
+                correct[case_id] = True
+                break
+            # A different first letter makes another word ("Prussia" is not "Russia")
+            if (
+                min(len(given), len(accepted)) < min_fuzzy_length
+                or given[0] != accepted[0]
+                or not _LETTERS_ONLY.match(given)
+                or not _LETTERS_ONLY.match(accepted)
+            ):
+                continue
+            if len(accepted) <= short_length:
+                if one_edit_apart(given, accepted):
+                    correct[case_id] = True
+                    break
+            else:
+                fuzzy_pairs.setdefault((given, accepted), []).append(case_id)
+
+    if fuzzy_pairs:
+        pairs = list(fuzzy_pairs)
+        left = [given for given, _ in pairs]
+        right = [accepted for _, accepted in pairs]
+        longest = np.maximum(
+            np.fromiter(map(len, left), dtype=np.int32),
+            np.fromiter(map(len, right), dtype=np.int32),
+        )
+        similarity = 1.0 - edit_distances(left, right) / longest
+        for pair, matched in zip(pairs, similarity >= threshold):
+            if matched:
+                correct[fuzzy_pairs[pair]] = True
+
+    return correct[case_ids]
+
+
+def grade_answers(
+    question_types: Sequence[str],
+    user_answers: Sequence[str],
+    correct_answers: Sequence[str],
+    alternatives: Optional[Sequence[Sequence[str]]] = None,
+) -> np.ndarray:
+    """
+    Grade a mixed batch of answers, such as a quiz or a historical result set.
+
+    Args:
+        question_types: 'MCQ' or 'Fill in the blank' per answer
+        user_answers: Submitted answers
+        correct_answers: Expected answers, paired by position
+        alternatives: Other accepted fill-in-the-blank answers per position (optional)
+
+    Returns:
+        np.ndarray: Boolean correctness per answer
+    """
+    types = np.asarray(question_types, dtype=object)
+    users = np.asarray(user_answers, dtype=object)
+    answers = np.asarray(correct_answers, dtype=object)
+    correct = np.zeros(len(types), dtype=bool)
+
+    mcq = types == "MCQ"
+    correct[mcq] = grade_mcq(users[mcq], answers[mcq])
+
+    blanks = np.flatnonzero(~mcq)
+    if len(blanks):
+        others = None if alternatives is None else [alternatives[i] for i in blanks]
+        correct[blanks] = grade_fill_blank(users[blanks], answers[blanks], others)
+    return correct
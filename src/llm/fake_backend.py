@@ -0,0 +1,201 @@
+"""
+Fake LLM backend for the AI Study Buddy application.
+Imitates the Groq client offline with configurable latency, errors and malformed output.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+import httpx
+import groq
+
+from src.config.settings import settings
+
+_BATCH_COUNT = re.compile(r"Count: (\d+)")
+
+
+class FakeLLMClient:
+    """
+    Deterministic stand-in exposing the parts of the Groq client this app uses.
+
+    Latency follows a fixed, uniform or log-normal distribution. A share of
+    calls fail with rate-limit or server errors, and another share return
+    malformed JSON, so retry and parsing paths can be exercised offline.
+    """
+
+    def __init__(
+        self,
+        latency: str = "lognormal",
+        latency_median: float = 0.5,
+        latency_spread: float = 0.5,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = 0,
+    ):
+        """
+        Initialize the fake client.
+
+        Args:
+            latency: Distribution name: 'fixed', 'uniform' or 'lognormal'
+            latency_median: Median latency in seconds
+            latency_spread: Uniform half-width in seconds, or log-normal sigma
+            error_rate: Share of calls that raise a provider error
+            malformed_rate: Share of successful calls that return broken JSON
+            seed: Random seed; the same seed replays the same sequence of outcomes
+        """
+        self.latency = latency
+        self.latency_median = latency_median
+        self.latency_spread = latency_spread
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.calls = 0
+        self.errors = 0
+        self.malformed = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        # System messages seen so far, reported back as cached prompt tokens
+        # like a provider prefix cache
+        self._cached_prefixes: set = set()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(
+            list=lambda: [SimpleNamespace(id=settings.MODEL_NAME)]
+        )
+
+    def _draw(self) -> Dict[str, Any]:
+        """Draw the latency and outcome of one call under the lock."""
+        with self._lock:
+            self.calls += 1
+            if self.latency == "fixed":
+                delay = self.latency_median
+            elif self.latency == "uniform":
+                delay = self._random.uniform(
+                    max(0.0, self.latency_median - self.latency_spread),
+                    self.latency_median + self.latency_spread,
+                )
+            else:
+                delay = self.latency_median * self._random.lognormvariate(
+                    0, self.latency_spread
+                )
+
+            fail = self._random.random() < self.error_rate
+            broken = not fail and self._random.random() < self.malformed_rate
+            status = self._random.choice((429, 500, 503)) if fail else None
+            self.errors += fail
+            self.malformed += broken
+            return {"delay": delay, "status": status, "broken": broken, "n": self.calls}
+
+    @staticmethod
+    def _question(prompt: str, n: int) -> Dict[str, Any]:
+        """Build a valid question payload matching the prompt type."""
+        # Several n-specific words keep fake questions apart for near-duplicate checks
+        terms = f"alpha{n} beta{n} gamma{n} delta{n}"
+        if "fill-in-the-blank" in prompt:
+            return {
+                "question": f"The fake fact about {terms} is _____.",
+                "answer": f"answer {n}",
+            }
+        return {
+            "question": f"Which option is correct about {terms}?",
+            "options": [f"Option {n}A", f"Option {n}B", f"Option {n}C", f"Option {n}D"],
+            "correct_answer": f"Option {n}B",
+        }
+
+    def _content(
+        self, prompt: str, n: int, broken: bool, json_mode: bool = False
+    ) -> str:
+        """Render the completion text for a prompt."""
+        match = _BATCH_COUNT.search(prompt)
+        if match:
+            payload: Any = [
+                self._question(prompt, n * 100 + i) for i in range(int(match.group(1)))
+            ]
+            if json_mode:
+                payload = {"questions": payload}
+        else:
+            payload = self._question(prompt, n)
+
+        text = json.dumps(payload)
+        if broken:
+            # cut the JSON short so it cannot be repaired
+            return "Here is your question: " + text[: len(text) // 2]
+        return text
+
+    def _cached_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Tokens of a system message sent before, which a provider would cache."""
+        if messages[0]["role"] != "system":
+            return 0
+        system = messages[0]["content"]
+        with self._lock:
+            seen = system in self._cached_prefixes
+            self._cached_prefixes.add(system)
+        return len(system) // 4 if seen else 0
+
+    def _create(
+        self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs
+    ):
+        """Imitate ``client.chat.completions.create``."""
+        outcome = self._draw()
+        time.sleep(outcome["delay"])
+
+        if outcome["status"] is not None:
+            request = httpx.Request(
+                "POST", "http://fake-llm/openai/v1/chat/completions"
+            )
+            response = httpx.Response(
+                outcome["status"], request=request, headers={"retry-after": "0"}
+            )
+            if outcome["status"] == 429:
+                raise groq.RateLimitError(
+                    "Fake rate limit", response=response, body=None
+                )
+            raise groq.InternalServerError(
+                "Fake server error", response=response, body=None
+            )
+
+        prompt = "\n\n".join(message["content"] for message in messages)
+        json_mode = kwargs.get("response_format", {}).get("type") == "json_object"
+        content = self._content(prompt, outcome["n"], outcome["broken"], json_mode)
+        if stream:
+            return self._stream(content)
+
+        usage = SimpleNamespace(
+            prompt_tokens=len(prompt) // 4,
+            completion_tokens=len(content) // 4,
+            total_tokens=(len(prompt) + len(content)) // 4,
+            prompt_tokens_details=SimpleNamespace(
+                cached_tokens=self._cached_tokens(messages)
+            ),
+        )
+        message = SimpleNamespace(role="assistant", content=content)
+        return SimpleNamespace(
+            model=model, choices=[SimpleNamespace(message=message)], usage=usage
+        )
+
+    @staticmethod
+    def _stream(content: str) -> Iterator[SimpleNamespace]:
+        """Yield the content in small delta chunks like a streamed completion."""
+        for start in range(0, len(content), 16):
+            delta = SimpleNamespace(content=content[start : start + 16])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+
+def create_fake_client() -> FakeLLMClient:
+    """
+    Create a fake client configured from the FAKE_LLM_* settings.
+
+    Returns:
+        FakeLLMClient: Configured fake client
+    """
+    return FakeLLMClient(
+        latency=settings.FAKE_LLM_LATENCY,
+        latency_median=settings.FAKE_LLM_LATENCY_MEDIAN,
+        latency_spread=settings.FAKE_LLM_LATENCY_SPREAD,
+        error_rate=settings.FAKE_LLM_ERROR_RATE,
+        malformed_rate=settings.FAKE_LLM_MALFORMED_RATE,
+        seed=settings.FAKE_LLM_SEED,
+    )
@@ -3,34 +3,510 @@ Groq LLM client module for the AI Study Buddy application.
 Handles communication with the Groq API for question generation.
 """
 
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+import httpx
 from groq import Groq
 from src.config.settings import settings
+from src.common.metrics import observe_stage, span
+from src.llm.hedging import get_hedged_caller
+from src.llm.rate_limiter import estimate_tokens, get_scheduler
+from src.llm.retry import Deadline, ErrorKind, classify_error
+from src.llm.router import ModelTarget, ModelUnavailableError, get_model_router
+from src.llm.response_cache import get_response_cache, make_cache_key
+from src.llm.usage import get_prompt_usage
+from src.prompts.templates import Prompt
 
+T = TypeVar("T")
 
-def get_groq_client() -> Groq:
+# Process-wide client shared by every session so HTTP connections are reused
+_shared_client: Optional[Groq] = None
+_shared_client_lock = threading.Lock()
+
+
+def create_groq_client() -> Groq:
     """
-    Create and return a Groq client instance.
-    
+    Create a new Groq client with its own pooled HTTP connections.
+
     Returns:
         Groq: Configured Groq client
     """
-    return Groq(api_key=settings.GROQ_API_KEY)
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=settings.LLM_POOL_SIZE,
+            max_keepalive_connections=settings.LLM_POOL_SIZE,
+            keepalive_expiry=settings.LLM_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS
+        ),
+    )
+    # Retries are handled by QuestionGenerator, so the SDK must not retry on its own
+    return Groq(
+        api_key=settings.GROQ_API_KEY,
+        base_url=settings.GROQ_BASE_URL,
+        http_client=http_client,
+        max_retries=0,
+    )
+
+
+def _create_fake_client():
+    """Create the offline fake client (imported lazily, only benchmarks use it)."""
+    from src.llm.fake_backend import create_fake_client
+
+    return create_fake_client()
+
+
+def _create_local_client():
+    """Create a client for the local OpenAI-compatible server (imported lazily)."""
+    from src.llm.openai_compat import create_local_client
+
+    return create_local_client()
+
+
+# Client factories selectable through settings.LLM_BACKEND and named in
+# LLM_MODELS. Every client must expose the Groq surface used here:
+# chat.completions.create and models.list.
+_BACKENDS: Dict[str, Callable[[], Any]] = {
+    "groq": create_groq_client,
+    "fake": _create_fake_client,
+    "local": _create_local_client,
+}
+
+# Model that answered the last upstream call made in this context
+_answered_by: contextvars.ContextVar[Optional[ModelTarget]] = contextvars.ContextVar(
+    "llm_answered_by", default=None
+)
+
+# Clients of the other backends in the model chain, created on first use
+_backend_clients: Dict[str, Any] = {}
+
+
+def register_backend(name: str, factory: Callable[[], Any]) -> None:
+    """
+    Make another LLM client factory selectable through settings.LLM_BACKEND.
+
+    Args:
+        name: Backend name used in LLM_BACKEND
+        factory: Zero-argument function returning a Groq-compatible client
+    """
+    _BACKENDS[name] = factory
+
+
+def create_llm_client(backend: Optional[str] = None) -> Any:
+    """
+    Create a client for the given or configured backend.
+
+    Args:
+        backend: Backend name (defaults to settings.LLM_BACKEND)
+
+    Returns:
+        Any: Groq-compatible client
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    name = backend or settings.LLM_BACKEND
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"Unknown LLM backend '{name}', expected one of {sorted(_BACKENDS)}"
+        )
+    return _BACKENDS[name]()
+
+
+def get_groq_client() -> Groq:
+    """
+    Return the process-wide LLM client, creating it on first use.
+
+    Reusing one client keeps HTTP keep-alive connections and TLS sessions
+    alive across button presses and Streamlit sessions. The client comes from
+    the backend selected by settings.LLM_BACKEND ('groq' by default).
+
+    Returns:
+        Groq: Shared Groq (or Groq-compatible) client
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = create_llm_client()
+    return _shared_client
+
+
+def get_backend_client(backend: str, default_client: Any) -> Any:
+    """
+    Return the client for a backend of the model chain.
+
+    Args:
+        backend: Backend name from a ``backend:model`` entry
+        default_client: Client used for settings.LLM_BACKEND, usually the one
+            passed by the caller
+
+    Returns:
+        Any: Groq-compatible client, shared per backend
+    """
+    if backend == settings.LLM_BACKEND:
+        return default_client
+    client = _backend_clients.get(backend)
+    if client is None:
+        with _shared_client_lock:
+            client = _backend_clients.get(backend)
+            if client is None:
+                client = _backend_clients[backend] = create_llm_client(backend)
+    return client
+
+
+def check_llm_health(client: Optional[Groq] = None) -> Dict[str, Any]:
+    """
+    Readiness probe for the LLM provider.
+
+    Args:
+        client: Client to probe (defaults to the shared client)
+
+    Returns:
+        Dict[str, Any]: ``ready`` flag, probe latency in milliseconds and error text
+    """
+    start = time.perf_counter()
+    try:
+        (client or get_groq_client()).models.list()
+        return {
+            "ready": True,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "error": None,
+        }
+    except Exception as e:
+        return {
+            "ready": False,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 1),
+            "error": str(e),
+        }
+
+
+def _request_options(timeout: Optional[float]) -> Dict[str, Any]:
+    """Per-request options; the client default timeout applies when none is given."""
+    return {} if timeout is None else {"timeout": timeout}
+
+
+def _messages(prompt: Union[str, Prompt]) -> List[Dict[str, str]]:
+    """
+    Chat messages for a prompt, the static system message first.
+
+    Keeping the system message identical and in front lets the provider
+    serve it from its prompt cache on every call of the same kind.
+    """
+    if isinstance(prompt, Prompt):
+        return [
+            {"role": "system", "content": prompt.system},
+            {"role": "user", "content": prompt.user},
+        ]
+    return [{"role": "user", "content": prompt}]
+
+
+def _prompt_text(prompt: Union[str, Prompt]) -> str:
+    """Full prompt text, used for token estimates."""
+    return prompt.text if isinstance(prompt, Prompt) else prompt
+
+
+def _prompt_kind(prompt: Union[str, Prompt]) -> str:
+    """Usage label of a prompt; plain strings are counted as 'other'."""
+    return prompt.kind if isinstance(prompt, Prompt) else "other"
+
+
+def _response_format(prompt: Union[str, Prompt]) -> Dict[str, Any]:
+    """Request JSON mode for question prompts when LLM_JSON_MODE is enabled."""
+    if settings.LLM_JSON_MODE and isinstance(prompt, Prompt):
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def _wait_for_budget(prompt: str, timeout: Optional[float] = None) -> int:
+    """
+    Queue the call in the shared scheduler until the rate limits allow it.
+
+    Args:
+        prompt: The prompt about to be sent
+        timeout: Longest time to wait (None waits as long as it takes)
+
+    Returns:
+        int: Tokens reserved for the call (0 when rate limiting is disabled)
+
+    Raises:
+        RateLimitTimeoutError: If no budget was available within ``timeout``
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return 0
+    tokens = estimate_tokens(prompt)
+    with span("rate_limit_wait"):
+        get_scheduler().acquire(tokens, timeout=timeout)
+    return tokens
+
+
+def _refund_budget(reserved: int, error: Exception) -> None:
+    """
+    Give back the rate limit budget of a failed call.
+
+    A response that failed validation was still generated, so it keeps its
+    budget. An error response produced no completion, so its tokens are
+    given back, while the request still counts against the provider's
+    request limit. A call that got no response at all gives back both.
+
+    Args:
+        reserved: Tokens reserved for the call (0 when rate limiting is disabled)
+        error: The call's error
+    """
+    if not reserved or classify_error(error) is ErrorKind.SCHEMA:
+        return
+    answered = getattr(error, "status_code", None) is not None
+    get_scheduler().refund(0 if answered else 1, reserved)
+
+
+def _cache_key(prompt: Union[str, Prompt], variant: int) -> str:
+    """Response cache key: primary routed model, messages, temperature and variant."""
+    system, user = (
+        (prompt.system, prompt.user) if isinstance(prompt, Prompt) else ("", prompt)
+    )
+    model = str(get_model_router().preferred(prompt)[0])
+    return make_cache_key(model, system, user, settings.TEMPERATURE, variant)
+
+
+def _call_with_fallback(
+    client: Groq,
+    prompt: Union[str, Prompt],
+    call: Callable[[Any, str, Optional[float]], T],
+    timeout: Optional[float] = None,
+) -> Tuple[T, int]:
+    """
+    Make an upstream call on the first model of the routed chain that answers.
+
+    Every attempt takes its own rate limit budget, since every attempt is
+    an upstream call. A model that fails is recorded in its circuit breaker
+    and the next one is tried at once; backoff between rounds is left to
+    QuestionGenerator. The model that answered is left in ``_answered_by``.
+
+    Args:
+        client: Client for settings.LLM_BACKEND
+        prompt: The prompt about to be sent
+        call: Makes the call given a client, a model name and a timeout
+        timeout: Longest time for all attempts, rate limit waits included
+
+    Returns:
+        Tuple[T, int]: Result of the first successful call and the tokens
+        reserved for it
+
+    Raises:
+        ModelUnavailableError: If every model's circuit breaker is open
+        RateLimitTimeoutError: If no rate limit budget was available in time
+        Exception: The last model's error when every model failed
+    """
+    router = get_model_router()
+    alone = len(router.preferred(prompt)) == 1
+    text = _prompt_text(prompt)
+    deadline = Deadline(timeout)
+    last_error: Optional[Exception] = None
+    for target in router.candidates(prompt):
+        if not router.acquire(target, alone):
+            continue
+        try:
+            reserved = _wait_for_budget(text, deadline.remaining())
+        except BaseException:
+            router.release(target)
+            raise
+        start = time.perf_counter()
+        try:
+            result = call(
+                get_backend_client(target.backend, client),
+                target.model,
+                deadline.remaining(),
+            )
+        except Exception as e:
+            router.record_failure(target, e)
+            _refund_budget(reserved, e)
+            last_error = e
+            continue
+        router.record_success(target, time.perf_counter() - start)
+        _answered_by.set(target)
+        return result, reserved
+
+    if last_error is not None:
+        raise last_error
+    raise ModelUnavailableError("Every model's circuit breaker is open")
+
+
+def cached_completion(
+    prompt: Union[str, Prompt],
+    variant: Optional[int],
+    compute: Callable[[], str],
+    timeout: Optional[float] = None,
+) -> str:
+    """
+    Run a completion through the shared response cache.
+
+    Requests with the same prompt and variant share one upstream call while
+    it is in flight and reuse its response until it expires. Only answers
+    from the primary routed model are kept. Without a variant, or with
+    LLM_CACHE_ENABLED off, ``compute`` is simply called.
+
+    Args:
+        prompt: The prompt sent by ``compute``
+        variant: Index telling apart requests that should get different
+            answers to the same prompt (None disables caching)
+        compute: Makes the upstream call and returns the response content
+        timeout: Longest time to wait for a shared call made by another request
+
+    Returns:
+        str: The response content
+    """
+    if variant is None or not settings.LLM_CACHE_ENABLED:
+        return compute()
+
+    # The key names the primary model, so answers from a fallback model are not kept
+    primary = get_model_router().preferred(prompt)[0]
+    token = _answered_by.set(None)
+    try:
+        return get_response_cache().get_or_compute(
+            _cache_key(prompt, variant),
+            compute,
+            timeout,
+            keep=lambda: _answered_by.get() == primary,
+        )
+    finally:
+        _answered_by.reset(token)
+
+
+def discard_cached_completion(
+    prompt: Union[str, Prompt], variant: Optional[int]
+) -> None:
+    """
+    Drop a cached response that could not be used, so the next request asks again.
+
+    Args:
+        prompt: The prompt of the cached request
+        variant: Its variant index (None is ignored)
+    """
+    if variant is not None and settings.LLM_CACHE_ENABLED:
+        get_response_cache().discard(_cache_key(prompt, variant))
 
 
-def generate_completion(client: Groq, prompt: str) -> str:
+def generate_completion(
+    client: Groq,
+    prompt: Union[str, Prompt],
+    timeout: Optional[float] = None,
+    variant: Optional[int] = None,
+) -> str:
     """
     Generate completion using Groq client.
-    
+
+    Question prompts are sent as a cached system prefix plus a short user
+    message, in JSON mode when LLM_JSON_MODE is enabled, and their token
+    usage is recorded per prompt kind. The model comes from the routed
+    fallback chain (see ``src.llm.router``). With a variant, identical
+    requests share one call and its cached response (see ``cached_completion``).
+
     Args:
         client: The Groq client instance
         prompt: The prompt to send to the model
-        
+        timeout: Optional per-request timeout in seconds
+        variant: Optional response cache variant index
+
     Returns:
         str: The generated response content
     """
-    response = client.chat.completions.create(
-        model=settings.MODEL_NAME,
-        messages=[{"role": "user", "content": prompt}],
-        temperature=settings.TEMPERATURE
+    return cached_completion(
+        prompt, variant, lambda: _request_completion(client, prompt, timeout), timeout
+    )
+
+
+def _try_budget(prompt: str) -> bool:
+    """Take rate limit budget for an optional call (a hedge) only if it is free now."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return True
+    return get_scheduler().try_acquire(estimate_tokens(prompt))
+
+
+def _request_completion(
+    client: Groq, prompt: Union[str, Prompt], timeout: Optional[float]
+) -> str:
+    """Make one non-streamed upstream call within the rate limits.
+
+    The call is hedged when LLM_HEDGE_ENABLED is on.
+    """
+    text = _prompt_text(prompt)
+    kind = _prompt_kind(prompt)
+
+    def call(target_client: Any, model: str, remaining: Optional[float]):
+        def create():
+            return target_client.chat.completions.create(
+                model=model,
+                messages=_messages(prompt),
+                temperature=settings.TEMPERATURE,
+                **_response_format(prompt),
+                **_request_options(remaining),
+            )
+
+        if settings.LLM_HEDGE_ENABLED:
+            # Latencies are tracked per model, since models differ in speed
+            return get_hedged_caller().call(
+                f"{kind}@{model}", create, lambda: _try_budget(text)
+            )
+        return create()
+
+    start = time.perf_counter()
+    with span("llm_call", kind=kind):
+        response, reserved = _call_with_fallback(client, prompt, call, timeout)
+
+    usage = getattr(response, "usage", None)
+    get_prompt_usage().record_response(kind, usage, text, time.perf_counter() - start)
+    if reserved and usage is not None:
+        get_scheduler().adjust_tokens(usage.total_tokens - reserved)
+
+    return response.choices[0].message.content
+
+
+def stream_completion(
+    client: Groq, prompt: Union[str, Prompt], timeout: Optional[float] = None
+) -> Iterator[str]:
+    """
+    Stream a completion from the Groq client chunk by chunk.
+
+    JSON mode is not requested for streamed completions; the incremental
+    extractor in QuestionGenerator finds the JSON in the stream instead.
+    Models fail over only until the stream has started.
+
+    Args:
+        client: The Groq client instance
+        prompt: The prompt to send to the model
+        timeout: Optional per-request timeout in seconds
+
+    Yields:
+        str: Text deltas in the order the model produces them
+    """
+    text = _prompt_text(prompt)
+    start = time.perf_counter()
+    stream, _ = _call_with_fallback(
+        client,
+        prompt,
+        lambda target_client, model, remaining: target_client.chat.completions.create(
+            model=model,
+            messages=_messages(prompt),
+            temperature=settings.TEMPERATURE,
+            stream=True,
+            **_request_options(remaining),
+        ),
+        timeout,
     )
-    return response.choices[0].message.content
\ No newline at end of file
+    try:
+        for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+    finally:
+        # release the connection even when the caller stops reading early
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+        elapsed = time.perf_counter() - start
+        observe_stage("llm_call", elapsed, kind=_prompt_kind(prompt))
+        get_prompt_usage().record_response(_prompt_kind(prompt), None, text, elapsed)
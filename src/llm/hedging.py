@@ -0,0 +1,321 @@
+"""
+Hedging module for the AI Study Buddy application.
+Sends a duplicate of a slow LLM call and keeps whichever response arrives first.
+
+A call is hedged once it has run longer than ``LLM_HEDGE_PERCENTILE`` of the
+recent latencies of its prompt kind. Hedges are paid for out of a token
+bucket that earns ``LLM_HEDGE_MAX_RATIO`` per call, so hedges never exceed
+that share of upstream calls.
+"""
+
+import bisect
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.common.metrics import get_metrics
+
+T = TypeVar("T")
+
+# Bucket upper bounds in seconds, 15% apart from 50 ms to about two minutes
+LATENCY_BUCKETS: Tuple[float, ...] = tuple(0.05 * 1.15**i for i in range(56))
+
+
+class RollingLatencyHistogram:
+    """
+    Histogram of the last ``window`` latencies, for cheap percentile estimates.
+
+    Percentiles are reported as the upper bound of their bucket, so they
+    overestimate by at most one bucket width (15%).
+    """
+
+    def __init__(
+        self,
+        window: int,
+        min_samples: int,
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            window: Number of most recent latencies kept
+            min_samples: Samples needed before a percentile is reported
+            buckets: Increasing bucket upper bounds in seconds
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(buckets) + 1)
+        self._recent: Deque[int] = deque()
+
+    def record(self, seconds: float) -> None:
+        """
+        Add a latency, dropping the oldest one once the window is full.
+
+        Args:
+            seconds: Observed latency
+        """
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._recent.append(index)
+            self._counts[index] += 1
+            if len(self._recent) > self.window:
+                self._counts[self._recent.popleft()] -= 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate a latency percentile of the window.
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Latency in seconds, or None with too few samples
+            or when the percentile lies beyond the last bucket
+        """
+        with self._lock:
+            total = len(self._recent)
+            if total < max(1, self.min_samples):
+                return None
+            rank = max(1, math.ceil(q / 100 * total))
+            cumulative = 0
+            for index, count in enumerate(self._counts):
+                cumulative += count
+                if cumulative >= rank:
+                    return self.buckets[index] if index < len(self.buckets) else None
+        return None
+
+
+class HedgeBudget:
+    """Token bucket allowing at most ``ratio`` hedges per call, with a small burst."""
+
+    def __init__(self, ratio: float, burst: float = 5.0):
+        """
+        Initialize an empty budget.
+
+        Args:
+            ratio: Hedge tokens earned per call
+            burst: Most tokens that can be saved up
+        """
+        self.ratio = ratio
+        self.burst = burst
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+
+    def deposit(self) -> None:
+        """Earn the share of one call."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Spend one token for a hedge.
+
+        Returns:
+            bool: False if the cap does not allow another hedge yet
+        """
+        with self._lock:
+            if self._tokens < 1.0:
+                return False
+            self._tokens -= 1.0
+            return True
+
+    def refund(self) -> None:
+        """Return a token for a hedge that was not sent."""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1.0)
+
+
+class HedgedCaller:
+    """
+    Runs upstream calls, hedging the slow ones.
+
+    The duplicate cannot interrupt a synchronous HTTP request already in
+    progress, so the losing call is cancelled if it has not started and its
+    response is otherwise ignored.
+    """
+
+    def __init__(
+        self,
+        percentile: Optional[float] = None,
+        max_ratio: Optional[float] = None,
+        window: Optional[int] = None,
+        min_samples: Optional[int] = None,
+        pool_size: Optional[int] = None,
+    ):
+        """
+        Initialize the caller.
+
+        Args:
+            percentile: Latency percentile after which a call is hedged (defaults to
+                settings)
+            max_ratio: Most hedges per call (defaults to settings)
+            window: Latencies kept per prompt kind (defaults to settings)
+            min_samples: Samples needed before hedging a kind (defaults to settings)
+            pool_size: Threads running calls (defaults to settings or
+                ``default_pool_size``)
+        """
+        self.percentile = (
+            percentile if percentile is not None else settings.LLM_HEDGE_PERCENTILE
+        )
+        self.window = window or settings.LLM_HEDGE_WINDOW
+        self.min_samples = (
+            min_samples if min_samples is not None else settings.LLM_HEDGE_MIN_SAMPLES
+        )
+        self.budget = HedgeBudget(
+            max_ratio if max_ratio is not None else settings.LLM_HEDGE_MAX_RATIO
+        )
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, RollingLatencyHistogram] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=(
+                pool_size or settings.LLM_HEDGE_POOL_SIZE or default_pool_size()
+            ),
+            thread_name_prefix="llm-hedge",
+        )
+
+    def histogram(self, kind: str) -> RollingLatencyHistogram:
+        """
+        Latency histogram of a prompt kind, created on first use.
+
+        Args:
+            kind: Prompt kind
+
+        Returns:
+            RollingLatencyHistogram: The kind's histogram
+        """
+        with self._lock:
+            histogram = self._histograms.get(kind)
+            if histogram is None:
+                histogram = self._histograms[kind] = RollingLatencyHistogram(
+                    self.window, self.min_samples
+                )
+            return histogram
+
+    def call(self, kind: str, request: Callable[[], T], admit: Callable[[], bool]) -> T:
+        """
+        Run ``request``, sending a duplicate if it is slower than usual.
+
+        Args:
+            kind: Prompt kind, whose recent latencies set the hedge delay
+            request: Makes one upstream call
+            admit: Takes rate limit budget for the hedge without waiting;
+                returns False when the hedge cannot be sent now
+
+        Returns:
+            T: The first successful response
+
+        Raises:
+            Exception: The primary call's error when no call succeeded
+        """
+        histogram = self.histogram(kind)
+        self.budget.deposit()
+        delay = histogram.percentile(self.percentile)
+        if delay is None:
+            return self._timed(request, histogram)
+
+        # The delay runs from when the primary starts, not from when it was queued
+        started = threading.Event()
+        primary = self._submit(request, histogram, started)
+        started.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._may_hedge(kind, admit):
+            return primary.result()
+
+        self.logger.info(f"Hedging {kind} call after {delay:.2f}s")
+        hedge = self._submit(request, histogram)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    if future is hedge:
+                        get_metrics().inc(
+                            "study_buddy_llm_hedges_total", kind=kind, outcome="won"
+                        )
+                    return future.result()
+        return primary.result()
+
+    def _may_hedge(self, kind: str, admit: Callable[[], bool]) -> bool:
+        """Take a hedge token and rate limit budget, counting the outcome."""
+        if not self.budget.withdraw():
+            get_metrics().inc(
+                "study_buddy_llm_hedges_total", kind=kind, outcome="capped"
+            )
+            return False
+        if not admit():
+            self.budget.refund()
+            get_metrics().inc(
+                "study_buddy_llm_hedges_total", kind=kind, outcome="rate_limited"
+            )
+            return False
+        get_metrics().inc("study_buddy_llm_hedges_total", kind=kind, outcome="sent")
+        return True
+
+    def _submit(
+        self,
+        request: Callable[[], T],
+        histogram: RollingLatencyHistogram,
+        started: Optional[threading.Event] = None,
+    ) -> Future:
+        """Run a timed request on the pool, in a copy of the caller's context."""
+        return self._executor.submit(
+            contextvars.copy_context().run, self._timed, request, histogram, started
+        )
+
+    @staticmethod
+    def _timed(
+        request: Callable[[], T],
+        histogram: RollingLatencyHistogram,
+        started: Optional[threading.Event] = None,
+    ) -> T:
+        """Set ``started``, run a request and record its latency if it succeeds."""
+        start = time.perf_counter()
+        if started is not None:
+            started.set()
+        result = request()
+        histogram.record(time.perf_counter() - start)
+        return result
+
+
+def default_pool_size() -> int:
+    """
+    Threads needed so that no call waits for the pool.
+
+    Each quiz generated at once makes up to ``MAX_CONCURRENCY`` calls, and
+    each call may run with its hedge.
+
+    Returns:
+        int: Pool size
+    """
+    quizzes = max(settings.API_MAX_CONCURRENT_GENERATIONS, settings.BULK_CONCURRENCY)
+    return max(2, 2 * settings.MAX_CONCURRENCY * quizzes)
+
+
+@lru_cache(maxsize=1)
+def get_hedged_caller() -> HedgedCaller:
+    """
+    Return the process-wide hedged caller.
+
+    Returns:
+        HedgedCaller: Shared caller with its latency histograms and hedge budget
+    """
+    get_metrics().describe(
+        "study_buddy_llm_hedges_total",
+        "counter",
+        "Hedge decisions for slow LLM calls: sent, won, "
+        "capped by LLM_HEDGE_MAX_RATIO or rate_limited",
+    )
+    return HedgedCaller()
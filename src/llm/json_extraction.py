@@ -0,0 +1,201 @@
+"""
+JSON extraction module for the AI Study Buddy application.
+Pulls the first JSON value out of free-form LLM output and repairs common defects.
+"""
+
+import json
+import re
+from typing import Any, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_OPENERS = {"{": "}", "[": "]"}
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_BARE_WORD = re.compile(r"[A-Za-z_]+")
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class IncrementalJSONExtractor:
+    """
+    Finds the first balanced JSON object or array in text fed chunk by chunk.
+
+    The scanner keeps its bracket depth and string state between chunks, so a
+    streamed completion can be parsed as soon as its closing bracket arrives,
+    without waiting for any trailing commentary.
+    """
+
+    def __init__(self):
+        """Initialize an empty scanner."""
+        self._buffer = []
+        self._stack = []
+        self._quote: Optional[str] = None
+        self._escaped = False
+        self._started = False
+        self.text: Optional[str] = None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Scan the next chunk of output.
+
+        Args:
+            chunk: Next piece of LLM output
+
+        Returns:
+            Optional[str]: Text of the first complete JSON value once it has
+            been seen, otherwise None
+        """
+        if self.text is not None:
+            return self.text
+
+        for char in chunk:
+            if not self._started:
+                if char not in _OPENERS:
+                    continue
+                self._started = True
+
+            self._buffer.append(char)
+
+            if self._quote is not None:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == self._quote:
+                    self._quote = None
+            elif char in ('"', "'"):
+                self._quote = char
+            elif char in _OPENERS:
+                self._stack.append(_OPENERS[char])
+            elif self._stack and char == self._stack[-1]:
+                self._stack.pop()
+                if not self._stack:
+                    self.text = "".join(self._buffer)
+                    return self.text
+
+        return None
+
+
+def find_json_span(text: str) -> Optional[str]:
+    """
+    Return the first balanced JSON object or array in ``text``.
+
+    Args:
+        text: Raw LLM output, possibly with preamble, code fences or commentary
+
+    Returns:
+        Optional[str]: The JSON text, or None if no balanced value was found
+    """
+    return IncrementalJSONExtractor().feed(text)
+
+
+def repair_json(text: str) -> str:
+    """
+    Fix defects LLMs commonly produce in otherwise valid JSON.
+
+    Converts single-quoted strings to double-quoted ones, Python literals
+    (True/False/None) to JSON ones, and removes trailing commas.
+
+    Args:
+        text: Candidate JSON text
+
+    Returns:
+        str: Repaired JSON text
+    """
+    out = []
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char in ('"', "'"):
+            # copy a string literal, re-quoting single-quoted strings
+            quote = char
+            j = i + 1
+            chars = []
+            while j < length and text[j] != quote:
+                if text[j] == "\\" and j + 1 < length:
+                    chars.append(text[j : j + 2])
+                    j += 2
+                    continue
+                if quote == "'" and text[j] == '"':
+                    chars.append('\\"')
+                else:
+                    chars.append(text[j])
+                j += 1
+            body = "".join(chars)
+            if quote == "'":
+                body = body.replace("\\'", "'")
+            out.append(f'"{body}"')
+            i = j + 1
+            continue
+
+        match = _BARE_WORD.match(text, i)
+        if match:
+            word = match.group(0)
+            out.append(_PYTHON_LITERALS.get(word, word))
+            i += len(word)
+            continue
+
+        out.append(char)
+        i += 1
+
+    return _TRAILING_COMMA.sub(r"\1", "".join(out))
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse the first JSON value in an LLM response.
+
+    Tries a plain parse first, then the first balanced object or array, then
+    the repaired version of that span.
+
+    Args:
+        text: Raw LLM output
+
+    Returns:
+        Any: The parsed JSON value
+
+    Raises:
+        json.JSONDecodeError: If no parseable JSON value can be recovered
+    """
+    stripped = text.strip()
+    try:
+        return json.loads(stripped)
+    except json.JSONDecodeError as e:
+        first_error = e
+
+    span = find_json_span(stripped)
+    if span is None:
+        raise first_error
+
+    try:
+        return json.loads(span)
+    except json.JSONDecodeError:
+        return json.loads(repair_json(span))
+
+
+def parse_model(model_class: Type[ModelT], text: str) -> ModelT:
+    """
+    Parse and validate an LLM response against a Pydantic model.
+
+    Clean JSON, as returned in JSON mode, is validated in one pass with
+    ``model_validate_json``; anything else goes through ``extract_json`` first.
+
+    Args:
+        model_class: Pydantic model to validate against
+        text: Raw LLM output
+
+    Returns:
+        ModelT: The validated model instance
+
+    Raises:
+        json.JSONDecodeError: If no parseable JSON value can be recovered
+        ValidationError: If the JSON does not satisfy the model
+    """
+    try:
+        return model_class.model_validate_json(text)
+    except ValidationError as e:
+        if any(error["type"] != "json_invalid" for error in e.errors()):
+            raise
+    return model_class.model_validate(extract_json(text))
@@ -0,0 +1,142 @@
+"""
+OpenAI-compatible client module for the AI Study Buddy application.
+Talks to any server exposing the OpenAI chat completions API (Ollama, vLLM,
+llama.cpp, LM Studio) through the same surface as the Groq client.
+
+Errors are raised as the Groq SDK's exception types, so the retry policy and
+model routing treat a local server like any other backend.
+"""
+
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+import groq
+import httpx
+
+from src.config.settings import settings
+
+
+def _namespace(value: Any) -> Any:
+    """Turn decoded JSON into nested attribute objects, like the SDK response models."""
+    if isinstance(value, dict):
+        return SimpleNamespace(**{key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
+
+
+class OpenAICompatibleClient:
+    """
+    Minimal client for an OpenAI-compatible server.
+
+    Exposes ``chat.completions.create`` (streamed or not) and ``models.list``,
+    the parts of the Groq client this app uses.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the client with its own pooled HTTP connections.
+
+        Args:
+            base_url: API root including the version, e.g. 'http://localhost:11434/v1'
+            api_key: Optional bearer token
+            timeout: Default request timeout in seconds (defaults to
+                settings.LLM_TIMEOUT_SECONDS)
+        """
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self._http = httpx.Client(
+            base_url=base_url.rstrip("/"),
+            headers=headers,
+            timeout=httpx.Timeout(
+                timeout or settings.LLM_TIMEOUT_SECONDS,
+                connect=settings.LLM_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self.models = SimpleNamespace(list=self._list_models)
+
+    def _send(self, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        """Send a request, raising Groq SDK errors for failures."""
+        try:
+            response = self._http.send(request, stream=stream)
+        except httpx.TimeoutException as e:
+            raise groq.APITimeoutError(request=request) from e
+        except httpx.HTTPError as e:
+            raise groq.APIConnectionError(request=request) from e
+
+        if response.status_code >= 400:
+            response.read()
+            try:
+                body = response.json()
+            except ValueError:
+                body = response.text
+            raise groq.APIStatusError(
+                f"Error code: {response.status_code} - {body}",
+                response=response,
+                body=body,
+            )
+        return response
+
+    def _create(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        stream: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ):
+        """Imitate ``client.chat.completions.create``."""
+        payload = {"model": model, "messages": messages, "stream": stream, **kwargs}
+        request = self._http.build_request(
+            "POST",
+            "/chat/completions",
+            json=payload,
+            **({} if timeout is None else {"timeout": timeout}),
+        )
+        response = self._send(request, stream=stream)
+        if stream:
+            return self._stream(response)
+        return _namespace(response.json())
+
+    @staticmethod
+    def _stream(response: httpx.Response) -> Iterator[SimpleNamespace]:
+        """Yield server-sent event chunks until ``[DONE]``."""
+        try:
+            for line in response.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                chunk = _namespace(json.loads(data))
+                # Usage-only chunks carry no choices
+                if not getattr(chunk, "choices", None):
+                    continue
+                if not hasattr(chunk.choices[0].delta, "content"):
+                    chunk.choices[0].delta.content = None
+                yield chunk
+        finally:
+            response.close()
+
+    def _list_models(self) -> List[SimpleNamespace]:
+        """Imitate ``client.models.list``."""
+        response = self._send(self._http.build_request("GET", "/models"))
+        return _namespace(response.json().get("data", []))
+
+
+def create_local_client() -> OpenAICompatibleClient:
+    """
+    Create a client for the local server configured by the LOCAL_LLM_* settings.
+
+    Returns:
+        OpenAICompatibleClient: Configured client
+    """
+    return OpenAICompatibleClient(
+        settings.LOCAL_LLM_BASE_URL, settings.LOCAL_LLM_API_KEY
+    )
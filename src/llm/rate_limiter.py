@@ -0,0 +1,483 @@
+"""
+Rate limiting module for the AI Study Buddy application.
+Schedules LLM calls against shared requests-per-minute and tokens-per-minute budgets.
+"""
+
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.common.custom_exception import CustomException
+
+
+class RateLimitTimeoutError(TimeoutError):
+    """No rate limit budget became available before the caller's deadline."""
+
+
+class Priority(IntEnum):
+    """Scheduling priority of an LLM call; lower values are served first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_priority: contextvars.ContextVar[Priority] = contextvars.ContextVar(
+    "llm_priority", default=Priority.INTERACTIVE
+)
+_session_id: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "llm_session_id", default="default"
+)
+
+
+@contextmanager
+def request_context(priority: Priority, session_id: str) -> Iterator[None]:
+    """
+    Tag every LLM call made inside the block with a priority and session.
+
+    Worker threads only see these values when started with a copy of the
+    caller's context (``contextvars.copy_context().run``).
+
+    Args:
+        priority: Scheduling priority for the calls
+        session_id: Identifier used to share capacity fairly between sessions
+    """
+    priority_token = _priority.set(priority)
+    session_token = _session_id.set(session_id)
+    try:
+        yield
+    finally:
+        _priority.reset(priority_token)
+        _session_id.reset(session_token)
+
+
+def estimate_tokens(prompt: str) -> int:
+    """
+    Rough token estimate for a request, used before the real usage is known.
+
+    Args:
+        prompt: Prompt text sent to the model
+
+    Returns:
+        int: Estimated prompt plus completion tokens
+    """
+    return len(prompt) // 4 + settings.RATE_LIMIT_COMPLETION_TOKENS
+
+
+class InMemoryBudget:
+    """Request and token buckets shared by the threads of one process."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Initialize both buckets full.
+
+        Args:
+            requests_per_minute: Request budget, also the request burst size
+            tokens_per_minute: Token budget, also the token burst size
+        """
+        self.capacities = (float(requests_per_minute), float(tokens_per_minute))
+        self.rates = (requests_per_minute / 60.0, tokens_per_minute / 60.0)
+        self.levels = list(self.capacities)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update."""
+        now = time.monotonic()
+        elapsed = now - self.updated_at
+        self.updated_at = now
+        for i in range(2):
+            self.levels[i] = min(
+                self.capacities[i], self.levels[i] + elapsed * self.rates[i]
+            )
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Take one request and ``tokens`` tokens if both are available.
+
+        Args:
+            tokens: Estimated tokens for the request
+
+        Returns:
+            float: 0 if acquired, otherwise seconds until enough budget is available
+        """
+        with self._lock:
+            self._refill()
+            amounts = (1.0, min(float(tokens), self.capacities[1]))
+            wait = max((amounts[i] - self.levels[i]) / self.rates[i] for i in range(2))
+            if wait > 0:
+                return wait
+            for i in range(2):
+                self.levels[i] -= amounts[i]
+            return 0.0
+
+    def adjust_tokens(self, delta: int) -> None:
+        """
+        Correct the token bucket once the real usage is known.
+
+        Args:
+            delta: Actual minus estimated tokens (negative gives tokens back)
+        """
+        with self._lock:
+            self.levels[1] = min(self.capacities[1], self.levels[1] - delta)
+
+    def refund(self, requests: int, tokens: int) -> None:
+        """
+        Give back budget taken for a call that failed.
+
+        Args:
+            requests: Requests to give back (0 or 1)
+            tokens: Tokens to give back
+        """
+        with self._lock:
+            for i, amount in enumerate((requests, tokens)):
+                self.levels[i] = min(self.capacities[i], self.levels[i] + amount)
+
+
+_REDIS_ACQUIRE = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local levels = {}
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[i * 3 - 1])
+    local rate = tonumber(ARGV[i * 3])
+    local amount = math.min(tonumber(ARGV[i * 3 + 1]), capacity)
+    local data = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(data[1]) or capacity
+    local ts = tonumber(data[2]) or now
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    if level < amount then
+        wait = math.max(wait, (amount - level) / rate)
+    end
+    levels[i] = {level, amount}
+end
+for i = 1, 2 do
+    local level = levels[i][1]
+    if wait == 0 then
+        level = level - levels[i][2]
+    end
+    redis.call('HSET', KEYS[i], 'level', level, 'ts', now)
+    redis.call('EXPIRE', KEYS[i], 120)
+end
+return tostring(wait)
+"""
+
+
+class RedisBudget:
+    """Request and token buckets stored in Redis so several replicas share them."""
+
+    def __init__(self, url: str, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Connect to Redis (or any server speaking its protocol and Lua scripting).
+
+        Args:
+            url: Redis connection URL
+            requests_per_minute: Request budget, also the request burst size
+            tokens_per_minute: Token budget, also the token burst size
+
+        Raises:
+            CustomException: If the optional ``redis`` package is not installed
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise CustomException(
+                "The 'redis' package is required for RATE_LIMIT_BACKEND=redis", e
+            )
+
+        # A short timeout keeps a slow Redis from stalling every queued call
+        self.client = redis.Redis.from_url(
+            url,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+        self.keys = [
+            f"{settings.RATE_LIMIT_KEY_PREFIX}:requests",
+            f"{settings.RATE_LIMIT_KEY_PREFIX}:tokens",
+        ]
+        self.capacities = (requests_per_minute, tokens_per_minute)
+        self.rates = (requests_per_minute / 60.0, tokens_per_minute / 60.0)
+        self._acquire = self.client.register_script(_REDIS_ACQUIRE)
+
+    def try_acquire(self, tokens: int) -> float:
+        """
+        Take one request and ``tokens`` tokens if both are available.
+
+        Args:
+            tokens: Estimated tokens for the request
+
+        Returns:
+            float: 0 if acquired, otherwise seconds until enough budget is available
+        """
+        wait = self._acquire(
+            keys=self.keys,
+            args=[
+                time.time(),
+                self.capacities[0],
+                self.rates[0],
+                1,
+                self.capacities[1],
+                self.rates[1],
+                tokens,
+            ],
+        )
+        return float(wait)
+
+    def adjust_tokens(self, delta: int) -> None:
+        """
+        Correct the token bucket once the real usage is known.
+
+        Args:
+            delta: Actual minus estimated tokens (negative gives tokens back)
+        """
+        self.client.hincrbyfloat(self.keys[1], "level", -delta)
+
+    def refund(self, requests: int, tokens: int) -> None:
+        """
+        Give back budget taken for a call that failed.
+
+        Args:
+            requests: Requests to give back (0 or 1)
+            tokens: Tokens to give back
+        """
+        with self.client.pipeline() as pipe:
+            if requests:
+                pipe.hincrbyfloat(self.keys[0], "level", requests)
+            if tokens:
+                pipe.hincrbyfloat(self.keys[1], "level", tokens)
+            pipe.execute()
+
+
+class LLMScheduler:
+    """
+    Admits LLM calls in priority order and fairly across sessions.
+
+    Interactive calls always go before background ones. Within a priority,
+    sessions are served round-robin (start-time fair queuing), so one session
+    asking for ten questions cannot starve another asking for one.
+    """
+
+    def __init__(self, budget):
+        """
+        Initialize the scheduler.
+
+        Args:
+            budget: InMemoryBudget or RedisBudget enforcing the rate limits
+        """
+        self.budget = budget
+        self.logger = get_logger(self.__class__.__name__)
+        self._condition = threading.Condition()
+        self._queue: List[tuple] = []
+        # Set while a thread is asking the budget outside the lock
+        self._checking = False
+        self._sequence = itertools.count()
+        self._virtual_time = 0
+        self._session_rank: Dict[str, int] = {}
+        self._wait_stats = {p: {"count": 0, "total": 0.0, "max": 0.0} for p in Priority}
+
+    def acquire(
+        self,
+        tokens: int,
+        priority: Optional[Priority] = None,
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> float:
+        """
+        Block until the call may be sent.
+
+        Args:
+            tokens: Estimated tokens for the call
+            priority: Call priority (defaults to the current request context)
+            session_id: Calling session (defaults to the current request context)
+            timeout: Longest time to wait, e.g. the quiz deadline's remaining time
+                (None waits as long as it takes)
+
+        Returns:
+            float: Seconds spent waiting in the queue
+
+        Raises:
+            RateLimitTimeoutError: If no budget was available within ``timeout``
+        """
+        priority = _priority.get() if priority is None else priority
+        session_id = _session_id.get() if session_id is None else session_id
+        start = time.monotonic()
+        expires_at = None if timeout is None else start + timeout
+
+        def remaining() -> Optional[float]:
+            return None if expires_at is None else expires_at - time.monotonic()
+
+        with self._condition:
+            rank = max(self._virtual_time, self._session_rank.get(session_id, -1) + 1)
+            self._session_rank[session_id] = rank
+            entry = (int(priority), rank, next(self._sequence))
+            heapq.heappush(self._queue, entry)
+
+        try:
+            while True:
+                with self._condition:
+                    # Only the head of the queue asks the budget, one thread at a time
+                    while self._queue[0] is not entry or self._checking:
+                        left = remaining()
+                        if left is not None and left <= 0:
+                            raise RateLimitTimeoutError(
+                                f"No rate limit budget within {timeout:.1f}s"
+                            )
+                        self._condition.wait(timeout=left)
+                    self._checking = True
+
+                # The budget may be a Redis round-trip, so it is asked without the lock
+                wait = 1.0
+                try:
+                    wait = self.budget.try_acquire(tokens)
+                finally:
+                    with self._condition:
+                        self._checking = False
+                        if wait <= 0:
+                            self._remove(entry)
+                            self._virtual_time = max(self._virtual_time, rank)
+                            self._prune_sessions()
+                        self._condition.notify_all()
+                if wait <= 0:
+                    break
+
+                left = remaining()
+                if left is not None and left < wait:
+                    raise RateLimitTimeoutError(
+                        f"Rate limit budget needs {wait:.1f}s, "
+                        f"more than the {max(0.0, left):.1f}s left"
+                    )
+                with self._condition:
+                    self._condition.wait(timeout=wait)
+        except BaseException:
+            with self._condition:
+                self._remove(entry)
+                self._condition.notify_all()
+            raise
+
+        waited = time.monotonic() - start
+        with self._condition:
+            stats = self._wait_stats[Priority(priority)]
+            stats["count"] += 1
+            stats["total"] += waited
+            stats["max"] = max(stats["max"], waited)
+
+        if waited > 1:
+            self.logger.info(f"LLM call waited {waited:.2f}s for rate limit budget")
+        return waited
+
+    def try_acquire(self, tokens: int) -> bool:
+        """
+        Take budget for an optional call without waiting.
+
+        Succeeds only when no call is queued and the budget is available now,
+        so optional calls (such as hedges) never delay queued ones.
+
+        Args:
+            tokens: Estimated tokens for the call
+
+        Returns:
+            bool: True if the call may be sent
+        """
+        with self._condition:
+            if self._queue or self._checking:
+                return False
+            self._checking = True
+        try:
+            return self.budget.try_acquire(tokens) <= 0
+        finally:
+            with self._condition:
+                self._checking = False
+                self._condition.notify_all()
+
+    def _remove(self, entry: tuple) -> None:
+        """Take an entry out of the queue, wherever it is; the caller holds the lock."""
+        if entry in self._queue:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+
+    def adjust_tokens(self, delta: int) -> None:
+        """
+        Correct the token budget once the real usage is known.
+
+        Args:
+            delta: Actual minus estimated tokens
+        """
+        if delta:
+            self.budget.adjust_tokens(delta)
+
+    def refund(self, requests: int, tokens: int) -> None:
+        """
+        Give back budget taken for a call that failed, waking the queued calls.
+
+        Args:
+            requests: Requests to give back (0 or 1)
+            tokens: Tokens to give back
+        """
+        if not (requests or tokens):
+            return
+        self.budget.refund(requests, tokens)
+        with self._condition:
+            self._condition.notify_all()
+
+    def _prune_sessions(self) -> None:
+        """Forget sessions whose rank has fallen behind the virtual clock."""
+        if len(self._session_rank) > 1000:
+            self._session_rank = {
+                session: rank
+                for session, rank in self._session_rank.items()
+                if rank >= self._virtual_time
+            }
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Queue depth and wait-time statistics.
+
+        Returns:
+            Dict[str, Any]: Current queue depth per priority and wait times
+            in milliseconds
+        """
+        with self._condition:
+            depth = {p.name.lower(): 0 for p in Priority}
+            for entry in self._queue:
+                depth[Priority(entry[0]).name.lower()] += 1
+            waits = {
+                p.name.lower(): {
+                    "count": stats["count"],
+                    "mean_ms": (
+                        round(stats["total"] * 1000 / stats["count"], 1)
+                        if stats["count"]
+                        else 0.0
+                    ),
+                    "max_ms": round(stats["max"] * 1000, 1),
+                }
+                for p, stats in self._wait_stats.items()
+            }
+        return {
+            "queue_depth": sum(depth.values()),
+            "queue_depth_by_priority": depth,
+            "wait": waits,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_scheduler() -> LLMScheduler:
+    """
+    Return the process-wide LLM scheduler.
+
+    Returns:
+        LLMScheduler: Scheduler backed by the configured budget
+    """
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        budget = RedisBudget(
+            settings.REDIS_URL, settings.RATE_LIMIT_RPM, settings.RATE_LIMIT_TPM
+        )
+    else:
+        budget = InMemoryBudget(settings.RATE_LIMIT_RPM, settings.RATE_LIMIT_TPM)
+    return LLMScheduler(budget)
@@ -0,0 +1,300 @@
+"""
+Response cache module for the AI Study Buddy application.
+Coalesces identical in-flight LLM requests and caches their responses in memory and
+on disk.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.common.metrics import get_metrics
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_time ON responses (created_at);
+"""
+
+
+def make_cache_key(
+    model: str, system: str, user: str, temperature: float, variant: int
+) -> str:
+    """
+    Cache key of a completion request.
+
+    Args:
+        model: Model name
+        system: System message ('' when there is none)
+        user: User message
+        temperature: Sampling temperature
+        variant: Index that tells apart requests meant to produce different
+            answers to the same prompt, e.g. the quiz position
+
+    Returns:
+        str: Hex digest identifying the request
+    """
+    payload = json.dumps(
+        [model, system, user, temperature, variant], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Single-flight response cache for completions.
+
+    Concurrent requests with the same key share one upstream call: the first
+    caller computes the response and the others wait for it. Responses are
+    kept in a bounded LRU in memory and, when a path is set, in a bounded
+    SQLite table so they survive restarts and are shared between processes
+    on one host. Entries expire after ``ttl_seconds``.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_disk_entries: Optional[int] = None,
+    ):
+        """
+        Initialize the cache and create the disk table if a path is set.
+
+        Args:
+            path: SQLite database path; '' keeps the cache in memory only
+                (defaults to settings.LLM_CACHE_PATH)
+            ttl_seconds: Lifetime of a cached response (defaults to settings)
+            max_entries: Responses kept in memory (defaults to settings)
+            max_disk_entries: Responses kept on disk (defaults to settings)
+        """
+        self.path = settings.LLM_CACHE_PATH if path is None else path
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.LLM_CACHE_TTL_SECONDS
+        )
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.max_disk_entries = max_disk_entries or settings.LLM_CACHE_MAX_DISK_ENTRIES
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection and commit on success."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], str],
+        timeout: Optional[float] = None,
+        keep: Optional[Callable[[], bool]] = None,
+    ) -> str:
+        """
+        Return the cached response for a key, computing it at most once at a time.
+
+        Args:
+            key: Cache key from ``make_cache_key``
+            compute: Makes the upstream call; only run by the first caller
+            timeout: Longest time a waiting caller blocks for the shared call
+            keep: Asked after ``compute``; when it returns False the response
+                is only shared with the callers already waiting, not stored
+
+        Returns:
+            str: Response content
+
+        Raises:
+            TimeoutError: If the shared call does not finish within ``timeout``
+            Exception: Whatever the shared upstream call raised; errors are not cached
+        """
+        with self._lock:
+            content = self._lookup_memory(key)
+            if content is not None:
+                self.hits += 1
+                return content
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(timeout=timeout)
+
+        try:
+            content = self._lookup_disk(key)
+            if content is not None:
+                with self._lock:
+                    self.hits += 1
+                    self._remember(key, content)
+            else:
+                with self._lock:
+                    self.misses += 1
+                content = compute()
+                if keep is None or keep():
+                    self.put(key, content)
+            future.set_result(content)
+            return content
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def put(self, key: str, content: str) -> None:
+        """
+        Store a response in memory and on disk.
+
+        Args:
+            key: Cache key
+            content: Response content
+        """
+        with self._lock:
+            self._remember(key, content)
+        if not self.path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, content, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, content, time.time()),
+                )
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses "
+                    "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,),
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to store cached response: {str(e)}")
+
+    def discard(self, key: str) -> None:
+        """
+        Drop a response, e.g. one that turned out to be unusable.
+
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._memory.pop(key, None)
+        if not self.path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to discard cached response: {str(e)}")
+
+    def _remember(self, key: str, content: str) -> None:
+        """Add a response to the memory LRU; the caller holds the lock."""
+        self._memory[key] = (content, time.time())
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup_memory(self, key: str) -> Optional[str]:
+        """Unexpired response from memory; the caller holds the lock."""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        content, created_at = entry
+        if time.time() - created_at > self.ttl_seconds:
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return content
+
+    def _lookup_disk(self, key: str) -> Optional[str]:
+        """Unexpired response from disk, or None when there is no disk cache."""
+        if not self.path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT content FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl_seconds),
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to read cached response: {str(e)}")
+            return None
+        return row[0] if row else None
+
+    def prometheus_lines(self) -> List[str]:
+        """
+        Cache lookups by result in the Prometheus text format.
+
+        Returns:
+            List[str]: Exposition lines
+        """
+        stats = self.stats()
+        name = "study_buddy_llm_cache_requests_total"
+        return [
+            f"# HELP {name} Response cache lookups by result",
+            f"# TYPE {name} counter",
+            f'{name}{{result="hit"}} {stats["hits"]}',
+            f'{name}{{result="coalesced"}} {stats["coalesced"]}',
+            f'{name}{{result="miss"}} {stats["misses"]}',
+        ]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters since the cache was created.
+
+        Returns:
+            Dict[str, int]: Cache hits, coalesced waits, upstream calls and entries
+            in memory
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "coalesced": self.coalesced,
+                "misses": self.misses,
+                "entries": len(self._memory),
+            }
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    """
+    Return the process-wide response cache.
+
+    Returns:
+        ResponseCache: Shared response cache, also exported as metrics
+    """
+    cache = ResponseCache()
+    get_metrics().register_collector(cache.prometheus_lines)
+    return cache
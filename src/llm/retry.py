@@ -0,0 +1,153 @@
+"""
+Retry policy module for the AI Study Buddy application.
+Classifies LLM errors and computes backoff delays and deadlines for retries.
+"""
+
+import json
+import random
+import time
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from typing import Optional
+
+import groq
+from pydantic import ValidationError
+
+from src.config.settings import settings
+
+# Error code of a JSON-mode response that was not valid JSON
+JSON_VALIDATE_FAILED = "json_validate_failed"
+
+
+class ErrorKind(str, Enum):
+    """How a failed LLM call should be retried."""
+
+    RATE_LIMIT = "rate_limit"  # back off, honoring Retry-After
+    TRANSIENT = "transient"  # network or provider hiccup, back off with jitter
+    SCHEMA = "schema"  # response did not parse or validate, re-prompt at once
+    FATAL = "fatal"  # retrying cannot help (bad key, bad request)
+
+
+def classify_error(error: Exception) -> ErrorKind:
+    """
+    Decide how an exception raised while generating a question should be retried.
+
+    Args:
+        error: Exception raised by the LLM call or by parsing its response
+
+    Returns:
+        ErrorKind: Retry category for the error
+    """
+    if isinstance(
+        error, (json.JSONDecodeError, ValidationError, ValueError, TypeError, KeyError)
+    ):
+        return ErrorKind.SCHEMA
+    if isinstance(
+        error,
+        (groq.APITimeoutError, groq.APIConnectionError, TimeoutError, ConnectionError),
+    ):
+        return ErrorKind.TRANSIENT
+
+    status_code = getattr(error, "status_code", None)
+    if status_code == 400 and get_error_code(error) == JSON_VALIDATE_FAILED:
+        return ErrorKind.SCHEMA
+    if status_code == 429:
+        return ErrorKind.RATE_LIMIT
+    if status_code is not None:
+        if status_code >= 500 or status_code in (408, 409):
+            return ErrorKind.TRANSIENT
+        return ErrorKind.FATAL
+
+    return ErrorKind.TRANSIENT
+
+
+def get_error_code(error: Exception) -> Optional[str]:
+    """
+    Read the provider's error code, such as "json_validate_failed", from an API error.
+
+    Args:
+        error: Exception raised by the LLM call
+
+    Returns:
+        Optional[str]: Error code, or None if the error has none
+    """
+    code = getattr(error, "code", None)
+    if code is None:
+        body = getattr(error, "body", None)
+        if isinstance(body, dict):
+            body = body.get("error", body)
+        if isinstance(body, dict):
+            code = body.get("code")
+    return code if isinstance(code, str) else None
+
+
+def get_retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the Retry-After header from a provider error, if present.
+
+    Args:
+        error: Exception raised by the LLM call
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the header is missing or invalid
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+
+    Returns:
+        float: Seconds to sleep before the next attempt
+    """
+    ceiling = min(
+        settings.RETRY_MAX_DELAY_SECONDS,
+        settings.RETRY_BASE_DELAY_SECONDS * (2**attempt),
+    )
+    return random.uniform(0, ceiling)
+
+
+class Deadline:
+    """Wall-clock budget shared by every LLM call made for one quiz."""
+
+    def __init__(self, seconds: Optional[float]):
+        """
+        Start the deadline clock.
+
+        Args:
+            seconds: Budget in seconds, or None for no deadline
+        """
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None without a deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the budget has been used up."""
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
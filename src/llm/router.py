@@ -0,0 +1,401 @@
+"""
+Model routing module for the AI Study Buddy application.
+Chooses the model for each LLM call from an ordered fallback chain, using
+per-request routing rules and each model's circuit breaker and latency.
+
+Models are written as ``backend:model``, e.g. ``groq:llama-3.3-70b-versatile``
+or ``local:llama3.2:3b``; the backend names a client factory registered in
+``src.llm.groq_client``.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.common.metrics import get_metrics
+from src.llm.retry import ErrorKind, classify_error, get_retry_after
+from src.prompts.templates import Prompt
+
+# Weight of the newest call in a model's moving average latency
+_LATENCY_ALPHA = 0.2
+
+
+class ModelUnavailableError(ConnectionError):
+    """Every model a call could be routed to has an open circuit breaker."""
+
+
+@dataclass(frozen=True)
+class ModelTarget:
+    """A model served by one backend."""
+
+    backend: str
+    model: str
+
+    @classmethod
+    def parse(cls, spec: str) -> "ModelTarget":
+        """
+        Parse a ``backend:model`` string; the model name may itself contain colons.
+
+        Args:
+            spec: Model specification
+
+        Returns:
+            ModelTarget: Parsed target
+
+        Raises:
+            ValueError: If the backend or model is missing
+        """
+        backend, _, model = spec.strip().partition(":")
+        if not backend or not model:
+            raise ValueError(f"Model '{spec}' must be written as backend:model")
+        return cls(backend, model)
+
+    def __str__(self) -> str:
+        """The ``backend:model`` form."""
+        return f"{self.backend}:{self.model}"
+
+
+class CircuitBreaker:
+    """
+    Stops sending calls to a failing model for a while.
+
+    Closed: calls go through. After ``failure_threshold`` consecutive failures
+    the breaker opens for ``cooldown_seconds``; a rate limit opens it at once
+    for the provider's Retry-After. When the cooldown is over one trial call is
+    let through (half-open): success closes the breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        """
+        Initialize a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown_seconds: How long the breaker stays open
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial_running = False
+        self.latency: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'."""
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        """Current state; the caller holds the lock."""
+        if self._open_until == 0.0:
+            return "closed"
+        return (
+            "open"
+            if time.monotonic() < self._open_until or self._trial_running
+            else "half_open"
+        )
+
+    def allow(self) -> bool:
+        """
+        Decide whether a call may be sent now, taking the trial slot when half-open.
+
+        Returns:
+            bool: True if the call may be sent
+        """
+        with self._lock:
+            state = self._state()
+            if state == "half_open":
+                self._trial_running = True
+                return True
+            return state == "closed"
+
+    def record_success(self, seconds: float) -> None:
+        """
+        Close the breaker and update the moving average latency.
+
+        Args:
+            seconds: Latency of the call
+        """
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+            self._trial_running = False
+            self.latency = (
+                seconds
+                if self.latency is None
+                else (_LATENCY_ALPHA * seconds + (1 - _LATENCY_ALPHA) * self.latency)
+            )
+
+    def record_failure(self, open_for: Optional[float] = None) -> None:
+        """
+        Count a failure, opening the breaker when needed.
+
+        Args:
+            open_for: Open the breaker at once for this long instead of the cooldown
+                (e.g. a rate limit)
+        """
+        with self._lock:
+            self._failures += 1
+            if open_for is not None:
+                self._open_until = time.monotonic() + open_for
+            elif self._trial_running or self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown_seconds
+            self._trial_running = False
+
+    def release(self) -> None:
+        """Give back the trial slot of a call that says nothing about the model."""
+        with self._lock:
+            self._trial_running = False
+
+    def snapshot(self) -> Dict[str, Union[str, int, float, None]]:
+        """
+        State for the stats endpoint.
+
+        Returns:
+            Dict[str, Union[str, int, float, None]]: State, consecutive failures,
+            average latency and seconds until the next trial call
+        """
+        with self._lock:
+            return {
+                "state": self._state(),
+                "failures": self._failures,
+                "latency_ms": (
+                    round(self.latency * 1000, 1) if self.latency is not None else None
+                ),
+                "retry_in_s": round(max(0.0, self._open_until - time.monotonic()), 1),
+            }
+
+
+def _parse_routes(spec: str) -> List[Tuple[FrozenSet[str], ModelTarget]]:
+    """
+    Parse LLM_ROUTES: ``selector=backend:model`` rules separated by ';'.
+
+    A selector is one or more of a prompt kind ('mcq', 'fill_blank',
+    'mcq_batch', ...) and a difficulty ('easy', 'medium', 'hard') joined by
+    '/'; a rule matches when all of them apply. 'mcq' also matches 'mcq_batch'.
+    """
+    routes = []
+    for rule in filter(None, (part.strip() for part in spec.split(";"))):
+        selector, _, target = rule.partition("=")
+        if not target:
+            raise ValueError(
+                f"Route '{rule}' must be written as selector=backend:model"
+            )
+        tokens = frozenset(
+            token.strip().lower() for token in selector.split("/") if token.strip()
+        )
+        routes.append((tokens, ModelTarget.parse(target)))
+    return routes
+
+
+class ModelRouter:
+    """
+    Orders the models a call may use and tracks their health.
+
+    The chain comes from LLM_MODELS (default: LLM_BACKEND with MODEL_NAME).
+    The first LLM_ROUTES rule matching the prompt moves its model to the
+    front. Models with an open circuit breaker are skipped, and models slower
+    than LLM_ROUTE_SLOW_SECONDS on average are tried after the others. A
+    chain of a single model has nowhere to fail over to, so its breaker is
+    never consulted.
+    """
+
+    def __init__(self, models: Optional[str] = None, routes: Optional[str] = None):
+        """
+        Initialize the router.
+
+        Args:
+            models: Comma-separated fallback chain (defaults to settings.LLM_MODELS)
+            routes: Routing rules (defaults to settings.LLM_ROUTES)
+
+        Raises:
+            ValueError: If a model or rule is malformed
+        """
+        models = settings.LLM_MODELS if models is None else models
+        specs = [spec for spec in (part.strip() for part in models.split(",")) if spec]
+        self.chain = [ModelTarget.parse(spec) for spec in specs] or [
+            ModelTarget(settings.LLM_BACKEND, settings.MODEL_NAME)
+        ]
+        self.routes = _parse_routes(settings.LLM_ROUTES if routes is None else routes)
+        self.logger = get_logger(self.__class__.__name__)
+        self.breakers: Dict[ModelTarget, CircuitBreaker] = {
+            target: CircuitBreaker(
+                settings.LLM_BREAKER_FAILURES, settings.LLM_BREAKER_COOLDOWN_SECONDS
+            )
+            for target in [*self.chain, *(target for _, target in self.routes)]
+        }
+
+    def preferred(self, prompt: Union[str, Prompt]) -> List[ModelTarget]:
+        """
+        Models for a prompt in routing order, ignoring their health.
+
+        Args:
+            prompt: The prompt about to be sent
+
+        Returns:
+            List[ModelTarget]: The matching rule's model first, then the chain
+        """
+        if isinstance(prompt, Prompt):
+            labels = {
+                prompt.kind,
+                prompt.kind.removesuffix("_batch"),
+                prompt.difficulty,
+            }
+        else:
+            labels = {"other"}
+        for tokens, target in self.routes:
+            if tokens <= labels:
+                return [target, *(model for model in self.chain if model != target)]
+        return list(self.chain)
+
+    def candidates(self, prompt: Union[str, Prompt]) -> List[ModelTarget]:
+        """
+        Models to try for a prompt, healthy and fast ones first.
+
+        Args:
+            prompt: The prompt about to be sent
+
+        Returns:
+            List[ModelTarget]: Models whose breaker is not open, in trial order
+        """
+        preferred = self.preferred(prompt)
+        if len(preferred) == 1:
+            return preferred
+
+        healthy, slow = [], []
+        for target in preferred:
+            breaker = self.breakers[target]
+            if breaker.state == "open":
+                continue
+            if (
+                breaker.latency is not None
+                and breaker.latency > settings.LLM_ROUTE_SLOW_SECONDS
+            ):
+                slow.append(target)
+            else:
+                healthy.append(target)
+        return healthy + slow
+
+    def acquire(self, target: ModelTarget, alone: bool) -> bool:
+        """
+        Check a model's breaker right before calling it.
+
+        Args:
+            target: The model about to be called
+            alone: True when the model is the only one the call could use
+
+        Returns:
+            bool: True if the call may be sent
+        """
+        return alone or self.breakers[target].allow()
+
+    def release(self, target: ModelTarget) -> None:
+        """
+        Release a model acquired for a call that was not sent or whose error is not
+        the model's fault.
+
+        Args:
+            target: The model acquired with ``acquire``
+        """
+        self.breakers[target].release()
+
+    def record_success(self, target: ModelTarget, seconds: float) -> None:
+        """
+        Record a successful call.
+
+        Args:
+            target: The model that answered
+            seconds: Latency of the call
+        """
+        self.breakers[target].record_success(seconds)
+        get_metrics().inc(
+            "study_buddy_llm_model_calls_total", model=str(target), result="ok"
+        )
+
+    def record_failure(self, target: ModelTarget, error: Exception) -> None:
+        """
+        Record a failed call; rate limits open the model's breaker at once.
+
+        Schema errors only release the model: the model answered, just badly.
+
+        Args:
+            target: The model that failed
+            error: The error it raised
+        """
+        kind = classify_error(error)
+        get_metrics().inc(
+            "study_buddy_llm_model_calls_total", model=str(target), result=kind.value
+        )
+        if kind is ErrorKind.SCHEMA:
+            # A bad response still reached us, so it is neither a failure nor
+            # a success, but a half-open trial slot must not stay taken
+            self.release(target)
+            return
+        breaker = self.breakers[target]
+        if kind is ErrorKind.RATE_LIMIT:
+            breaker.record_failure(
+                open_for=get_retry_after(error) or settings.LLM_BREAKER_COOLDOWN_SECONDS
+            )
+        else:
+            breaker.record_failure()
+        if breaker.state == "open":
+            self.logger.error(
+                f"Circuit breaker for {target} is open after {kind.value} error: "
+                f"{str(error)}"
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, Union[str, int, float, None]]]:
+        """
+        Breaker state of every model.
+
+        Returns:
+            Dict[str, Dict[str, Union[str, int, float, None]]]: Snapshot per
+            ``backend:model``
+        """
+        return {
+            str(target): breaker.snapshot() for target, breaker in self.breakers.items()
+        }
+
+    def prometheus_lines(self) -> List[str]:
+        """
+        Breaker state per model in the Prometheus text format.
+
+        States are 0 closed, 1 half-open and 2 open.
+
+        Returns:
+            List[str]: Exposition lines
+        """
+        codes = {"closed": 0, "half_open": 1, "open": 2}
+        name = "study_buddy_llm_model_breaker_state"
+        lines = [
+            f"# HELP {name} Circuit breaker state per model "
+            "(0 closed, 1 half-open, 2 open)",
+            f"# TYPE {name} gauge",
+        ]
+        for target, breaker in self.breakers.items():
+            lines.append(f'{name}{{model="{target}"}} {codes[breaker.state]}')
+        return lines
+
+
+@lru_cache(maxsize=1)
+def get_model_router() -> ModelRouter:
+    """
+    Return the process-wide model router.
+
+    Returns:
+        ModelRouter: Shared router, also exported as metrics
+    """
+    router = ModelRouter()
+    get_metrics().describe(
+        "study_buddy_llm_model_calls_total",
+        "counter",
+        "LLM calls per model by result (ok or error kind)",
+    )
+    get_metrics().register_collector(router.prometheus_lines)
+    return router
@@ -0,0 +1,162 @@
+"""
+Prompt usage module for the AI Study Buddy application.
+Counts prompt, cached-prefix and completion tokens and latency per prompt kind.
+"""
+
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from src.common.metrics import get_metrics
+
+
+class PromptUsageStats:
+    """Thread-safe token and latency totals per prompt kind, e.g. 'mcq'."""
+
+    def __init__(self):
+        """Initialize empty totals."""
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, float]] = {}
+
+    def record(
+        self,
+        kind: str,
+        prompt_tokens: int,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        seconds: float = 0.0,
+    ) -> None:
+        """
+        Add one completion call to the totals of its kind.
+
+        Args:
+            kind: Prompt kind
+            prompt_tokens: Input tokens of the call, cached ones included
+            completion_tokens: Output tokens of the call
+            cached_tokens: Input tokens served from the provider's prompt cache
+            seconds: Latency of the call
+        """
+        with self._lock:
+            totals = self._totals.setdefault(
+                kind,
+                {
+                    "calls": 0,
+                    "prompt_tokens": 0,
+                    "cached_tokens": 0,
+                    "completion_tokens": 0,
+                    "seconds": 0.0,
+                },
+            )
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["cached_tokens"] += cached_tokens
+            totals["completion_tokens"] += completion_tokens
+            totals["seconds"] += seconds
+
+    def record_response(
+        self, kind: str, usage: Optional[Any], prompt_text: str, seconds: float
+    ) -> None:
+        """
+        Record a call from the provider's ``usage`` object, or estimate it when missing.
+
+        Streamed completions carry no usage, so their prompt tokens are
+        estimated from the prompt length and their completion tokens are not counted.
+
+        Args:
+            kind: Prompt kind
+            usage: ``response.usage`` of the completion, or None
+            prompt_text: Full prompt text, used for the estimate
+            seconds: Latency of the call
+        """
+        if usage is None:
+            self.record(kind, len(prompt_text) // 4, seconds=seconds)
+            return
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.record(
+            kind,
+            prompt_tokens=usage.prompt_tokens or 0,
+            completion_tokens=usage.completion_tokens or 0,
+            cached_tokens=getattr(details, "cached_tokens", 0) or 0,
+            seconds=seconds,
+        )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Totals and per-call averages for every prompt kind.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Calls, token totals, prompt tokens per call,
+            cached share of prompt tokens and mean latency, per kind
+        """
+        with self._lock:
+            totals = {kind: dict(values) for kind, values in self._totals.items()}
+
+        report = {}
+        for kind, values in totals.items():
+            calls = values["calls"]
+            report[kind] = {
+                "calls": calls,
+                "prompt_tokens": values["prompt_tokens"],
+                "cached_tokens": values["cached_tokens"],
+                "completion_tokens": values["completion_tokens"],
+                "prompt_tokens_per_call": round(values["prompt_tokens"] / calls, 1),
+                "cached_ratio": (
+                    round(values["cached_tokens"] / values["prompt_tokens"], 4)
+                    if values["prompt_tokens"]
+                    else 0.0
+                ),
+                "mean_latency_ms": round(values["seconds"] / calls * 1000, 1),
+            }
+        return report
+
+    def prometheus_lines(self) -> List[str]:
+        """
+        Call and token counters per prompt kind in the Prometheus text format.
+
+        Returns:
+            List[str]: Exposition lines
+        """
+        with self._lock:
+            totals = {kind: dict(values) for kind, values in self._totals.items()}
+
+        lines = [
+            "# HELP study_buddy_llm_calls_total LLM completion calls per prompt kind",
+            "# TYPE study_buddy_llm_calls_total counter",
+        ]
+        lines.extend(
+            f'study_buddy_llm_calls_total{{kind="{kind}"}} {values["calls"]}'
+            for kind, values in sorted(totals.items())
+        )
+        lines.extend(
+            [
+                "# HELP study_buddy_llm_tokens_total "
+                "LLM tokens per prompt kind, from the provider's usage",
+                "# TYPE study_buddy_llm_tokens_total counter",
+            ]
+        )
+        for kind, values in sorted(totals.items()):
+            for token_type in ("prompt", "cached", "completion"):
+                lines.append(
+                    f'study_buddy_llm_tokens_total{{kind="{kind}",type="{token_type}"}}'
+                    f' {values[token_type + "_tokens"]}'
+                )
+        return lines
+
+    def reset(self) -> None:
+        """Clear all totals."""
+        with self._lock:
+            self._totals.clear()
+
+
+@lru_cache(maxsize=1)
+def get_prompt_usage() -> PromptUsageStats:
+    """
+    Return the process-wide prompt usage totals.
+
+    Returns:
+        PromptUsageStats: Shared usage totals, also exported as metrics
+    """
+    stats = PromptUsageStats()
+    get_metrics().register_collector(stats.prometheus_lines)
+    return stats
@@ -0,0 +1,25 @@
+"""
+API schema models for the AI Study Buddy application.
+Defines the request bodies accepted by the quiz API using Pydantic.
+"""
+
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+from src.config.settings import settings
+
+
+class QuizRequest(BaseModel):
+    """Request body for creating a quiz."""
+
+    topic: str = Field(min_length=1, max_length=200, description="The quiz topic")
+    question_type: Literal["Multiple Choice", "Fill in the Blank"] = "Multiple Choice"
+    difficulty: Literal["Easy", "Medium", "Hard"] = "Medium"
+    num_questions: int = Field(default=5, ge=1, le=settings.API_MAX_QUESTIONS)
+
+
+class AnswerSubmission(BaseModel):
+    """Request body for submitting answers, one per question in quiz order."""
+
+    answers: List[str] = Field(description="The user's answers in question order")
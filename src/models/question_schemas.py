@@ -1,38 +1,105 @@
 """
 Question schema models for the AI Study Buddy application.
 Defines data structures for different question types using Pydantic.
+
+Structural rules (four distinct options containing the answer, a blank in
+the sentence) are part of the schemas, so a response breaking them fails
+validation and is re-prompted like any other malformed response.
 """
 
+import re
 from typing import List
-from pydantic import BaseModel, Field, validator
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# Blank marker asked for by the fill-in-the-blank prompts
+BLANK_MARKER = "_____"
+
+# Any run of three or more underscores counts as a blank
+_BLANK_PATTERN = re.compile(r"_{3,}")
+
+
+def _clean_text(v):
+    """Turn a field the LLM sent as an object into its text."""
+    if isinstance(v, dict):
+        return v.get("description", str(v))
+    return str(v)
 
 
 class MCQQuestion(BaseModel):
     """Multiple Choice Question Schema."""
 
-    question: str = Field(description="The question text")
+    question: str = Field(min_length=1, description="The question text")
     options: List[str] = Field(description="List of 4 options")
     correct_answer: str = Field(description="The correct answer from the options")
 
     # validator for question field
-    @validator('question', pre=True)
+    @field_validator("question", mode="before")
+    @classmethod
     def clean_question(cls, v):
         """Clean and validate question text."""
-        if isinstance(v, dict):
-            return v.get('description', str(v))
-        return str(v)
+        return _clean_text(v).strip()
+
+    @field_validator("options")
+    @classmethod
+    def check_options(cls, v: List[str]) -> List[str]:
+        """Require exactly 4 distinct, non-empty options."""
+        options = [option.strip() for option in v]
+        if len(options) != 4:
+            raise ValueError("MCQ must have exactly 4 options")
+        if not all(options):
+            raise ValueError("MCQ options must not be empty")
+        if len({option.lower() for option in options}) != 4:
+            raise ValueError("MCQ options must be distinct")
+        return options
+
+    @model_validator(mode="after")
+    def check_correct_answer(self) -> "MCQQuestion":
+        """Require the correct answer to be an option, ignoring case and padding."""
+        answer = self.correct_answer.strip().lower()
+        for option in self.options:
+            if option.lower() == answer:
+                self.correct_answer = option
+                return self
+        raise ValueError("Correct answer must be one of the options")
 
 
 class FillBlankQuestion(BaseModel):
     """Fill in the Blank Question Schema."""
 
-    question: str = Field(description="The question text with '___' for the blank")
-    answer: str = Field(description="The correct word or phrase for the blank")
+    question: str = Field(description="The question text with '_____' for the blank")
+    answer: str = Field(
+        min_length=1, description="The correct word or phrase for the blank"
+    )
+    alternatives: List[str] = Field(
+        default_factory=list,
+        description="Other accepted answers, such as synonyms or alternative spellings",
+    )
 
     # validator for question field
-    @validator('question', pre=True)
+    @field_validator("question", mode="before")
+    @classmethod
     def clean_question(cls, v):
         """Clean and validate question text."""
-        if isinstance(v, dict):
-            return v.get('description', str(v))
-        return str(v)
+        return _clean_text(v).strip()
+
+    @field_validator("question")
+    @classmethod
+    def check_blank(cls, v: str) -> str:
+        """Require exactly one blank and write it as the standard marker."""
+        blanks = len(_BLANK_PATTERN.findall(v))
+        if blanks != 1:
+            raise ValueError(
+                "Fill-in-the-blank question must contain exactly one "
+                f"'{BLANK_MARKER}' (found {blanks})"
+            )
+        return _BLANK_PATTERN.sub(BLANK_MARKER, v)
+
+    @field_validator("answer")
+    @classmethod
+    def clean_answer(cls, v: str) -> str:
+        """Strip padding from the answer."""
+        v = v.strip()
+        if not v:
+            raise ValueError("Fill-in-the-blank answer must not be empty")
+        return v
@@ -1,56 +1,183 @@
 """
 Prompt templates for the AI Study Buddy application.
 Contains template functions for generating different types of questions.
+
+The instructions and worked example of every question type are compiled once
+into a static system message. Only the short user message (topic, difficulty
+and count) changes between calls, so the provider can reuse the system message
+as a cached prompt prefix.
 """
 
+from dataclasses import dataclass, replace
+
+_MCQ_FIELDS = (
+    "- 'question': A clear, specific question\n"
+    "- 'options': An array of exactly 4 possible answers\n"
+    "- 'correct_answer': One of the options that is the correct answer\n"
+)
+
+_FILL_BLANK_FIELDS = (
+    "- 'question': A sentence with '_____' marking where the blank should be\n"
+    "- 'answer': The correct word or phrase that belongs in the blank\n"
+    "- 'alternatives': An array of other accepted answers "
+    "(synonyms, alternative spellings), possibly empty\n"
+)
+
+_MCQ_EXAMPLE = (
+    '{"question": "What is the capital of France?", '
+    '"options": ["London", "Berlin", "Paris", "Madrid"], "correct_answer": "Paris"}'
+)
+
+_FILL_BLANK_EXAMPLE = (
+    '{"question": "The Nile flows into the _____.", "answer": "Mediterranean Sea", '
+    '"alternatives": ["Mediterranean"]}'
+)
+
+MCQ_SYSTEM_PROMPT = (
+    "You write multiple-choice quiz questions. "
+    "The user gives a topic and a difficulty.\n\n"
+    "Return ONLY a JSON object with these exact fields:\n"
+    f"{_MCQ_FIELDS}\n"
+    f"Example:\n{_MCQ_EXAMPLE}"
+)
+
+FILL_BLANK_SYSTEM_PROMPT = (
+    "You write fill-in-the-blank quiz questions. "
+    "The user gives a topic and a difficulty.\n\n"
+    "Return ONLY a JSON object with these exact fields:\n"
+    f"{_FILL_BLANK_FIELDS}\n"
+    f"Example:\n{_FILL_BLANK_EXAMPLE}"
+)
+
+MCQ_BATCH_SYSTEM_PROMPT = (
+    "You write different multiple-choice quiz questions. The user gives a topic, "
+    "a difficulty and a count.\n\n"
+    "Return ONLY a JSON object with a 'questions' array of exactly count objects, "
+    "each with these exact fields:\n"
+    f"{_MCQ_FIELDS}\n"
+    f'Example for count 1:\n{{"questions": [{_MCQ_EXAMPLE}]}}'
+)
+
+FILL_BLANK_BATCH_SYSTEM_PROMPT = (
+    "You write different fill-in-the-blank quiz questions. The user gives a topic, "
+    "a difficulty and a count.\n\n"
+    "Return ONLY a JSON object with a 'questions' array of exactly count objects, "
+    "each with these exact fields:\n"
+    f"{_FILL_BLANK_FIELDS}\n"
+    f'Example for count 1:\n{{"questions": [{_FILL_BLANK_EXAMPLE}]}}'
+)
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """A static system message shared by every call of one kind, plus a user message."""
+
+    kind: str
+    system: str
+    user: str
+    # Used to route the call to a model; not sent to the model on its own
+    difficulty: str = ""
+
+    @property
+    def text(self) -> str:
+        """Both messages as one string, for token estimates."""
+        return f"{self.system}\n\n{self.user}"
 
-def get_mcq_prompt(topic: str, difficulty: str) -> str:
+
+def get_mcq_prompt(topic: str, difficulty: str) -> Prompt:
     """
     Generate multiple choice question prompt template.
-    
+
     Args:
         topic: The topic for the question
         difficulty: The difficulty level ('easy', 'medium', 'hard')
-        
+
     Returns:
-        str: Formatted prompt for MCQ generation
-    """
-    return (
-        f"Generate a {difficulty} multiple-choice question about {topic}.\n\n"
-        "Return ONLY a JSON object with these exact fields:\n"
-        "- 'question': A clear, specific question\n"
-        "- 'options': An array of exactly 4 possible answers\n"
-        "- 'correct_answer': One of the options that is the correct answer\n\n"
-        "Example format:\n"
-        '{\n'
-        '    "question": "What is the capital of France?",\n'
-        '    "options": ["London", "Berlin", "Paris", "Madrid"],\n'
-        '    "correct_answer": "Paris"\n'
-        '}\n\n'
-        "Your response:"
+        Prompt: Prompt for MCQ generation
+    """
+    return Prompt(
+        "mcq",
+        MCQ_SYSTEM_PROMPT,
+        f"Topic: {topic}\nDifficulty: {difficulty}",
+        difficulty.lower(),
     )
 
 
-def get_fill_blank_prompt(topic: str, difficulty: str) -> str:
+def get_fill_blank_prompt(topic: str, difficulty: str) -> Prompt:
     """
     Generate fill-in-the-blank question prompt template.
-    
+
     Args:
         topic: The topic for the question
         difficulty: The difficulty level ('easy', 'medium', 'hard')
-        
+
     Returns:
-        str: Formatted prompt for fill-in-the-blank generation
-    """
-    return (
-        f"Generate a {difficulty} fill-in-the-blank question about {topic}.\n\n"
-        "Return ONLY a JSON object with these exact fields:\n"
-        "- 'question': A sentence with '_____' marking where the blank should be\n"
-        "- 'answer': The correct word or phrase that belongs in the blank\n\n"
-        "Example format:\n"
-        '{\n'
-        '    "question": "The capital of France is _____.",\n'
-        '    "answer": "Paris"\n'
-        '}\n\n'
-        "Your response:"
-    )
\ No newline at end of file
+        Prompt: Prompt for fill-in-the-blank generation
+    """
+    return Prompt(
+        "fill_blank",
+        FILL_BLANK_SYSTEM_PROMPT,
+        f"Topic: {topic}\nDifficulty: {difficulty}",
+        difficulty.lower(),
+    )
+
+
+def get_mcq_batch_prompt(topic: str, difficulty: str, count: int) -> Prompt:
+    """
+    Generate a prompt asking for several multiple choice questions at once.
+
+    Args:
+        topic: The topic for the questions
+        difficulty: The difficulty level ('easy', 'medium', 'hard')
+        count: Number of questions to request
+
+    Returns:
+        Prompt: Prompt for batched MCQ generation
+    """
+    return Prompt(
+        "mcq_batch",
+        MCQ_BATCH_SYSTEM_PROMPT,
+        f"Topic: {topic}\nDifficulty: {difficulty}\nCount: {count}",
+        difficulty.lower(),
+    )
+
+
+def get_fill_blank_batch_prompt(topic: str, difficulty: str, count: int) -> Prompt:
+    """
+    Generate a prompt asking for several fill-in-the-blank questions at once.
+
+    Args:
+        topic: The topic for the questions
+        difficulty: The difficulty level ('easy', 'medium', 'hard')
+        count: Number of questions to request
+
+    Returns:
+        Prompt: Prompt for batched fill-in-the-blank generation
+    """
+    return Prompt(
+        "fill_blank_batch",
+        FILL_BLANK_BATCH_SYSTEM_PROMPT,
+        f"Topic: {topic}\nDifficulty: {difficulty}\nCount: {count}",
+        difficulty.lower(),
+    )
+
+
+def get_retry_prompt(prompt: Prompt, error: str) -> Prompt:
+    """
+    Re-prompt after a response that could not be parsed or validated.
+
+    The system message is kept as is, so the retry still hits the cached prefix.
+
+    Args:
+        prompt: The original prompt
+        error: Short description of what was wrong with the previous response
+
+    Returns:
+        Prompt: Original prompt with a correction request appended to the user message
+    """
+    return replace(
+        prompt,
+        user=f"{prompt.user}\n\n"
+        f"Your previous response was invalid ({error[:200]}). "
+        "Reply again with ONLY the JSON described above.",
+    )
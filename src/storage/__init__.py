@@ -0,0 +1 @@
+"""Persistent storage package."""
@@ -0,0 +1,443 @@
+"""
+Question bank module for the AI Study Buddy application.
+Caches validated questions in SQLite so popular quizzes can be served without LLM calls.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pydantic import ValidationError
+
+from src.generator.dedup import NearDuplicateIndex
+from src.models.question_schemas import MCQQuestion, FillBlankQuestion
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+Question = Union[MCQQuestion, FillBlankQuestion]
+
+# Maps UI question types to the schema stored in the bank
+MODEL_CLASSES = {
+    "Multiple Choice": MCQQuestion,
+    "Fill in the Blank": FillBlankQuestion,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bank_key TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL,
+    UNIQUE (bank_key, content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_questions_key ON questions (bank_key, created_at);
+CREATE INDEX IF NOT EXISTS idx_questions_lru ON questions (last_used_at);
+CREATE TABLE IF NOT EXISTS requests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    requested INTEGER NOT NULL,
+    served_from_bank INTEGER NOT NULL,
+    requested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_requests_time ON requests (requested_at);
+"""
+
+
+def normalize_topic(topic: str) -> str:
+    """
+    Normalize a topic so equivalent spellings share one bank entry.
+
+    Args:
+        topic: Topic as typed by the user
+
+    Returns:
+        str: Lower-cased topic with punctuation removed and whitespace collapsed
+    """
+    topic = re.sub(r"[^\w\s]", " ", topic.lower())
+    return " ".join(topic.split())
+
+
+def make_bank_key(topic: str, difficulty: str, question_type: str) -> str:
+    """
+    Build the content address for a (topic, difficulty, question_type) combination.
+
+    Args:
+        topic: The quiz topic
+        difficulty: The difficulty level
+        question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+
+    Returns:
+        str: SHA-256 hex digest identifying the combination
+    """
+    raw = f"{normalize_topic(topic)}|{difficulty.strip().lower()}|{question_type}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class QuestionBank:
+    """SQLite-backed store of validated questions with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Initialize the question bank and create its schema if needed.
+
+        Args:
+            path: SQLite database path (defaults to settings.QUESTION_BANK_PATH)
+            ttl_seconds: Age after which questions expire (defaults to settings)
+            max_entries: Total questions kept before LRU eviction (defaults to settings)
+        """
+        self.path = path or settings.QUESTION_BANK_PATH
+        self.ttl_seconds = (
+            ttl_seconds
+            if ttl_seconds is not None
+            else settings.QUESTION_BANK_TTL_SECONDS
+        )
+        self.max_entries = (
+            max_entries
+            if max_entries is not None
+            else settings.QUESTION_BANK_MAX_ENTRIES
+        )
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        # Near-duplicate indexes per bank key, built lazily and kept LRU-bounded
+        self._indexes: "OrderedDict[str, NearDuplicateIndex]" = OrderedDict()
+        # Indexes being built outside the bank lock, one lock per bank key; questions
+        # added meanwhile are queued for them, None when an eviction invalidated
+        # the build
+        self._index_locks: Dict[str, threading.Lock] = {}
+        self._building: Dict[str, Optional[List[str]]] = {}
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection and commit on success."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def add(
+        self,
+        topic: str,
+        difficulty: str,
+        question_type: str,
+        questions: Sequence[Question],
+    ) -> int:
+        """
+        Store validated questions, ignoring exact duplicates.
+
+        Args:
+            topic: The quiz topic
+            difficulty: The difficulty level
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            questions: Validated question instances
+
+        Returns:
+            int: Number of questions actually inserted
+        """
+        if not questions:
+            return 0
+
+        key = make_bank_key(topic, difficulty, question_type)
+        now = time.time()
+        rows = []
+        for question in questions:
+            payload = question.model_dump_json()
+            content_hash = hashlib.sha256(
+                normalize_topic(question.question).encode("utf-8")
+            ).hexdigest()
+            rows.append((key, content_hash, payload, now, now))
+
+        with self._lock, self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO questions "
+                "(bank_key, content_hash, payload, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            inserted = conn.total_changes - before
+            self._evict(conn, now)
+            index = self._indexes.get(key)
+            if index is not None:
+                for question in questions:
+                    index.add(question.question)
+            pending = self._building.get(key)
+            if pending is not None:
+                pending.extend(question.question for question in questions)
+
+        self.logger.info(f"Stored {inserted} questions in the question bank")
+        return inserted
+
+    def take(
+        self, topic: str, difficulty: str, question_type: str, count: int
+    ) -> List[Question]:
+        """
+        Return up to ``count`` random unexpired questions for a combination.
+
+        Args:
+            topic: The quiz topic
+            difficulty: The difficulty level
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            count: Maximum number of questions to return
+
+        Returns:
+            List[Question]: Cached questions, possibly fewer than requested
+        """
+        if count <= 0:
+            return []
+
+        key = make_bank_key(topic, difficulty, question_type)
+        model_class = MODEL_CLASSES[question_type]
+        now = time.time()
+
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, payload FROM questions "
+                "WHERE bank_key = ? AND created_at >= ? "
+                "ORDER BY RANDOM() LIMIT ?",
+                (key, now - self.ttl_seconds, count),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE questions SET last_used_at = ? WHERE id = ?",
+                [(now, row_id) for row_id, _ in rows],
+            )
+
+        questions = []
+        for _, payload in rows:
+            try:
+                questions.append(model_class.model_validate_json(payload))
+            except ValidationError as e:
+                # Stored before a schema rule was tightened; the next generation
+                # replaces it
+                self.logger.error(
+                    f"Skipping cached question that no longer validates: {str(e)}"
+                )
+        return questions
+
+    def count(self, topic: str, difficulty: str, question_type: str) -> int:
+        """
+        Count unexpired questions stored for a combination.
+
+        Args:
+            topic: The quiz topic
+            difficulty: The difficulty level
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+
+        Returns:
+            int: Number of available questions
+        """
+        key = make_bank_key(topic, difficulty, question_type)
+        with self._connect() as conn:
+            (total,) = conn.execute(
+                "SELECT COUNT(*) FROM questions WHERE bank_key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds),
+            ).fetchone()
+        return total
+
+    def is_near_duplicate(
+        self, topic: str, difficulty: str, question_type: str, text: str
+    ) -> bool:
+        """
+        Check whether a question rewords one already stored for a combination.
+
+        Args:
+            topic: The quiz topic
+            difficulty: The difficulty level
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            text: Question text to check
+
+        Returns:
+            bool: True if a stored question is at least DEDUP_THRESHOLD similar
+        """
+        key = make_bank_key(topic, difficulty, question_type)
+        index = self._index_for(key)
+        with self._lock:
+            return index.is_duplicate(text)
+
+    def _index_for(self, key: str) -> NearDuplicateIndex:
+        """
+        Return the near-duplicate index of a bank key, building it on first use.
+
+        Building reads every stored question of the key, so it only holds the
+        key's own lock: lookups for other topics are not held up.
+        """
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+            key_lock = self._index_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is not None:
+                    return index
+                self._building[key] = []
+
+            try:
+                with self._connect() as conn:
+                    rows = conn.execute(
+                        "SELECT payload FROM questions "
+                        "WHERE bank_key = ? AND created_at >= ?",
+                        (key, time.time() - self.ttl_seconds),
+                    ).fetchall()
+
+                index = NearDuplicateIndex()
+                for (payload,) in rows:
+                    # Only the text is needed, so the payload is not validated
+                    index.add(json.loads(payload)["question"])
+            finally:
+                with self._lock:
+                    pending = self._building.pop(key, None)
+                    self._index_locks.pop(key, None)
+
+            with self._lock:
+                if pending is None:
+                    # Rows were evicted during the build: use it once, rebuild next time
+                    return index
+                for text in pending:
+                    index.add(text)
+                self._indexes[key] = index
+                while len(self._indexes) > settings.DEDUP_MAX_INDEXES:
+                    self._indexes.popitem(last=False)
+            return index
+
+    def record_request(
+        self,
+        topic: str,
+        difficulty: str,
+        question_type: str,
+        requested: int,
+        served_from_bank: int,
+    ) -> None:
+        """
+        Log a quiz request so the prefetch worker can find popular combinations.
+
+        Args:
+            topic: The quiz topic
+            difficulty: The difficulty level
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            requested: Number of questions the user asked for
+            served_from_bank: Number of those served from the bank
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO requests (topic, difficulty, question_type, requested, "
+                "served_from_bank, requested_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    normalize_topic(topic),
+                    difficulty.strip().lower(),
+                    question_type,
+                    requested,
+                    served_from_bank,
+                    time.time(),
+                ),
+            )
+
+    def popular_requests(
+        self, since_seconds: float, limit: int
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Return the most requested combinations in a recent time window.
+
+        Args:
+            since_seconds: Size of the look-back window in seconds
+            limit: Maximum number of combinations to return
+
+        Returns:
+            List[Tuple[str, str, str]]: (topic, difficulty, question_type), most
+            popular first
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT topic, difficulty, question_type FROM requests "
+                "WHERE requested_at >= ? GROUP BY topic, difficulty, question_type "
+                "ORDER BY COUNT(*) DESC LIMIT ?",
+                (time.time() - since_seconds, limit),
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def hit_rate(self, since_seconds: float) -> Optional[float]:
+        """
+        Share of requested questions served from the bank in a recent window.
+
+        Args:
+            since_seconds: Size of the look-back window in seconds
+
+        Returns:
+            Optional[float]: Hit rate between 0 and 1, or None without requests
+        """
+        with self._connect() as conn:
+            requested, served = conn.execute(
+                "SELECT SUM(requested), SUM(served_from_bank) FROM requests "
+                "WHERE requested_at >= ?",
+                (time.time() - since_seconds,),
+            ).fetchone()
+        if not requested:
+            return None
+        return served / requested
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """
+        Drop expired questions, then least recently used ones above max_entries.
+
+        Near-duplicate indexes of the bank keys that lost questions are dropped
+        too, so they are rebuilt without them. The caller holds the lock.
+        """
+        evicted = conn.execute(
+            "DELETE FROM questions WHERE created_at < ? RETURNING bank_key",
+            (now - self.ttl_seconds,),
+        ).fetchall()
+        (total,) = conn.execute("SELECT COUNT(*) FROM questions").fetchone()
+        overflow = total - self.max_entries
+        if overflow > 0:
+            evicted += conn.execute(
+                "DELETE FROM questions WHERE id IN ("
+                "SELECT id FROM questions ORDER BY last_used_at ASC LIMIT ?) "
+                "RETURNING bank_key",
+                (overflow,),
+            ).fetchall()
+            self.logger.info(f"Evicted {overflow} least recently used questions")
+
+        for key in {key for (key,) in evicted}:
+            self._indexes.pop(key, None)
+            if key in self._building:
+                self._building[key] = None
+
+
+@lru_cache(maxsize=1)
+def get_question_bank() -> QuestionBank:
+    """
+    Return the process-wide question bank instance.
+
+    Returns:
+        QuestionBank: Shared question bank
+    """
+    return QuestionBank()
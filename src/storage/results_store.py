@@ -0,0 +1,378 @@
+"""
+Results store module for the AI Study Buddy application.
+Appends graded quiz attempts to SQLite from a background writer and serves exports
+and statistics.
+"""
+
+import atexit
+import csv
+import io
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.storage.question_bank import normalize_topic
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    attempt_id TEXT NOT NULL UNIQUE,
+    session_id TEXT,
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    num_questions INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    submitted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_session ON attempts (session_id, submitted_at);
+CREATE INDEX IF NOT EXISTS idx_attempts_time ON attempts (submitted_at);
+CREATE TABLE IF NOT EXISTS answers (
+    attempt INTEGER NOT NULL REFERENCES attempts (id),
+    question_number INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    options TEXT NOT NULL,
+    user_answer TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    is_correct INTEGER NOT NULL,
+    PRIMARY KEY (attempt, question_number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS topic_stats (
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    answers INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    PRIMARY KEY (topic, difficulty, question_type)
+) WITHOUT ROWID;
+"""
+
+# Columns of exported CSV files, in order
+CSV_COLUMNS = [
+    "attempt_id",
+    "submitted_at",
+    "topic",
+    "difficulty",
+    "question_number",
+    "question",
+    "question_type",
+    "user_answer",
+    "correct_answer",
+    "is_correct",
+    "options",
+]
+
+
+class ResultsStore:
+    """
+    Append-only SQLite store of graded quiz attempts.
+
+    ``record`` only enqueues an attempt; a background thread writes queued
+    attempts in batches, one transaction per batch, so saving never waits on
+    disk. Per-topic counters are kept in a rollup table in the same
+    transaction, so accuracy queries do not scan the answer rows.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the store, create its schema and start the writer thread.
+
+        Args:
+            path: SQLite database path (defaults to settings.RESULTS_STORE_PATH)
+            batch_size: Maximum attempts written per transaction (defaults to settings)
+            flush_interval: Seconds the writer waits for more attempts before
+                writing a partial batch (defaults to settings)
+        """
+        self.path = path or settings.RESULTS_STORE_PATH
+        self.batch_size = batch_size or settings.RESULTS_WRITE_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.RESULTS_FLUSH_INTERVAL_SECONDS
+        )
+        self.logger = get_logger(self.__class__.__name__)
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._writer = threading.Thread(
+            target=self._run, name="results-writer", daemon=True
+        )
+        self._writer.start()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection and commit on success."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def record(
+        self,
+        results: List[Dict[str, Any]],
+        topic: str,
+        difficulty: str,
+        question_type: str,
+        session_id: Optional[str] = None,
+    ) -> str:
+        """
+        Queue a graded attempt for writing.
+
+        Args:
+            results: Per-question result records from ``QuizCore.evaluate_quiz``
+            topic: The quiz topic
+            difficulty: The difficulty level
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            session_id: Optional user session the attempt belongs to
+
+        Returns:
+            str: ID of the attempt, usable for exports once it has been written
+        """
+        attempt_id = uuid.uuid4().hex
+        self._queue.put(
+            {
+                "attempt_id": attempt_id,
+                "session_id": session_id,
+                "topic": normalize_topic(topic),
+                "difficulty": difficulty.strip().lower(),
+                "question_type": question_type,
+                "submitted_at": time.time(),
+                "results": results,
+            }
+        )
+        return attempt_id
+
+    def flush(self) -> None:
+        """Block until every queued attempt has been written."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Write the remaining attempts and stop the writer thread."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _run(self) -> None:
+        """Writer loop: collect up to ``batch_size`` attempts and write them at once."""
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while (
+                first is not None
+                and len(batch) < self.batch_size
+                and batch[-1] is not None
+            ):
+                try:
+                    batch.append(
+                        self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    )
+                except queue.Empty:
+                    break
+
+            attempts = [attempt for attempt in batch if attempt is not None]
+            try:
+                if attempts:
+                    with self._connect() as conn:
+                        self._write_batch(conn, attempts)
+            except Exception as e:
+                self.logger.error(
+                    f"Failed to write {len(attempts)} quiz attempts: {str(e)}"
+                )
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if len(attempts) < len(batch):
+                return
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, attempts: List[Dict[str, Any]]) -> None:
+        """Insert attempts, their answers and the rollup counters in one transaction."""
+        for attempt in attempts:
+            results = attempt["results"]
+            correct = sum(1 for result in results if result["is_correct"])
+            cursor = conn.execute(
+                "INSERT INTO attempts (attempt_id, session_id, topic, difficulty, "
+                "question_type, num_questions, correct, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    attempt["attempt_id"],
+                    attempt["session_id"],
+                    attempt["topic"],
+                    attempt["difficulty"],
+                    attempt["question_type"],
+                    len(results),
+                    correct,
+                    attempt["submitted_at"],
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO answers (attempt, question_number, question, "
+                "question_type, options, user_answer, correct_answer, is_correct) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        cursor.lastrowid,
+                        result["question_number"],
+                        result["question"],
+                        result["question_type"],
+                        json.dumps(result.get("options", [])),
+                        str(result["user_answer"]),
+                        result["correct_answer"],
+                        int(result["is_correct"]),
+                    )
+                    for result in results
+                ],
+            )
+            conn.execute(
+                "INSERT INTO topic_stats "
+                "(topic, difficulty, question_type, attempts, answers, correct) "
+                "VALUES (?, ?, ?, 1, ?, ?) "
+                "ON CONFLICT (topic, difficulty, question_type) DO UPDATE SET "
+                "attempts = attempts + 1, answers = answers + excluded.answers, "
+                "correct = correct + excluded.correct",
+                (
+                    attempt["topic"],
+                    attempt["difficulty"],
+                    attempt["question_type"],
+                    len(results),
+                    correct,
+                ),
+            )
+
+    def iter_csv(
+        self,
+        attempt_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        chunk_rows: int = 500,
+    ) -> Iterator[str]:
+        """
+        Stream answer rows as CSV text, header first, without loading them all.
+
+        Args:
+            attempt_id: Only export this attempt
+            session_id: Only export attempts of this session
+            chunk_rows: Rows fetched and yielded per chunk
+
+        Yields:
+            str: CSV text chunks
+        """
+        query = (
+            "SELECT a.attempt_id, a.submitted_at, a.topic, a.difficulty, "
+            "n.question_number, n.question, n.question_type, n.user_answer, "
+            "n.correct_answer, n.is_correct, n.options "
+            "FROM attempts a JOIN answers n ON n.attempt = a.id"
+        )
+        conditions, params = [], []
+        if attempt_id is not None:
+            conditions.append("a.attempt_id = ?")
+            params.append(attempt_id)
+        if session_id is not None:
+            conditions.append("a.session_id = ?")
+            params.append(session_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY a.id, n.question_number"
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_COLUMNS)
+        with self._connect() as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_rows)
+                for row in rows:
+                    submitted_at = datetime.fromtimestamp(
+                        row[1], timezone.utc
+                    ).isoformat()
+                    writer.writerow(
+                        (row[0], submitted_at, *row[2:9], bool(row[9]), row[10])
+                    )
+                chunk = buffer.getvalue()
+                if chunk:
+                    yield chunk
+                    buffer.seek(0)
+                    buffer.truncate()
+                if not rows:
+                    break
+
+    def topic_accuracy(
+        self, topic: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Accuracy per (topic, difficulty, question_type) from the rollup table.
+
+        Args:
+            topic: Only report this topic
+            limit: Maximum number of rows, most answered first
+
+        Returns:
+            List[Dict[str, Any]]: Attempts, answers, correct answers and accuracy
+            per combination
+        """
+        query = (
+            "SELECT topic, difficulty, question_type, attempts, answers, correct "
+            "FROM topic_stats"
+        )
+        params: List[Any] = []
+        if topic is not None:
+            query += " WHERE topic = ?"
+            params.append(normalize_topic(topic))
+        query += " ORDER BY answers DESC LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [
+            {
+                "topic": row[0],
+                "difficulty": row[1],
+                "question_type": row[2],
+                "attempts": row[3],
+                "answers": row[4],
+                "correct": row[5],
+                "accuracy": round(row[5] / row[4], 4) if row[4] else None,
+            }
+            for row in rows
+        ]
+
+
+@lru_cache(maxsize=1)
+def get_results_store() -> ResultsStore:
+    """
+    Return the process-wide results store, flushed when the process exits.
+
+    Returns:
+        ResultsStore: Shared results store
+    """
+    store = ResultsStore()
+    atexit.register(store.close)
+    return store
@@ -0,0 +1,310 @@
+"""
+Shared quiz module for the AI Study Buddy application.
+Stores generated quizzes under short join codes so a whole class can take
+the same quiz without generating it again.
+
+Quizzes are written once and never modified; every session that joins gets
+its own copy of the questions and keeps its own answers. SQLite keeps them
+on one host; with several replicas, SHARED_QUIZ_BACKEND=redis shares them.
+"""
+
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.common.logger import get_logger
+from src.common.custom_exception import CustomException
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_quizzes (
+    code TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    question_type TEXT NOT NULL,
+    questions TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_shared_quizzes_time ON shared_quizzes (created_at);
+"""
+
+# Letters and digits that cannot be mistaken for each other when read aloud or off
+# a board
+JOIN_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+# Recently joined quizzes kept in memory, so a class joining at once reads the
+# database once
+_MEMORY_ENTRIES = 64
+
+
+def normalize_code(code: str) -> str:
+    """
+    Normalize a join code as typed by a user.
+
+    Args:
+        code: Join code, in any case and with optional spaces or dashes
+
+    Returns:
+        str: Upper-case code without separators
+    """
+    return "".join(char for char in code.upper() if char not in " -")
+
+
+@dataclass(frozen=True)
+class SharedQuiz:
+    """A published quiz; read-only, sessions copy its questions."""
+
+    code: str
+    topic: str
+    difficulty: str
+    question_type: str
+    questions: Tuple[Dict[str, Any], ...]
+    created_at: float
+
+
+class SharedQuizStore:
+    """SQLite table of shared quizzes by join code, with expiry; for one replica."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        code_length: Optional[int] = None,
+    ):
+        """
+        Initialize the store and create its table.
+
+        Args:
+            path: SQLite database path (defaults to settings.SHARED_QUIZ_PATH)
+            ttl_seconds: Time a join code stays valid (defaults to settings)
+            code_length: Characters per join code (defaults to settings)
+        """
+        self.path = path or settings.SHARED_QUIZ_PATH
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None else settings.SHARED_QUIZ_TTL_SECONDS
+        )
+        self.code_length = code_length or settings.SHARED_QUIZ_CODE_LENGTH
+        self.logger = get_logger(self.__class__.__name__)
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, SharedQuiz]" = OrderedDict()
+        self._create()
+
+    def _create(self) -> None:
+        """Create the database and its table."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a short-lived connection and commit on success."""
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _new_code(self) -> str:
+        """Draw a random join code."""
+        return "".join(
+            secrets.choice(JOIN_CODE_ALPHABET) for _ in range(self.code_length)
+        )
+
+    def publish(
+        self,
+        topic: str,
+        difficulty: str,
+        question_type: str,
+        questions: List[Dict[str, Any]],
+    ) -> str:
+        """
+        Store a quiz and return its join code.
+
+        Args:
+            topic: The quiz topic
+            difficulty: Difficulty level
+            question_type: Type of questions
+            questions: Question records, correct answers included
+
+        Returns:
+            str: Join code
+
+        Raises:
+            Exception: The storage error (sqlite3.Error or redis.RedisError) if the
+                quiz could not be stored
+        """
+        payload = json.dumps(questions, ensure_ascii=False)
+        now = time.time()
+        self._expire(now)
+        code = self._new_code()
+        # a code already taken by a live quiz is simply drawn again
+        while not self._insert(code, (topic, difficulty, question_type, payload, now)):
+            code = self._new_code()
+
+        self.logger.info(
+            f"Shared a {len(questions)}-question quiz on '{topic}' as {code}"
+        )
+        return code
+
+    def _expire(self, now: float) -> None:
+        """Delete expired quizzes."""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM shared_quizzes WHERE created_at < ?",
+                (now - self.ttl_seconds,),
+            )
+
+    def _insert(self, code: str, row: Tuple[str, str, str, str, float]) -> bool:
+        """Store a quiz row under a code; False if the code is taken."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO shared_quizzes "
+                    "(code, topic, difficulty, question_type, questions, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (code, *row),
+                )
+            return True
+        except sqlite3.IntegrityError:
+            return False
+
+    def _select(
+        self, code: str, now: float
+    ) -> Optional[Tuple[str, str, str, str, float]]:
+        """Unexpired quiz row of a code."""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT topic, difficulty, question_type, questions, created_at "
+                "FROM shared_quizzes "
+                "WHERE code = ? AND created_at >= ?",
+                (code, now - self.ttl_seconds),
+            ).fetchone()
+
+    def load(self, code: str) -> Optional[SharedQuiz]:
+        """
+        Look up an unexpired shared quiz.
+
+        Args:
+            code: Join code as typed by the user
+
+        Returns:
+            Optional[SharedQuiz]: The quiz, or None if the code is unknown or expired
+        """
+        code = normalize_code(code)
+        now = time.time()
+        with self._lock:
+            shared = self._memory.get(code)
+            if shared is not None:
+                if now - shared.created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(code)
+                    return shared
+                del self._memory[code]
+
+        row = self._select(code, now)
+        if row is None:
+            return None
+
+        topic, difficulty, question_type, questions, created_at = row
+        shared = SharedQuiz(
+            code=code,
+            topic=topic,
+            difficulty=difficulty,
+            question_type=question_type,
+            questions=tuple(json.loads(questions)),
+            created_at=created_at,
+        )
+        with self._lock:
+            self._memory[code] = shared
+            while len(self._memory) > _MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+        return shared
+
+
+class RedisSharedQuizStore(SharedQuizStore):
+    """Shared quizzes kept in Redis, so every replica can load a code from any other."""
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        code_length: Optional[int] = None,
+    ):
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis connection URL (defaults to settings.REDIS_URL)
+            ttl_seconds: Time a join code stays valid (defaults to settings)
+            code_length: Characters per join code (defaults to settings)
+
+        Raises:
+            CustomException: If the optional ``redis`` package is not installed
+        """
+        self.url = url or settings.REDIS_URL
+        super().__init__(
+            path=self.url, ttl_seconds=ttl_seconds, code_length=code_length
+        )
+
+    def _create(self) -> None:
+        """Connect the Redis client."""
+        try:
+            import redis
+        except ImportError as e:
+            raise CustomException(
+                "The 'redis' package is required for SHARED_QUIZ_BACKEND=redis", e
+            )
+
+        self.client = redis.Redis.from_url(
+            self.url,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+        )
+
+    def _key(self, code: str) -> str:
+        """Redis key of a join code."""
+        return f"{settings.SHARED_QUIZ_KEY_PREFIX}:{code}"
+
+    def _expire(self, now: float) -> None:
+        """Nothing to do: Redis expires the keys itself."""
+
+    def _insert(self, code: str, row: Tuple[str, str, str, str, float]) -> bool:
+        """Store a quiz row under a code with the TTL; False if the code is taken."""
+        stored = self.client.set(
+            self._key(code),
+            json.dumps(row, ensure_ascii=False),
+            nx=True,
+            ex=max(1, int(self.ttl_seconds)),
+        )
+        return bool(stored)
+
+    def _select(
+        self, code: str, now: float
+    ) -> Optional[Tuple[str, str, str, str, float]]:
+        """Quiz row of a code, unless Redis has expired it."""
+        value = self.client.get(self._key(code))
+        return None if value is None else tuple(json.loads(value))
+
+
+@lru_cache(maxsize=1)
+def get_shared_quiz_store() -> SharedQuizStore:
+    """
+    Return the process-wide shared quiz store.
+
+    Returns:
+        SharedQuizStore: Store backed by SHARED_QUIZ_BACKEND ('sqlite' or 'redis')
+    """
+    if settings.SHARED_QUIZ_BACKEND == "redis":
+        return RedisSharedQuizStore()
+    return SharedQuizStore()
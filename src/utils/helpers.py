@@ -1,37 +1,35 @@
 """
 Helper utilities for the AI Study Buddy application.
-Contains the QuizManager class and utility functions for quiz management.
+Contains the Streamlit adapter around QuizCore and other UI utilities.
 """
 
-import os
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 import streamlit as st
-import pandas as pd
 
+from src.common.metrics import span
 from src.generator.question_generator import QuestionGenerator
+from src.utils.quiz_core import QuizCore, QuizSummary
 
 
 def rerun():
     """Toggle the rerun trigger to force Streamlit to rerun.
-    Without rerun(), users would need to manually refresh the page 
-    or interact with another widget to see the updated content. 
-    This function provides immediate visual feedback by automatically 
-    refreshing the app state and displaying new content 
+    Without rerun(), users would need to manually refresh the page
+    or interact with another widget to see the updated content.
+    This function provides immediate visual feedback by automatically
+    refreshing the app state and displaying new content
     (like generated questions or quiz results) right after user actions.
     """
-    st.session_state['rerun_trigger'] = not st.session_state.get('rerun_trigger', False)
+    st.session_state["rerun_trigger"] = not st.session_state.get("rerun_trigger", False)
 
 
-class QuizManager:
-    """Manages quiz generation, user interaction, and result evaluation."""
+class QuizManager(QuizCore):
+    """Streamlit adapter for QuizCore: renders questions and reports messages."""
 
-    def __init__(self):
-        """Initialize the quiz manager with empty collections."""
-        self.questions: List[Dict[str, Any]] = []
-        self.user_answers: List[str] = []
-        self.results: List[Dict[str, Any]] = []
+    def __init__(self, *args, **kwargs):
+        """Initialize the quiz core and the rendered results cache."""
+        super().__init__(*args, **kwargs)
+        self._results_markdown: Optional[Tuple[QuizSummary, str]] = None
 
     def generate_questions(
         self,
@@ -39,139 +37,134 @@ class QuizManager:
         topic: str,
         question_type: str,
         difficulty: str,
-        num_questions: int
+        num_questions: int,
     ) -> bool:
         """
-        Generate questions using the provided generator.
-        
+        Generate questions concurrently using the provided generator.
+
+        Questions keep their requested order. If some questions fail, the quiz
+        is built from the ones that succeeded and a warning is shown. When a
+        question bank is configured, all but QUESTION_BANK_FRESH_RATIO of the
+        quiz is served from it and new questions are added back to it.
+
         Args:
             generator: The question generator instance
             topic: The topic for questions
             question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
             difficulty: Difficulty level
             num_questions: Number of questions to generate
-            
+
         Returns:
-            bool: True if generation successful, False otherwise
+            bool: True if at least one question was generated, False otherwise
         """
-        # Reset collections
-        self.questions = []
-        self.user_answers = []
-        self.results = []
-
-        try:
-            for _ in range(num_questions):
-                if question_type == "Multiple Choice":
-                    question = generator.generate_mcq(topic, difficulty.lower())
-                    self.questions.append({
-                        'type': 'MCQ',
-                        'question': question.question,
-                        'options': question.options,
-                        'correct_answer': question.correct_answer
-                    })
-                else:
-                    question = generator.generate_fill_blank(topic, difficulty.lower())
-                    self.questions.append({
-                        'type': 'Fill in the blank',
-                        'question': question.question,
-                        'correct_answer': question.answer
-                    })
-
-        except Exception as e:
-            st.error(f"Error generating question: {e}")
-            return False
-
-        return True
+        self.generate(generator, topic, question_type, difficulty, num_questions)
+        return self.report_generation(num_questions)
 
-    def attempt_quiz(self):
-        """Display quiz questions and collect user answers."""
-        for i, q in enumerate(self.questions):
-            st.markdown(f"**Question {i + 1}: {q['question']}**")
-
-            if q['type'] == 'MCQ':
-                user_answer = st.radio(
-                    f"Select an answer for Question {i + 1}",
-                    q['options'],
-                    key=f"mcq_{i}"
-                )
-            else:
-                user_answer = st.text_input(
-                    f"Fill in the blank for Question {i + 1}",
-                    key=f"fill_blank_{i}"
-                )
-
-            # Ensure user_answers list is long enough
-            while len(self.user_answers) <= i:
-                self.user_answers.append("")
-            
-            self.user_answers[i] = user_answer
-
-    def evaluate_quiz(self):
-        """Evaluate the quiz and generate results."""
-        self.results = []
-
-        for i, (q, user_ans) in enumerate(zip(self.questions, self.user_answers)):
-            result_dict = {
-                'question_number': i + 1,
-                'question': q['question'],
-                'question_type': q["type"],
-                'user_answer': user_ans,
-                'correct_answer': q["correct_answer"],
-                "is_correct": False
-            }
-
-            if q['type'] == 'MCQ':
-                result_dict['options'] = q['options']
-                result_dict["is_correct"] = user_ans == q["correct_answer"]
-            else:
-                result_dict['options'] = []
-                result_dict["is_correct"] = (
-                    user_ans.strip().lower() == q['correct_answer'].strip().lower()
-                )
+    def report_generation(self, num_questions: int) -> bool:
+        """
+        Show an error or warning for the last generation run.
 
-            self.results.append(result_dict)
+        Args:
+            num_questions: Number of questions that were requested
 
-    def generate_result_dataframe(self) -> pd.DataFrame:
-        """
-        Generate a pandas DataFrame from quiz results.
-        
         Returns:
-            pd.DataFrame: DataFrame containing quiz results
+            bool: True if at least one question was generated, False otherwise
         """
-        if not self.results:
-            return pd.DataFrame()
+        success, message = self.generation_status(num_questions)
+        if message:
+            if success:
+                st.warning(message)
+            else:
+                st.error(message)
+        return success
 
-        return pd.DataFrame(self.results)
+    def attempt_quiz(self):
+        """Display quiz questions and collect user answers."""
+        slots = self.question_slots
+        if len(slots) != len(self.questions):
+            slots = range(len(self.questions))
+        for i, (slot, q) in enumerate(zip(slots, self.questions)):
+            self.render_question(i, q, slot)
 
-    def save_to_csv(self, filename_prefix: str = "quiz_results") -> Optional[str]:
+    def render_question(self, i: int, q: Dict[str, Any], slot: Optional[int] = None):
         """
-        Save quiz results to a CSV file.
-        
+        Display a single quiz question and record the user's answer.
+
+        The question is numbered and its widget keyed by its requested slot,
+        so both stay the same between the streamed render and later reruns
+        even when an earlier slot failed.
+
         Args:
-            filename_prefix: Prefix for the filename
-            
-        Returns:
-            str: Path to saved file, or None if saving failed
+            i: Zero-based question position
+            q: Question record
+            slot: Zero-based requested position (defaults to ``i``)
         """
-        if not self.results:
-            st.warning("No results to save!")
-            return None
-
-        df = self.generate_result_dataframe()
+        slot = i if slot is None else slot
+        st.markdown(f"**Question {slot + 1}: {q['question']}**")
+
+        if q["type"] == "MCQ":
+            user_answer = st.radio(
+                f"Select an answer for Question {slot + 1}",
+                q["options"],
+                key=f"mcq_{slot}",
+            )
+        else:
+            user_answer = st.text_input(
+                f"Fill in the blank for Question {slot + 1}", key=f"fill_blank_{slot}"
+            )
+
+        self.set_answer(i, user_answer)
+
+    def render_results(self) -> None:
+        """
+        Display the score and per-question feedback of the graded quiz.
 
-        # Generate unique filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_filename = f"{filename_prefix}_{timestamp}.csv"
+        The feedback is built once per graded submission and shown as a single
+        markdown element, so reruns that do not change an answer cost the same
+        however long the quiz is.
+        """
+        summary = self.summary
+        if summary is None:
+            st.info(
+                "Your answers changed since they were submitted. "
+                "Submit the quiz again to see the results."
+            )
+            return
+        if not summary.results:
+            st.warning("No results available")
+            return
+
+        with span("render_results"):
+            st.write(f"Score: {summary.score_percentage:.1f}%")
+            st.markdown(self.results_markdown(summary))
+
+    def results_markdown(self, summary: QuizSummary) -> str:
+        """
+        Per-question feedback for a graded submission, cached per summary.
 
-        # Create results directory if it doesn't exist
-        os.makedirs('results', exist_ok=True)
-        full_path = os.path.join('results', unique_filename)
+        Args:
+            summary: The graded submission
 
-        try:
-            df.to_csv(full_path, index=False)
-            st.success("Results saved successfully!")
-            return full_path
+        Returns:
+            str: Markdown with one entry per question
+        """
+        if self._results_markdown is not None and self._results_markdown[0] is summary:
+            return self._results_markdown[1]
+
+        entries = []
+        for result in summary.results:
+            question = str(result["question"]).replace("]", "\\]")
+            if result["is_correct"]:
+                entries.append(
+                    f":green[✅ Question {result['question_number']}: {question}]"
+                )
+            else:
+                entries.append(
+                    f":red[❌ Question {result['question_number']}: {question}]  \n"
+                    f"**Your answer:** {result['user_answer']}  \n"
+                    f"**Correct answer:** {result['correct_answer']}"
+                )
 
-        except Exception as e:
-            st.error(f"Failed to save results: {e}")
-            return None
+        markdown = "\n\n---\n\n".join(entries)
+        self._results_markdown = (summary, markdown)
+        return markdown
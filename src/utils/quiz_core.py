@@ -0,0 +1,621 @@
+"""
+Quiz core module for the AI Study Buddy application.
+Generates, deduplicates and grades quizzes without any UI dependency.
+"""
+
+import contextvars
+import copy
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterator, List, Dict, Any, Optional, Tuple
+
+from src.generator.question_generator import QuestionGenerator
+from src.generator.dedup import NearDuplicateIndex
+from src.grading.grader import grade_answers
+from src.models.question_schemas import MCQQuestion
+from src.storage.question_bank import QuestionBank
+from src.storage.results_store import ResultsStore
+from src.storage.shared_quizzes import SharedQuiz, SharedQuizStore
+from src.llm.retry import Deadline, ErrorKind, classify_error
+from src.config.settings import settings
+from src.common.metrics import observe_stage, span
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True, eq=False)
+class QuizSummary:
+    """Graded submission with precomputed aggregates, built once per set of answers."""
+
+    results: Tuple[Dict[str, Any], ...]
+    correct: int
+    total: int
+    score_percentage: float
+
+    @classmethod
+    def from_results(cls, results: List[Dict[str, Any]]) -> "QuizSummary":
+        """
+        Build a summary from per-question result records.
+
+        Args:
+            results: Result records from ``QuizCore.evaluate_quiz``
+
+        Returns:
+            QuizSummary: Results with their score
+        """
+        correct = sum(1 for result in results if result["is_correct"])
+        total = len(results)
+        return cls(
+            results=tuple(results),
+            correct=correct,
+            total=total,
+            score_percentage=correct / total * 100 if total else 0.0,
+        )
+
+
+class QuizCore:
+    """Generates quiz questions and grades answers; shared by the UI and the API."""
+
+    def __init__(
+        self,
+        question_bank: Optional[QuestionBank] = None,
+        results_store: Optional[ResultsStore] = None,
+        share_responses: bool = True,
+    ):
+        """
+        Initialize the quiz with empty collections.
+
+        Args:
+            question_bank: Optional cache of previously generated questions
+            results_store: Optional store that graded attempts are saved to
+            share_responses: Use the shared LLM response cache, so concurrent
+                quizzes on the same topic get the same questions; bulk
+                generation turns this off to get distinct quizzes
+        """
+        self.question_bank = question_bank
+        self.results_store = results_store
+        self.share_responses = share_responses
+        self.topic: Optional[str] = None
+        self.difficulty: Optional[str] = None
+        self.question_type: Optional[str] = None
+        self.questions: List[Dict[str, Any]] = []
+        self.user_answers: List[str] = []
+        self.results: List[Dict[str, Any]] = []
+        self.summary: Optional[QuizSummary] = None
+        self.generation_errors: List[Exception] = []
+        # Join code of the shared quiz these questions were published as or loaded from
+        self.shared_code: Optional[str] = None
+        # Requested position of each question, so a quiz missing a failed slot
+        # keeps the numbering and widget keys it was streamed with
+        self.question_slots: List[int] = []
+
+    def generate(
+        self,
+        generator: QuestionGenerator,
+        topic: str,
+        question_type: str,
+        difficulty: str,
+        num_questions: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate a whole quiz, keeping the requested question order.
+
+        Args:
+            generator: The question generator instance
+            topic: The topic for questions
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            difficulty: Difficulty level
+            num_questions: Number of questions to generate
+
+        Returns:
+            List[Dict[str, Any]]: Generated question records (failures are in
+            ``self.generation_errors``)
+        """
+        for _ in self.stream_questions(
+            generator, topic, question_type, difficulty, num_questions
+        ):
+            pass
+        return self.questions
+
+    def share(self, store: SharedQuizStore) -> str:
+        """
+        Publish the current questions as a shared quiz, once.
+
+        Args:
+            store: Shared quiz store
+
+        Returns:
+            str: Join code of the quiz (the existing one if it was already shared)
+
+        Raises:
+            ValueError: If there are no questions to share
+        """
+        if self.shared_code is None:
+            if not self.questions:
+                raise ValueError("Generate a quiz before sharing it")
+            self.shared_code = store.publish(
+                self.topic, self.difficulty, self.question_type, self.questions
+            )
+        return self.shared_code
+
+    def load_shared(self, shared: SharedQuiz) -> None:
+        """
+        Take a shared quiz with fresh answers, without any LLM call.
+
+        The questions are copied, so the shared quiz stays unchanged whatever
+        this session does with them.
+
+        Args:
+            shared: Quiz loaded from the shared quiz store
+        """
+        self.topic, self.difficulty, self.question_type = (
+            shared.topic,
+            shared.difficulty,
+            shared.question_type,
+        )
+        self.questions = copy.deepcopy(list(shared.questions))
+        self.question_slots = list(range(len(self.questions)))
+        self.user_answers = []
+        self.results = []
+        self.summary = None
+        self.generation_errors = []
+        self.shared_code = shared.code
+
+    def generation_status(self, num_questions: int) -> Tuple[bool, Optional[str]]:
+        """
+        Summarize the last generation run for display.
+
+        Args:
+            num_questions: Number of questions that were requested
+
+        Returns:
+            Tuple[bool, Optional[str]]: Whether at least one question was
+            generated, and an error (on failure) or warning (for a partial
+            quiz) message, or None when the whole quiz was generated
+        """
+        if not self.questions:
+            error = (
+                self.generation_errors[0] if self.generation_errors else "no questions"
+            )
+            return False, f"Error generating question: {error}"
+
+        if len(self.questions) < num_questions:
+            return True, (
+                f"{num_questions - len(self.questions)} of {num_questions} questions "
+                f"could not be generated; showing the remaining {len(self.questions)}."
+            )
+
+        return True, None
+
+    def stream_questions(
+        self,
+        generator: QuestionGenerator,
+        topic: str,
+        question_type: str,
+        difficulty: str,
+        num_questions: int,
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Generate questions and yield each one as soon as it is ready.
+
+        Cached questions are yielded first, then fresh ones in completion order.
+        Once the iterator is exhausted, ``self.questions`` holds the quiz in its
+        requested order, ``self.question_slots`` the requested position of
+        each question and ``self.generation_errors`` the failures.
+
+        Args:
+            generator: The question generator instance
+            topic: The topic for questions
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            difficulty: Difficulty level
+            num_questions: Number of questions to generate
+
+        Yields:
+            Tuple[int, Dict[str, Any]]: Requested position and question record
+        """
+        # Reset collections
+        self.topic, self.difficulty, self.question_type = (
+            topic,
+            difficulty,
+            question_type,
+        )
+        self.questions = []
+        self.question_slots = []
+        self.user_answers = []
+        self.results = []
+        self.summary = None
+        self.generation_errors = []
+        self.shared_code = None
+
+        if num_questions <= 0:
+            return
+
+        records: Dict[int, Dict[str, Any]] = {}
+        fresh = []
+        start = time.perf_counter()
+        try:
+            cached = []
+            if self.question_bank is not None:
+                fresh_minimum = math.ceil(
+                    num_questions * settings.QUESTION_BANK_FRESH_RATIO
+                )
+                cached = self.question_bank.take(
+                    topic, difficulty, question_type, num_questions - fresh_minimum
+                )
+
+            quiz_index = NearDuplicateIndex() if settings.DEDUP_ENABLED else None
+            for index, question in enumerate(cached):
+                if quiz_index is not None:
+                    quiz_index.add(question.question)
+                records[index] = self._to_quiz_record(question)
+                yield index, records[index]
+
+            for index, question in self._iter_fresh_questions(
+                generator,
+                topic,
+                question_type,
+                difficulty,
+                num_questions - len(cached),
+                offset=len(cached),
+                quiz_index=quiz_index,
+            ):
+                fresh.append(question)
+                records[index] = self._to_quiz_record(question)
+                yield index, records[index]
+
+            if self.question_bank is not None:
+                self.question_bank.add(topic, difficulty, question_type, fresh)
+                self.question_bank.record_request(
+                    topic, difficulty, question_type, num_questions, len(cached)
+                )
+        finally:
+            self.question_slots = sorted(records)
+            self.questions = [records[index] for index in self.question_slots]
+            # Answers given while streaming were recorded by slot; move them to
+            # the positions of the questions that made it into the quiz
+            if self.user_answers:
+                answers = self.user_answers
+                self.user_answers = [
+                    answers[slot] if slot < len(answers) else ""
+                    for slot in self.question_slots
+                ]
+            # Measured across the generator's lifetime, so a streamed quiz includes
+            # rendering between questions
+            observe_stage(
+                "quiz_generation",
+                time.perf_counter() - start,
+                question_type=question_type,
+            )
+
+    def _iter_fresh_questions(
+        self,
+        generator: QuestionGenerator,
+        topic: str,
+        question_type: str,
+        difficulty: str,
+        num_questions: int,
+        offset: int = 0,
+        quiz_index: Optional[NearDuplicateIndex] = None,
+    ) -> Iterator[Tuple[int, Any]]:
+        """
+        Generate questions with the LLM concurrently, yielding them as they complete.
+
+        Slots of a chunk that failed after its retries, or that a batch left
+        unfilled, are regenerated one question at a time, up to
+        GENERATION_MAX_REPLACEMENTS slots per quiz; only slots left over when
+        that budget, or the deadline, runs out are recorded in
+        ``self.generation_errors`` and skipped. Fatal errors (e.g. a bad API
+        key) are not replaced. When a quiz index is given, questions that
+        near-duplicate an earlier quiz question or a bank question are
+        regenerated, up to DEDUP_MAX_REPLACEMENTS times per quiz.
+
+        Args:
+            generator: The question generator instance
+            topic: The topic for questions
+            question_type: Type of questions ('Multiple Choice' or 'Fill in the Blank')
+            difficulty: Difficulty level
+            num_questions: Number of questions to generate
+            offset: Position of the first generated question in the quiz
+            quiz_index: Near-duplicate index of the quiz so far (enables dedup)
+
+        Yields:
+            Tuple[int, Any]: Quiz position and validated question instance
+        """
+        if num_questions <= 0:
+            return
+
+        # Questions are independent LLM calls, so they are generated in parallel
+        # and tagged with their original position to keep the quiz order stable.
+        # In batch mode each call covers a chunk of up to BATCH_SIZE questions.
+        chunk_size = max(1, settings.BATCH_SIZE) if settings.BATCH_GENERATION else 1
+        chunk_starts = list(range(0, num_questions, chunk_size))
+        deadline = Deadline(settings.QUIZ_DEADLINE_SECONDS)
+        max_workers = max(1, min(settings.MAX_CONCURRENCY, len(chunk_starts)))
+        replacements_left = (
+            settings.DEDUP_MAX_REPLACEMENTS if settings.DEDUP_ENABLED else 0
+        )
+        failure_replacements_left = settings.GENERATION_MAX_REPLACEMENTS
+
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="quiz-gen"
+        ) as executor:
+
+            def submit(position: int, count: int, variant: Optional[int]) -> Future:
+                # Each task runs in a copy of the caller's context so the rate
+                # limiter sees the session and priority set by request_context
+                return executor.submit(
+                    contextvars.copy_context().run,
+                    self._generate_question_chunk,
+                    generator,
+                    topic,
+                    question_type,
+                    difficulty,
+                    count,
+                    deadline,
+                    variant,
+                )
+
+            # Chunks are keyed on their quiz position in the shared response cache,
+            # so sessions starting the same quiz at once share the upstream calls
+            pending: Dict[Future, Tuple[int, int]] = {}
+            for start in chunk_starts:
+                position = offset + start
+                count = min(chunk_size, num_questions - start)
+                variant = position if self.share_responses else None
+                pending[submit(position, count, variant)] = (position, count)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    first_position, count = pending.pop(future)
+                    try:
+                        questions = future.result()
+                        error = None
+                    except Exception as e:
+                        questions, error = [], e
+
+                    # Regenerate the slots this chunk left empty while the budget lasts
+                    if len(questions) < count:
+                        error = error or ValueError(
+                            f"Batch returned {len(questions)} of {count} questions"
+                        )
+                        retryable = not deadline.expired and not self._is_fatal(error)
+                        for position in range(
+                            first_position + len(questions), first_position + count
+                        ):
+                            if not retryable or failure_replacements_left <= 0:
+                                self.generation_errors.append(error)
+                                break
+                            failure_replacements_left -= 1
+                            pending[submit(position, 1, None)] = (position, 1)
+
+                    for position, question in enumerate(
+                        questions, start=first_position
+                    ):
+                        # Replace near-duplicates with a new question for the same slot
+                        if replacements_left > 0 and self._is_near_duplicate(
+                            question, quiz_index, topic, difficulty, question_type
+                        ):
+                            replacements_left -= 1
+                            # A replacement must differ from the shared response,
+                            # so it is not cached
+                            pending[submit(position, 1, None)] = (position, 1)
+                            continue
+                        if quiz_index is not None:
+                            quiz_index.add(question.question)
+                        yield position, question
+
+    def _is_near_duplicate(
+        self,
+        question,
+        quiz_index: Optional[NearDuplicateIndex],
+        topic: str,
+        difficulty: str,
+        question_type: str,
+    ) -> bool:
+        """
+        Check a new question against the current quiz and the question bank.
+
+        Args:
+            question: Newly generated question instance
+            quiz_index: Index of the questions already in the quiz
+            topic: The quiz topic
+            difficulty: Difficulty level
+            question_type: Type of questions
+
+        Returns:
+            bool: True if the question rewords one already seen
+        """
+        if quiz_index is not None and quiz_index.is_duplicate(question.question):
+            return True
+        return self.question_bank is not None and self.question_bank.is_near_duplicate(
+            topic, difficulty, question_type, question.question
+        )
+
+    @staticmethod
+    def _is_fatal(error: Exception) -> bool:
+        """
+        Check whether a generation error, or any error it was raised from, is permanent.
+
+        Args:
+            error: Exception raised by a generation task
+
+        Returns:
+            bool: True for fatal errors such as a rejected API key
+        """
+        while error is not None:
+            if classify_error(error) is ErrorKind.FATAL:
+                return True
+            error = error.__cause__ or error.__context__
+        return False
+
+    @staticmethod
+    def _generate_question_chunk(
+        generator: QuestionGenerator,
+        topic: str,
+        question_type: str,
+        difficulty: str,
+        count: int,
+        deadline: Optional[Deadline] = None,
+        variant: Optional[int] = None,
+    ) -> list:
+        """
+        Generate a chunk of questions.
+
+        A chunk of one uses the single-question generator methods; larger chunks
+        use the batched ones.
+
+        Args:
+            generator: The question generator instance
+            topic: The topic for the questions
+            question_type: Type of question ('Multiple Choice' or 'Fill in the Blank')
+            difficulty: Difficulty level
+            count: Number of questions in the chunk
+            deadline: Optional quiz deadline shared by every chunk
+            variant: Optional response cache variant index
+
+        Returns:
+            list: Validated question instances
+        """
+        if question_type == "Multiple Choice":
+            if count == 1:
+                return [
+                    generator.generate_mcq(topic, difficulty.lower(), deadline, variant)
+                ]
+            return generator.generate_mcq_batch(
+                topic, difficulty.lower(), count, deadline, variant
+            )
+
+        if count == 1:
+            return [
+                generator.generate_fill_blank(
+                    topic, difficulty.lower(), deadline, variant
+                )
+            ]
+        return generator.generate_fill_blank_batch(
+            topic, difficulty.lower(), count, deadline, variant
+        )
+
+    @staticmethod
+    def _to_quiz_record(question) -> Dict[str, Any]:
+        """
+        Convert a validated question into the quiz dictionary format.
+
+        Args:
+            question: MCQQuestion or FillBlankQuestion instance
+
+        Returns:
+            Dict[str, Any]: Question record as stored in ``self.questions``
+        """
+        if isinstance(question, MCQQuestion):
+            return {
+                "type": "MCQ",
+                "question": question.question,
+                "options": question.options,
+                "correct_answer": question.correct_answer,
+            }
+
+        return {
+            "type": "Fill in the blank",
+            "question": question.question,
+            "correct_answer": question.answer,
+            "alternatives": question.alternatives,
+        }
+
+    def set_answer(self, index: int, answer: Any) -> None:
+        """
+        Record the answer to one question, dropping the graded summary if it changed.
+
+        Args:
+            index: Zero-based question position
+            answer: The user's answer
+        """
+        while len(self.user_answers) <= index:
+            self.user_answers.append("")
+
+        if self.user_answers[index] != answer:
+            self.user_answers[index] = answer
+            self.summary = None
+
+    def set_answers(self, answers: List[Any]) -> None:
+        """
+        Record answers to every question, dropping the graded summary if they changed.
+
+        Args:
+            answers: The user's answers in question order
+        """
+        if list(answers) != self.user_answers:
+            self.user_answers = list(answers)
+            self.summary = None
+
+    def evaluate_quiz(self) -> QuizSummary:
+        """
+        Evaluate the quiz and generate results, grading every answer in one batch.
+
+        The summary is kept until an answer changes through ``set_answer`` or
+        ``set_answers``, so evaluating unchanged answers again costs nothing.
+
+        Returns:
+            QuizSummary: Results and score of the current answers
+        """
+        if self.summary is not None:
+            return self.summary
+
+        answered = list(zip(self.questions, self.user_answers))
+        with span("grading"):
+            correct = grade_answers(
+                [q["type"] for q, _ in answered],
+                ["" if user_ans is None else str(user_ans) for _, user_ans in answered],
+                [q["correct_answer"] for q, _ in answered],
+                [q.get("alternatives", []) for q, _ in answered],
+            )
+
+        self.results = [
+            {
+                "question_number": i + 1,
+                "question": q["question"],
+                "question_type": q["type"],
+                "user_answer": user_ans,
+                "correct_answer": q["correct_answer"],
+                "is_correct": bool(is_correct),
+                "options": q["options"] if q["type"] == "MCQ" else [],
+            }
+            for i, ((q, user_ans), is_correct) in enumerate(zip(answered, correct))
+        ]
+        self.summary = QuizSummary.from_results(self.results)
+        return self.summary
+
+    def save_results(self, session_id: Optional[str] = None) -> Optional[str]:
+        """
+        Queue the graded attempt for the results store.
+
+        Args:
+            session_id: Optional user session the attempt belongs to
+
+        Returns:
+            Optional[str]: Attempt ID, or None without results or a results store
+        """
+        if not self.results or self.results_store is None:
+            return None
+        return self.results_store.record(
+            self.results, self.topic, self.difficulty, self.question_type, session_id
+        )
+
+    def generate_result_dataframe(self) -> "pd.DataFrame":
+        """
+        Generate a pandas DataFrame from quiz results.
+
+        pandas is imported here rather than at module level so generation and
+        grading do not pay for it.
+
+        Returns:
+            pd.DataFrame: DataFrame containing quiz results
+        """
+        import pandas as pd
+
+        if not self.results:
+            return pd.DataFrame()
+
+        return pd.DataFrame(self.results)
@@ -0,0 +1 @@
+"""Background worker package."""
@@ -0,0 +1,513 @@
+"""
+Bulk quiz generation CLI for the AI Study Buddy application.
+Generates many quizzes from a manifest with bounded concurrency, streams them to
+JSONL or Parquet, and resumes interrupted runs without regenerating finished quizzes.
+
+Usage:
+    python -m src.worker.bulk manifest.csv --output quizzes.jsonl --concurrency 8
+    python -m src.worker.bulk manifest.csv --output quizzes.parquet --rpm 60
+
+Manifest rows are ``topic,difficulty,question_type,count[,quizzes]`` (CSV with
+that header) or JSON objects with the same keys (``.jsonl``). ``count`` is the
+number of questions per quiz and ``quizzes`` the number of quizzes for the row.
+"""
+
+import argparse
+import contextvars
+import csv
+import glob
+import hashlib
+import json
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from src.generator.question_generator import QuestionGenerator
+from src.storage.question_bank import QuestionBank, get_question_bank
+from src.llm.rate_limiter import Priority, request_context
+from src.utils.quiz_core import QuizCore
+from src.worker.prefetch import DIFFICULTIES, QUESTION_TYPES, MinuteRateLimiter
+from src.config.settings import settings
+from src.common.logger import get_logger, log_context
+
+
+@dataclass(frozen=True)
+class BulkJob:
+    """One manifest row: ``quizzes`` quizzes of ``count`` questions each."""
+
+    topic: str
+    difficulty: str
+    question_type: str
+    count: int
+    quizzes: int = 1
+
+
+@dataclass(frozen=True)
+class BulkItem:
+    """One quiz to generate; ``item_id`` is stable across runs of the same manifest."""
+
+    item_id: str
+    job: BulkJob
+    quiz_number: int
+
+
+@dataclass
+class BulkMetrics:
+    """Counters reported at the end of a bulk run."""
+
+    total: int = 0
+    skipped: int = 0
+    completed: int = 0
+    partial: int = 0
+    failed: int = 0
+    questions: int = 0
+    elapsed_seconds: float = 0.0
+    failures: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Return the metrics as a JSON-serializable dictionary."""
+        elapsed = max(self.elapsed_seconds, 1e-9)
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            "partial": self.partial,
+            "failed": self.failed,
+            "questions": self.questions,
+            "elapsed_seconds": round(self.elapsed_seconds, 2),
+            "quizzes_per_minute": round(self.completed * 60.0 / elapsed, 2),
+            "questions_per_second": round(self.questions / elapsed, 2),
+        }
+
+
+def _parse_job(row: Dict[str, Any], where: str) -> BulkJob:
+    """Validate one manifest row; ``where`` locates it in error messages."""
+    try:
+        job = BulkJob(
+            topic=str(row["topic"]).strip(),
+            difficulty=str(row.get("difficulty") or "Medium").strip().capitalize(),
+            question_type=str(row.get("question_type") or "Multiple Choice").strip(),
+            count=int(row.get("count") or 5),
+            quizzes=int(row.get("quizzes") or 1),
+        )
+    except (KeyError, ValueError) as e:
+        raise ValueError(f"{where}: invalid manifest row {row!r}: {e}") from e
+
+    if not job.topic:
+        raise ValueError(f"{where}: topic is empty")
+    if job.difficulty not in DIFFICULTIES:
+        raise ValueError(f"{where}: difficulty must be one of {DIFFICULTIES}")
+    if job.question_type not in QUESTION_TYPES:
+        raise ValueError(f"{where}: question_type must be one of {QUESTION_TYPES}")
+    if job.count < 1 or job.quizzes < 1:
+        raise ValueError(f"{where}: count and quizzes must be positive")
+    return job
+
+
+def load_manifest(path: str) -> List[BulkJob]:
+    """
+    Read bulk jobs from a CSV (with header) or JSONL manifest.
+
+    Args:
+        path: Path to the manifest
+
+    Returns:
+        List[BulkJob]: Jobs in manifest order
+
+    Raises:
+        ValueError: If a row is missing a topic or has invalid values
+    """
+    jobs: List[BulkJob] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line_number, line in enumerate(f, start=1):
+                if line.strip() and not line.lstrip().startswith("#"):
+                    jobs.append(_parse_job(json.loads(line), f"{path}:{line_number}"))
+        else:
+            for line_number, row in enumerate(csv.DictReader(f), start=2):
+                if row.get("topic", "").strip().startswith("#"):
+                    continue
+                jobs.append(_parse_job(row, f"{path}:{line_number}"))
+    return jobs
+
+
+def expand_items(jobs: List[BulkJob]) -> List[BulkItem]:
+    """
+    Expand jobs into one item per quiz.
+
+    Item IDs combine the row position, the row content and the quiz number, so
+    re-running the same manifest maps every quiz to the same ID.
+
+    Args:
+        jobs: Jobs in manifest order
+
+    Returns:
+        List[BulkItem]: Items in manifest order
+    """
+    items = []
+    for row, job in enumerate(jobs):
+        digest = hashlib.sha1(
+            f"{job.topic}|{job.difficulty}|{job.question_type}|{job.count}".encode(
+                "utf-8"
+            )
+        ).hexdigest()[:10]
+        for quiz_number in range(1, job.quizzes + 1):
+            items.append(BulkItem(f"{row}-{digest}-{quiz_number}", job, quiz_number))
+    return items
+
+
+class JSONLSink:
+    """
+    Appends one JSON line per quiz and flushes it immediately.
+
+    The output doubles as the checkpoint: IDs already in the file are skipped
+    on resume, and a line cut short by a crash is truncated away.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open the output, repairing a truncated last line.
+
+        Args:
+            path: Output file path
+        """
+        self.path = path
+        self._done: Set[str] = set()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        valid_bytes = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        self._done.add(json.loads(line)["item_id"])
+                    except (ValueError, KeyError):
+                        break
+                    valid_bytes += len(line)
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+        self._file = open(path, "a", encoding="utf-8")
+
+    def completed_ids(self) -> Set[str]:
+        """IDs of quizzes already written."""
+        return set(self._done)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Append a quiz record and flush it."""
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._done.add(record["item_id"])
+
+    def close(self) -> None:
+        """Close the output."""
+        self._file.close()
+
+
+class ParquetSink:
+    """
+    Writes quizzes to a directory of Parquet part files.
+
+    Records are buffered and written ``rows_per_file`` at a time to a new
+    part file, renamed into place once complete, so an interrupted run never
+    leaves an unreadable file behind. IDs in existing parts are skipped on resume.
+    """
+
+    def __init__(self, path: str, rows_per_file: Optional[int] = None):
+        """
+        Open the output directory.
+
+        Args:
+            path: Output directory (read it back with ``pandas.read_parquet(path)``)
+            rows_per_file: Quizzes per part file (defaults to settings)
+        """
+        # pyarrow is only needed for Parquet output
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.rows_per_file = rows_per_file or settings.BULK_PARQUET_ROWS_PER_FILE
+        self._buffer: List[Dict[str, Any]] = []
+        self._run = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._part = 0
+        self._schema = pa.schema(
+            [
+                ("item_id", pa.string()),
+                ("topic", pa.string()),
+                ("difficulty", pa.string()),
+                ("question_type", pa.string()),
+                ("quiz_number", pa.int64()),
+                ("requested", pa.int64()),
+                (
+                    "questions",
+                    pa.list_(
+                        pa.struct(
+                            [
+                                ("type", pa.string()),
+                                ("question", pa.string()),
+                                ("options", pa.list_(pa.string())),
+                                ("correct_answer", pa.string()),
+                                ("alternatives", pa.list_(pa.string())),
+                            ]
+                        )
+                    ),
+                ),
+                ("errors", pa.list_(pa.string())),
+                ("generated_at", pa.string()),
+            ]
+        )
+        os.makedirs(path, exist_ok=True)
+
+    def completed_ids(self) -> Set[str]:
+        """IDs of quizzes in the part files already written."""
+        done: Set[str] = set()
+        for part in glob.glob(os.path.join(self.path, "*.parquet")):
+            done.update(
+                self._pq.read_table(part, columns=["item_id"])
+                .column("item_id")
+                .to_pylist()
+            )
+        return done
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Buffer a quiz record, writing a part file when the buffer is full."""
+        self._buffer.append(record)
+        if len(self._buffer) >= self.rows_per_file:
+            self._flush()
+
+    def close(self) -> None:
+        """Write any buffered records."""
+        self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffer to a new part file."""
+        if not self._buffer:
+            return
+        table = self._pa.Table.from_pylist(self._buffer, schema=self._schema)
+        final = os.path.join(self.path, f"part-{self._run}-{self._part:05d}.parquet")
+        self._pq.write_table(table, final + ".tmp")
+        os.replace(final + ".tmp", final)
+        self._part += 1
+        self._buffer = []
+
+
+def open_sink(path: str, output_format: Optional[str] = None):
+    """
+    Open the output sink for a path.
+
+    Args:
+        path: Output file (JSONL) or directory (Parquet)
+        output_format: 'jsonl' or 'parquet' (inferred from the path by default)
+
+    Returns:
+        JSONLSink or ParquetSink: The opened sink
+    """
+    if output_format is None:
+        output_format = "parquet" if path.rstrip("/").endswith(".parquet") else "jsonl"
+    if output_format == "parquet":
+        return ParquetSink(path)
+    return JSONLSink(path)
+
+
+class BulkRunner:
+    """Generates quizzes for bulk items with bounded concurrency."""
+
+    def __init__(
+        self,
+        generator: QuestionGenerator,
+        sink,
+        concurrency: Optional[int] = None,
+        requests_per_minute: Optional[int] = None,
+        question_bank: Optional[QuestionBank] = None,
+    ):
+        """
+        Initialize the bulk runner.
+
+        Args:
+            generator: Question generator used for every quiz
+            sink: JSONLSink or ParquetSink receiving finished quizzes
+            concurrency: Quizzes generated at once (defaults to settings)
+            requests_per_minute: Cap on LLM calls per minute, 0 for none (defaults
+                to settings)
+            question_bank: Optional question bank to serve and store questions
+        """
+        self.generator = generator
+        self.sink = sink
+        self.concurrency = max(1, concurrency or settings.BULK_CONCURRENCY)
+        if requests_per_minute is None:
+            requests_per_minute = settings.BULK_REQUESTS_PER_MINUTE
+        self.rate_limiter = (
+            MinuteRateLimiter(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        self.question_bank = question_bank
+        self.logger = get_logger(self.__class__.__name__)
+
+    def _generate(self, item: BulkItem) -> Dict[str, Any]:
+        """Generate one quiz and build its output record."""
+        job = item.job
+        if self.rate_limiter is not None:
+            chunk = max(1, settings.BATCH_SIZE) if settings.BATCH_GENERATION else 1
+            self.rate_limiter.wait(math.ceil(job.count / chunk))
+
+        quiz = QuizCore(question_bank=self.question_bank, share_responses=False)
+        with log_context(quiz_id=item.item_id):
+            quiz.generate(
+                self.generator, job.topic, job.question_type, job.difficulty, job.count
+            )
+        return {
+            "item_id": item.item_id,
+            "topic": job.topic,
+            "difficulty": job.difficulty,
+            "question_type": job.question_type,
+            "quiz_number": item.quiz_number,
+            "requested": job.count,
+            "questions": [
+                {
+                    "type": q["type"],
+                    "question": q["question"],
+                    "options": q.get("options", []),
+                    "correct_answer": q["correct_answer"],
+                    "alternatives": q.get("alternatives", []),
+                }
+                for q in quiz.questions
+            ],
+            "errors": [str(e) for e in quiz.generation_errors],
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    def _pending(
+        self, items: List[BulkItem], metrics: BulkMetrics
+    ) -> Iterator[BulkItem]:
+        """Yield items not yet in the output, counting the skipped ones."""
+        done = self.sink.completed_ids()
+        for item in items:
+            if item.item_id in done:
+                metrics.skipped += 1
+            else:
+                yield item
+
+    def run(self, items: List[BulkItem]) -> BulkMetrics:
+        """
+        Generate every item not already in the output.
+
+        At most ``concurrency`` quizzes are queued or running at a time, and
+        each finished quiz is written before the next one is started, so an
+        interrupted run loses at most the quizzes in flight. Quizzes without
+        any question are not written and are retried on the next run.
+
+        Args:
+            items: Items to generate, in output order
+
+        Returns:
+            BulkMetrics: Counts and throughput of this run
+        """
+        metrics = BulkMetrics(total=len(items))
+        start = time.perf_counter()
+        pending_items = self._pending(items, metrics)
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="bulk"
+        )
+        in_flight: Dict[Any, BulkItem] = {}
+
+        try:
+            with request_context(Priority.BACKGROUND, "bulk"):
+                for item in pending_items:
+                    if len(in_flight) >= self.concurrency:
+                        self._collect(in_flight, metrics, FIRST_COMPLETED)
+                    future = executor.submit(
+                        contextvars.copy_context().run, self._generate, item
+                    )
+                    in_flight[future] = item
+                while in_flight:
+                    self._collect(in_flight, metrics, FIRST_COMPLETED)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.sink.close()
+            metrics.elapsed_seconds = time.perf_counter() - start
+
+        self.logger.info(f"Bulk run finished: {json.dumps(metrics.to_dict())}")
+        return metrics
+
+    def _collect(
+        self, in_flight: Dict[Any, BulkItem], metrics: BulkMetrics, return_when: str
+    ) -> None:
+        """Wait for finished quizzes, write them and update ``metrics``."""
+        done, _ = wait(in_flight, return_when=return_when)
+        for future in done:
+            item = in_flight.pop(future)
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {"questions": [], "errors": [str(e)]}
+
+            if not record["questions"]:
+                metrics.failed += 1
+                metrics.failures.append(f"{item.item_id}: {record['errors'][:1]}")
+                self.logger.error(
+                    f"Bulk item {item.item_id} failed: {record['errors'][:1]}"
+                )
+                continue
+
+            self.sink.write(record)
+            metrics.completed += 1
+            metrics.questions += len(record["questions"])
+            if len(record["questions"]) < item.job.count:
+                metrics.partial += 1
+
+
+def main() -> None:
+    """Run a bulk generation from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Generate many quizzes from a manifest."
+    )
+    parser.add_argument("manifest", help="CSV or JSONL manifest of bulk jobs")
+    parser.add_argument(
+        "--output", required=True, help="JSONL file or Parquet directory (*.parquet)"
+    )
+    parser.add_argument("--format", dest="output_format", choices=["jsonl", "parquet"])
+    parser.add_argument("--concurrency", type=int, default=settings.BULK_CONCURRENCY)
+    parser.add_argument(
+        "--rpm",
+        type=int,
+        default=settings.BULK_REQUESTS_PER_MINUTE,
+        help="Cap on LLM calls per minute (0 for none)",
+    )
+    parser.add_argument(
+        "--no-bank", action="store_true", help="Do not use the question bank"
+    )
+    args = parser.parse_args()
+
+    items = expand_items(load_manifest(args.manifest))
+    bank = (
+        get_question_bank()
+        if settings.QUESTION_BANK_ENABLED and not args.no_bank
+        else None
+    )
+    runner = BulkRunner(
+        QuestionGenerator(),
+        open_sink(args.output, args.output_format),
+        concurrency=args.concurrency,
+        requests_per_minute=args.rpm,
+        question_bank=bank,
+    )
+
+    try:
+        metrics = runner.run(items)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume.", flush=True)
+        raise SystemExit(130)
+    print(json.dumps(metrics.to_dict()), flush=True)
+
+
+if __name__ == "__main__":
+    main()
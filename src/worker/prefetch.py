@@ -0,0 +1,255 @@
+"""
+Prefetch worker for the AI Study Buddy application.
+Keeps the question bank stocked for popular topics so quizzes skip LLM latency.
+
+Usage:
+    python -m src.worker.prefetch --topics topics.txt
+    python -m src.worker.prefetch --from-log --once
+"""
+
+import argparse
+import csv
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src.generator.question_generator import QuestionGenerator
+from src.storage.question_bank import QuestionBank, get_question_bank
+from src.llm.rate_limiter import Priority, request_context
+from src.config.settings import settings
+from src.common.logger import get_logger
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+QUESTION_TYPES = ["Multiple Choice", "Fill in the Blank"]
+
+Target = Tuple[str, str, str]
+
+
+class MinuteRateLimiter:
+    """Spaces calls evenly so no more than ``per_minute`` happen per minute."""
+
+    def __init__(self, per_minute: int):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            per_minute: Maximum number of calls per minute
+        """
+        self.interval = 60.0 / max(1, per_minute)
+        self._next_allowed = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self, calls: int = 1) -> None:
+        """
+        Block until the next calls are allowed.
+
+        Safe to call from several threads; each caller reserves its own slots.
+
+        Args:
+            calls: Number of calls to reserve
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed)
+            self._next_allowed = start + self.interval * max(1, calls)
+        if start > now:
+            time.sleep(start - now)
+
+
+@dataclass
+class PrefetchMetrics:
+    """Counters reported after each prefetch cycle."""
+
+    fill_levels: Dict[str, int] = field(default_factory=dict)
+    generated: int = 0
+    failed: int = 0
+    generation_seconds: float = 0.0
+    hit_rate: Optional[float] = None
+
+    @property
+    def throughput_per_minute(self) -> float:
+        """Questions generated per minute of generation time."""
+        if self.generation_seconds <= 0:
+            return 0.0
+        return self.generated * 60.0 / self.generation_seconds
+
+    def to_dict(self) -> dict:
+        """Return the metrics as a JSON-serializable dictionary."""
+        return {
+            "fill_levels": self.fill_levels,
+            "generated": self.generated,
+            "failed": self.failed,
+            "throughput_per_minute": round(self.throughput_per_minute, 2),
+            "hit_rate": self.hit_rate,
+        }
+
+
+def load_topic_file(path: str) -> List[Target]:
+    """
+    Read prefetch targets from a CSV-style topic file.
+
+    Each line is ``topic[,difficulty[,question_type]]``. Missing columns expand
+    to every difficulty and question type. Blank lines and ``#`` comments are skipped.
+
+    Args:
+        path: Path to the topic file
+
+    Returns:
+        List[Target]: (topic, difficulty, question_type) combinations
+    """
+    targets: List[Target] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            row = [cell.strip() for cell in row]
+            if not row or not row[0] or row[0].startswith("#"):
+                continue
+            difficulties = [row[1]] if len(row) > 1 and row[1] else DIFFICULTIES
+            question_types = [row[2]] if len(row) > 2 and row[2] else QUESTION_TYPES
+            for difficulty in difficulties:
+                for question_type in question_types:
+                    targets.append((row[0], difficulty, question_type))
+    return targets
+
+
+class PrefetchWorker:
+    """Tops up the question bank for a set of (topic, difficulty, type) targets."""
+
+    def __init__(
+        self,
+        generator: QuestionGenerator,
+        bank: QuestionBank,
+        target_stock: int,
+        requests_per_minute: int,
+    ):
+        """
+        Initialize the prefetch worker.
+
+        Args:
+            generator: Question generator used to create new questions
+            bank: Question bank to fill
+            target_stock: Number of questions to keep per target
+            requests_per_minute: Upper bound on LLM calls per minute
+        """
+        self.generator = generator
+        self.bank = bank
+        self.target_stock = target_stock
+        self.rate_limiter = MinuteRateLimiter(requests_per_minute)
+        self.logger = get_logger(self.__class__.__name__)
+
+    def _generate(self, topic: str, difficulty: str, question_type: str):
+        """Generate one question of the requested type."""
+        if question_type == "Multiple Choice":
+            return self.generator.generate_mcq(topic, difficulty.lower())
+        return self.generator.generate_fill_blank(topic, difficulty.lower())
+
+    def _fill_targets(self, targets: List[Target], metrics: PrefetchMetrics) -> None:
+        """Generate missing questions for every target, updating ``metrics``."""
+        for topic, difficulty, question_type in targets:
+            stock = self.bank.count(topic, difficulty, question_type)
+            missing = self.target_stock - stock
+
+            for _ in range(max(0, missing)):
+                self.rate_limiter.wait()
+                start = time.perf_counter()
+                try:
+                    question = self._generate(topic, difficulty, question_type)
+                    stock += self.bank.add(topic, difficulty, question_type, [question])
+                    metrics.generated += 1
+                except Exception as e:
+                    self.logger.error(f"Prefetch failed for '{topic}': {str(e)}")
+                    metrics.failed += 1
+                finally:
+                    metrics.generation_seconds += time.perf_counter() - start
+
+            metrics.fill_levels[f"{topic}|{difficulty}|{question_type}"] = stock
+
+    def run_once(self, targets: List[Target]) -> PrefetchMetrics:
+        """
+        Fill every target up to the configured stock level once.
+
+        Args:
+            targets: (topic, difficulty, question_type) combinations to fill
+
+        Returns:
+            PrefetchMetrics: Fill levels, throughput and hit rate for this cycle
+        """
+        metrics = PrefetchMetrics()
+
+        with request_context(Priority.BACKGROUND, "prefetch"):
+            self._fill_targets(targets, metrics)
+
+        metrics.hit_rate = self.bank.hit_rate(settings.PREFETCH_LOOKBACK_SECONDS)
+        self.logger.info(f"Prefetch cycle finished: {json.dumps(metrics.to_dict())}")
+        return metrics
+
+
+def collect_targets(
+    bank: QuestionBank, topics_file: Optional[str], from_log: bool
+) -> List[Target]:
+    """
+    Combine targets from a topic file and the recent request log.
+
+    Args:
+        bank: Question bank holding the request log
+        topics_file: Optional path to a topic file
+        from_log: Whether to include recently popular requests
+
+    Returns:
+        List[Target]: Unique targets, topic file entries first
+    """
+    targets: List[Target] = []
+    if topics_file:
+        targets.extend(load_topic_file(topics_file))
+    if from_log:
+        targets.extend(
+            bank.popular_requests(
+                settings.PREFETCH_LOOKBACK_SECONDS, settings.PREFETCH_MAX_TOPICS
+            )
+        )
+    return list(dict.fromkeys(targets))
+
+
+def main() -> None:
+    """Run the prefetch worker from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Keep the question bank stocked for popular topics."
+    )
+    parser.add_argument(
+        "--topics", help="Topic file with topic[,difficulty[,question_type]] lines"
+    )
+    parser.add_argument(
+        "--from-log",
+        action="store_true",
+        help="Also prefetch recently requested topics",
+    )
+    parser.add_argument("--stock", type=int, default=settings.PREFETCH_TARGET_STOCK)
+    parser.add_argument(
+        "--rpm", type=int, default=settings.PREFETCH_REQUESTS_PER_MINUTE
+    )
+    parser.add_argument(
+        "--interval", type=float, default=settings.PREFETCH_INTERVAL_SECONDS
+    )
+    parser.add_argument(
+        "--once", action="store_true", help="Run a single cycle and exit"
+    )
+    args = parser.parse_args()
+
+    if not args.topics and not args.from_log:
+        parser.error("provide --topics and/or --from-log")
+
+    bank = get_question_bank()
+    worker = PrefetchWorker(QuestionGenerator(), bank, args.stock, args.rpm)
+
+    while True:
+        targets = collect_targets(bank, args.topics, args.from_log)
+        metrics = worker.run_once(targets)
+        print(json.dumps(metrics.to_dict()), flush=True)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
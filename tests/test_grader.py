@@ -0,0 +1,93 @@
+"""
+Tests for the fill-in-the-blank grading engine.
+"""
+
+import pytest
+
+from src.grading.grader import (
+    grade_answers,
+    grade_fill_blank,
+    grade_mcq,
+    one_edit_apart,
+)
+
+
+@pytest.mark.parametrize(
+    "given, answer",
+    [
+        ("Paris.", "Paris"),
+        ("PARÍS", "Paris"),
+        ("the Nile", "Nile"),
+        ("Rusia", "Russia"),
+        ("Russai", "Russia"),
+        ("Sweeden", "Sweden"),
+        ("photosynthesys", "photosynthesis"),
+        ("mitochondrion", "mitochondria"),
+        ("Washington George", "George Washington"),
+        ("Jean Paul Sartre", "Jean-Paul Sartre"),
+        ("2.5.", "2.5"),
+        ("c++", "C++"),
+    ],
+)
+def test_typos_are_accepted(given, answer):
+    assert grade_fill_blank([given], [answer]).tolist() == [True]
+
+
+@pytest.mark.parametrize(
+    "given, answer",
+    [
+        ("Prussia", "Russia"),
+        ("Iraq", "Iran"),
+        ("Juniper", "Jupiter"),
+        ("Australia", "Austria"),
+        ("Slovakia", "Slovenia"),
+        ("ussia", "Russia"),
+        ("1946", "1945"),
+        ("5.2", "2.5"),
+        ("-40", "40"),
+        ("3/4", "4/3"),
+        ("1/2", "2/1"),
+        ("C", "C++"),
+        ("C", "C#"),
+        ("C#", "C++"),
+        ("3^10", "10^3"),
+        ("1945-1939", "1939-1945"),
+        ("25", "25%"),
+    ],
+)
+def test_near_miss_wrong_answers_are_rejected(given, answer):
+    assert grade_fill_blank([given], [answer]).tolist() == [False]
+
+
+def test_alternatives_are_accepted():
+    assert grade_fill_blank(["Sun"], ["the Sun"], [["Sol"]]).tolist() == [True]
+    assert grade_fill_blank(["Sol"], ["the Sun"], [["Sol"]]).tolist() == [True]
+
+
+@pytest.mark.parametrize(
+    "given, accepted, expected",
+    [
+        ("rusia", "russia", True),
+        ("russiaa", "russia", True),
+        ("rusisa", "russia", True),
+        ("iraq", "iran", False),
+        ("russia", "russia", False),
+        ("rsia", "russia", False),
+    ],
+)
+def test_one_edit_apart(given, accepted, expected):
+    assert one_edit_apart(given, accepted) is expected
+
+
+def test_grade_mcq():
+    assert grade_mcq(["a", "b", "c"], ["a", "c", "c"]).tolist() == [True, False, True]
+    assert grade_mcq([], []).tolist() == []
+
+
+def test_grade_answers_mixes_question_types():
+    graded = grade_answers(
+        ["MCQ", "Fill in the blank", "MCQ", "Fill in the blank"],
+        ["Paris", "the nile", "Rome", "5.2"],
+        ["Paris", "Nile", "Paris", "2.5"],
+    )
+    assert graded.tolist() == [True, True, False, False]
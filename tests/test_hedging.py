@@ -0,0 +1,45 @@
+"""
+Tests for hedged LLM calls.
+"""
+
+import threading
+import time
+
+from src.llm.hedging import HedgedCaller
+
+
+def make_caller(pool_size):
+    """Caller that hedges after about 50 ms, with budget for every hedge."""
+    caller = HedgedCaller(
+        percentile=50, max_ratio=1.0, window=10, min_samples=1, pool_size=pool_size
+    )
+    caller.histogram("mcq").record(0.04)
+    return caller
+
+
+def test_queued_primary_is_not_hedged():
+    caller = make_caller(pool_size=1)
+    release = threading.Event()
+    caller._executor.submit(release.wait)
+    hedges = []
+
+    # The only thread is busy for longer than the hedge delay
+    threading.Timer(0.2, release.set).start()
+    result = caller.call("mcq", lambda: "answer", lambda: hedges.append(1) or True)
+    assert result == "answer"
+    assert hedges == []
+
+
+def test_slow_primary_is_hedged():
+    caller = make_caller(pool_size=2)
+    calls = []
+
+    def request():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return "primary"
+        return "hedge"
+
+    assert caller.call("mcq", request, lambda: True) == "hedge"
+    assert len(calls) == 2
@@ -0,0 +1,78 @@
+"""
+Tests for JSON extraction and repair, run over the corpus of recorded LLM responses.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.llm.json_extraction import (
+    IncrementalJSONExtractor,
+    extract_json,
+    parse_model,
+    repair_json,
+)
+from src.models.question_schemas import FillBlankQuestion, MCQQuestion
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(__file__),
+    os.pardir,
+    "benchmarks",
+    "data",
+    "malformed_responses.jsonl",
+)
+
+MODEL_CLASSES = {"mcq": MCQQuestion, "fill_blank": FillBlankQuestion}
+
+
+def load_corpus():
+    """Corpus records: ``kind``, ``response`` and whether it is recoverable."""
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+CORPUS = load_corpus()
+VALID = [record for record in CORPUS if record["valid"]]
+INVALID = [record for record in CORPUS if not record["valid"]]
+
+
+def test_corpus_covers_both_outcomes():
+    assert VALID and INVALID
+
+
+@pytest.mark.parametrize("record", VALID, ids=lambda record: record["response"][:40])
+def test_recoverable_responses_validate(record):
+    question = parse_model(MODEL_CLASSES[record["kind"]], record["response"])
+    assert question.question
+
+
+@pytest.mark.parametrize("record", VALID, ids=lambda record: record["response"][:40])
+def test_streamed_extraction_matches_whole_response(record):
+    extractor = IncrementalJSONExtractor()
+    text = None
+    for start in range(0, len(record["response"]), 7):
+        text = extractor.feed(record["response"][start : start + 7])
+        if text is not None:
+            break
+    assert text is not None
+    assert extract_json(text) == extract_json(record["response"])
+
+
+@pytest.mark.parametrize("record", INVALID, ids=lambda record: record["response"][:40])
+def test_unrecoverable_responses_raise(record):
+    with pytest.raises(ValueError):
+        parse_model(MODEL_CLASSES[record["kind"]], record["response"])
+
+
+@pytest.mark.parametrize(
+    "broken, expected",
+    [
+        ('{"a": 1,}', {"a": 1}),
+        ("{'a': 'b'}", {"a": "b"}),
+        ('{"a": True, "b": None}', {"a": True, "b": None}),
+        ('{"a": [1, 2,],}', {"a": [1, 2]}),
+    ],
+)
+def test_repair_json(broken, expected):
+    assert json.loads(repair_json(broken)) == expected
@@ -0,0 +1,66 @@
+"""
+Tests for the question bank's near-duplicate indexes.
+"""
+
+import threading
+
+from src.models.question_schemas import MCQQuestion
+from src.storage.question_bank import QuestionBank, make_bank_key
+
+MCQ = "Multiple Choice"
+
+
+def question(text):
+    return MCQQuestion(question=text, options=["a", "b", "c", "d"], correct_answer="a")
+
+
+def test_eviction_drops_stale_index(tmp_path):
+    bank = QuestionBank(path=str(tmp_path / "bank.db"), ttl_seconds=3600, max_entries=1)
+    bank.add(
+        "Rivers",
+        "medium",
+        MCQ,
+        [question("Which river flows through the city of Cairo in Egypt?")],
+    )
+    assert bank.is_near_duplicate(
+        "Rivers", "medium", MCQ, "Which river flows through the city of Cairo in Egypt?"
+    )
+
+    # Only one question fits, so the river question is evicted with its index
+    bank.add(
+        "Planets",
+        "medium",
+        MCQ,
+        [question("Which planet is known as the Red Planet of the solar system?")],
+    )
+    assert make_bank_key("Rivers", "medium", MCQ) not in bank._indexes
+    assert not bank.is_near_duplicate(
+        "Rivers", "medium", MCQ, "Which river flows through the city of Cairo in Egypt?"
+    )
+
+
+def test_index_build_does_not_block_other_topics(tmp_path):
+    bank = QuestionBank(
+        path=str(tmp_path / "bank.db"), ttl_seconds=3600, max_entries=100
+    )
+    bank.add(
+        "Planets",
+        "medium",
+        MCQ,
+        [question("Which planet is known as the Red Planet of the solar system?")],
+    )
+    bank.is_near_duplicate("Planets", "medium", MCQ, "warm up")
+
+    # Hold the build lock of one topic, as a slow build would
+    key = make_bank_key("Rivers", "medium", MCQ)
+    key_lock = bank._index_locks.setdefault(key, threading.Lock())
+    with key_lock:
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(
+                bank.is_near_duplicate("Planets", "medium", MCQ, "Which planet is red?")
+            )
+        )
+        thread.start()
+        thread.join(timeout=5)
+        assert result == [False]
@@ -0,0 +1,51 @@
+"""
+Tests for LLM error classification.
+"""
+
+import groq
+import httpx
+import pytest
+
+from src.llm.retry import ErrorKind, classify_error
+
+
+def status_error(status_code, code=None):
+    """Return the error the Groq client raises when the API answers with an error."""
+    body = {"error": {"message": "request failed", "code": code}}
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(status_code, json=body)
+    )
+    client = groq.Groq(
+        api_key="test", max_retries=0, http_client=httpx.Client(transport=transport)
+    )
+    with pytest.raises(groq.APIStatusError) as raised:
+        client.chat.completions.create(
+            model="llama-3.3-70b-versatile",
+            messages=[{"role": "user", "content": "Q"}],
+            response_format={"type": "json_object"},
+        )
+    return raised.value
+
+
+def test_json_mode_validation_failure_is_a_schema_error():
+    assert classify_error(status_error(400, "json_validate_failed")) is ErrorKind.SCHEMA
+
+
+@pytest.mark.parametrize(
+    "status_code, code, kind",
+    [
+        (400, None, ErrorKind.FATAL),
+        (400, "model_decommissioned", ErrorKind.FATAL),
+        (401, "invalid_api_key", ErrorKind.FATAL),
+        (429, "rate_limit_exceeded", ErrorKind.RATE_LIMIT),
+        (503, None, ErrorKind.TRANSIENT),
+        (500, "json_validate_failed", ErrorKind.TRANSIENT),
+    ],
+)
+def test_status_errors(status_code, code, kind):
+    assert classify_error(status_error(status_code, code)) is kind
+
+
+def test_parse_errors_are_schema_errors():
+    assert classify_error(ValueError("no JSON object found")) is ErrorKind.SCHEMA
+    assert classify_error(ConnectionError("reset")) is ErrorKind.TRANSIENT
@@ -0,0 +1,142 @@
+"""
+Tests for model routing, circuit breakers and fallback calls.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.config.settings import settings
+from src.llm import groq_client
+from src.llm.rate_limiter import InMemoryBudget, estimate_tokens
+from src.llm.response_cache import get_response_cache
+from src.llm.router import CircuitBreaker, ModelRouter, get_model_router
+
+
+class ChainClient:
+    """Client answering for some models and failing with ``error`` for the others."""
+
+    def __init__(self, failing, error=ConnectionError):
+        self.failing = set(failing)
+        self.error = error
+        self.calls = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, messages, **kwargs):
+        self.calls.append(model)
+        if model in self.failing:
+            raise self.error(f"{model} is down")
+        message = SimpleNamespace(content=f"answer from {model}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+class CountingScheduler:
+    """Scheduler recording every rate limit reservation and refund."""
+
+    def __init__(self):
+        self.acquired = 0
+        self.refunds = []
+
+    def acquire(self, tokens, timeout=None):
+        self.acquired += 1
+        return 0.0
+
+    def adjust_tokens(self, delta):
+        pass
+
+    def refund(self, requests, tokens):
+        self.refunds.append((requests, tokens))
+
+
+class ServerError(Exception):
+    """Error response from the provider."""
+
+    status_code = 503
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    """Route every call over fake:a then fake:b, with a fresh router and cache."""
+    monkeypatch.setattr(settings, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(settings, "LLM_MODELS", "fake:a,fake:b")
+    monkeypatch.setattr(settings, "LLM_ROUTES", "")
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "LLM_CACHE_PATH", "")
+    scheduler = CountingScheduler()
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(groq_client, "get_scheduler", lambda: scheduler)
+    get_model_router.cache_clear()
+    get_response_cache.cache_clear()
+    yield scheduler
+    get_model_router.cache_clear()
+    get_response_cache.cache_clear()
+
+
+def test_schema_error_releases_half_open_trial():
+    router = ModelRouter(models="fake:a,fake:b", routes="")
+    a, b = router.chain
+    router.breakers[a] = CircuitBreaker(failure_threshold=1, cooldown_seconds=0.01)
+
+    router.record_failure(a, ConnectionError("down"))
+    assert router.breakers[a].state == "open"
+    assert router.candidates("prompt") == [b]
+
+    time.sleep(0.02)
+    assert router.breakers[a].state == "half_open"
+    assert router.acquire(a, alone=False)
+    assert router.breakers[a].state == "open"
+
+    # The trial got an answer that did not parse: the model is reachable again
+    router.record_failure(a, ValueError("bad json"))
+    assert router.breakers[a].state == "half_open"
+    assert router.candidates("prompt") == [a, b]
+
+
+def test_failed_trial_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, cooldown_seconds=0.01)
+    for _ in range(3):
+        breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_fallback_answer_is_not_cached(chain):
+    client = ChainClient(failing={"a"})
+    assert groq_client.generate_completion(client, "Q", variant=0) == "answer from b"
+
+    client.failing.clear()
+    assert groq_client.generate_completion(client, "Q", variant=0) == "answer from a"
+    assert client.calls == ["a", "b", "a"]
+
+    # The primary model's answer is kept
+    assert groq_client.generate_completion(client, "Q", variant=0) == "answer from a"
+    assert client.calls == ["a", "b", "a"]
+
+
+def test_each_fallback_attempt_takes_rate_limit_budget(chain):
+    client = ChainClient(failing={"a"})
+    groq_client.generate_completion(client, "Q")
+    assert client.calls == ["a", "b"]
+    assert chain.acquired == 2
+
+
+def test_attempt_without_response_refunds_its_budget(chain):
+    groq_client.generate_completion(ChainClient(failing={"a"}), "Q")
+    assert chain.refunds == [(1, estimate_tokens("Q"))]
+
+
+def test_error_response_refunds_only_its_tokens(chain):
+    groq_client.generate_completion(ChainClient(failing={"a"}, error=ServerError), "Q")
+    assert chain.refunds == [(0, estimate_tokens("Q"))]
+
+
+def test_refund_returns_budget_to_the_buckets():
+    budget = InMemoryBudget(requests_per_minute=2, tokens_per_minute=1000)
+    assert budget.try_acquire(600) == 0
+    assert budget.try_acquire(600) > 0
+    budget.refund(1, 600)
+    assert budget.try_acquire(600) == 0